@@ -0,0 +1,6 @@
+# Registry re-exports, imported on first use (python3 -m litex_boards.registry runs the module).
+def __getattr__(name):
+    if name in ["boards", "get"]:
+        from litex_boards import registry
+        return getattr(registry, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
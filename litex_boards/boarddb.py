@@ -0,0 +1,403 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Board Database: pin data of all the platforms (IOs of all variants/revisions, extensions and
+# connectors) serialized to a compact versioned file, readable without Migen/LiteX.
+#
+# Two forms of the same content are supported:
+# - JSON (boarddb.json).
+# - Binary (boarddb.bin): string pool and fixed-size u32 records, memory-mapped and decoded lazily
+#   (per board, on first access), so listing the catalog only reads the boards records.
+#
+# The export imports the platforms (and so requires Migen/LiteX), the reader only uses the standard
+# library:
+#
+# python3 -m litex_boards.boarddb --export build/boarddb.json --binary build/boarddb.bin
+# python3 -m litex_boards.boarddb build/boarddb.bin digilent_arty            (show board pins)
+#
+# from litex_boards import boarddb
+# db    = boarddb.load("build/boarddb.bin")
+# board = db["digilent_arty"]
+# for signal in board.pins("_io"): print(signal.resource, signal.subsignal, signal.pins)
+
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+import collections
+
+# Format -------------------------------------------------------------------------------------------
+
+db_version = 1
+
+# Signals of the IO tables: one row per (sub)signal of a resource, pins are the Pins identifiers
+# (connector pins "pmoda:0" are resolved with the connectors of the table), misc: Misc constraints
+# (Drive/Inverted as "DRIVE=x"/"INVERTED").
+Signal = collections.namedtuple("Signal", "resource number subsignal pins iostandard misc")
+
+# Binary: header, then sections of u32 records (offsets in bytes from the start of the file).
+bin_magic   = b"LXBDB\x00\x00\x00"
+bin_header  = struct.Struct("<8s16I")
+bin_none    = 0xffffffff
+bin_records = {
+    # name, family, device, first table, tables, first extension, extensions, first connectors
+    # table, connectors tables.
+    "boards"            : 9,
+    # name, first signal, signals, first connectors table id, connectors tables ids.
+    "tables"            : 5,
+    # name, first connector, connectors.
+    "connectors_tables" : 3,
+    # name, first pair id, pairs ids.
+    "connectors"        : 3,
+    # resource, number, subsignal, first pin id, pins, iostandard, first misc id, miscs.
+    "signals"           : 8,
+}
+
+# Board --------------------------------------------------------------------------------------------
+
+class Board:
+    """Pin data of a board: IO tables ({table: [Signal]}), extensions and connectors tables."""
+    def __init__(self, name, info):
+        self.name       = name
+        self.family     = info["family"]
+        self.device     = info["device"]
+        self.tables     = {k: [Signal(*s) for s in t["io"]] for k, t in info["tables"].items()}
+        self.extensions = {k: [Signal(*s) for s in io] for k, io in info["extensions"].items()}
+        self.connectors = info["connectors"]
+        self._table_connectors = {k: t["connectors"] for k, t in info["tables"].items()}
+
+    def get_connectors(self, table=None, extension=None):
+        """Connectors ({name: {pin: pin}}) of an IO table, extensions can use all the connectors."""
+        table = self.default_table if table is None else table
+        names = list(self._table_connectors[table])
+        if extension is not None:
+            names = [n for n in self.connectors if n not in names] + names
+        connectors = {}
+        for name in names:
+            connectors.update(self.connectors[name])
+        return connectors
+
+    @property
+    def default_table(self):
+        return "_io" if "_io" in self.tables else next(iter(self.tables), None)
+
+    def resolve(self, identifier, connectors):
+        # Connector pins that can't be resolved are returned unchanged.
+        if ":" not in identifier:
+            return identifier
+        conn, _, pin = identifier.partition(":")
+        pin = connectors.get(conn, {}).get(pin, None)
+        return identifier if pin is None else self.resolve(pin, connectors)
+
+    def pins(self, table=None, extension=None):
+        """Signals of an IO table (or of an extension on it) with connector pins resolved."""
+        table      = self.default_table if table is None else table
+        connectors = self.get_connectors(table, extension)
+        signals    = self.tables[table] if extension is None else self.extensions[extension]
+        for s in signals:
+            yield s._replace(pins=[self.resolve(p, connectors) for p in s.pins])
+
+    def __repr__(self):
+        return f"<Board {self.name} ({self.device})>"
+
+# Database -----------------------------------------------------------------------------------------
+
+class BoardDB:
+    """Boards of a database, decoded on first access."""
+    def __init__(self, infos, version=db_version):
+        self.version = version
+        self._infos  = infos
+        self._boards = {}
+
+    def names(self):
+        return list(self._infos)
+
+    def __contains__(self, name):
+        return name in self._infos
+
+    def __len__(self):
+        return len(self._infos)
+
+    def __iter__(self):
+        return (self[name] for name in self._infos)
+
+    def __getitem__(self, name):
+        if name not in self._boards:
+            if name not in self._infos:
+                raise KeyError(f"Unknown board {name}.")
+            info = self._infos[name]
+            self._boards[name] = Board(name, info() if callable(info) else info)
+        return self._boards[name]
+
+def _check_version(version):
+    if version != db_version:
+        raise ValueError(f"Unsupported board database version {version} (expected {db_version}), re-export it.")
+
+def load(filename):
+    """Load a board database (JSON or binary form)."""
+    with open(filename, "rb") as f:
+        binary = f.read(len(bin_magic)) == bin_magic
+    return load_binary(filename) if binary else load_json(filename)
+
+# JSON ---------------------------------------------------------------------------------------------
+
+def load_json(filename):
+    with open(filename) as f:
+        db = json.load(f)
+    _check_version(db.get("version", None))
+    return BoardDB(db["boards"], db["version"])
+
+def write_json(db, filename):
+    with open(filename, "w") as f:
+        json.dump(db, f, separators=(",", ":"))
+
+# Binary -------------------------------------------------------------------------------------------
+
+def write_binary(db, filename):
+    strings, pool = {}, bytearray()
+    def sid(s):
+        if s is None:
+            return bin_none
+        if s not in strings:
+            strings[s] = len(strings)
+            offsets.append(len(pool))
+            pool.extend(s.encode())
+        return strings[s]
+    offsets = []
+    sections = {k: [] for k in bin_records}
+    ids = []
+    def add_ids(values):
+        first = len(ids)
+        ids.extend(values)
+        return first, len(values)
+    def add_signals(io):
+        first = len(sections["signals"])//bin_records["signals"]
+        for resource, number, subsignal, pins, iostandard, misc in io:
+            sections["signals"] += [sid(resource), number, sid(subsignal),
+                *add_ids([sid(p) for p in pins]), sid(iostandard), *add_ids([sid(m) for m in misc])]
+        return first, len(io)
+
+    for name, board in db["boards"].items():
+        connectors = list(board["connectors"])
+        first_conn = len(sections["connectors_tables"])//bin_records["connectors_tables"]
+        for table, conns in board["connectors"].items():
+            sections["connectors_tables"] += [sid(table), len(sections["connectors"])//bin_records["connectors"], len(conns)]
+            for conn, pins in conns.items():
+                pairs = [sid(v) for k, p in pins.items() for v in (k, p)]
+                sections["connectors"] += [sid(conn), *add_ids(pairs)]
+        first_table = len(sections["tables"])//bin_records["tables"]
+        for tables in [board["tables"], {k: {"io": io, "connectors": []} for k, io in board["extensions"].items()}]:
+            for table, info in tables.items():
+                conns = [connectors.index(c) for c in info["connectors"]]
+                sections["tables"] += [sid(table), *add_signals(info["io"]), *add_ids(conns)]
+        sections["boards"] += [sid(name), sid(board["family"]), sid(board["device"]),
+            first_table, len(board["tables"]), first_table + len(board["tables"]), len(board["extensions"]),
+            first_conn, len(connectors)]
+    offsets.append(len(pool))
+
+    # Layout: header, strings offsets, records sections, ids, strings pool.
+    chunks = [struct.pack(f"<{len(offsets)}I", *offsets)]
+    chunks += [struct.pack(f"<{len(sections[k])}I", *sections[k]) for k in bin_records]
+    chunks += [struct.pack(f"<{len(ids)}I", *ids), bytes(pool)]
+    positions, position = [], bin_header.size
+    for chunk in chunks:
+        positions.append(position)
+        position += len(chunk)
+    with open(filename, "wb") as f:
+        f.write(bin_header.pack(bin_magic, db["version"], len(db["boards"]), len(strings),
+            *positions, *[len(sections[k])//bin_records[k] for k in bin_records]))
+        for chunk in chunks:
+            f.write(chunk)
+
+class _BinaryReader:
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = bin_header.unpack_from(self.data, 0)
+        magic, self.version, self.nboards, self.nstrings = header[:4]
+        positions = header[4:12]
+        self.strings_offsets = positions[0]
+        self.sections        = dict(zip(bin_records, positions[1:6]))
+        self.ids             = positions[6]
+        self.pool            = positions[7]
+        self.cache           = {}
+
+        # u32 view of the file (native order when little-endian, unpacked otherwise).
+        if sys.byteorder == "little":
+            self.words = memoryview(self.data)[:len(self.data) & ~3].cast("I")
+
+    def u32(self, position, n=1):
+        if sys.byteorder == "little":
+            return self.words[position//4:position//4 + n]
+        return struct.unpack_from(f"<{n}I", self.data, position)
+
+    def record(self, kind, index):
+        n = bin_records[kind]
+        return self.u32(self.sections[kind] + 4*n*index, n)
+
+    def string(self, index):
+        if index == bin_none:
+            return None
+        s = self.cache.get(index, None)
+        if s is None:
+            start, end = self.u32(self.strings_offsets + 4*index, 2)
+            s = self.cache[index] = str(self.data[self.pool + start:self.pool + end], "utf-8")
+        return s
+
+    def get_ids(self, first, n):
+        return self.u32(self.ids + 4*first, n) if n else ()
+
+    def signals(self, first, n):
+        io = []
+        for i in range(first, first + n):
+            resource, number, subsignal, pins_first, npins, iostandard, misc_first, nmisc = self.record("signals", i)
+            io.append([self.string(resource), number, self.string(subsignal),
+                [self.string(p) for p in self.get_ids(pins_first, npins)], self.string(iostandard),
+                [self.string(m) for m in self.get_ids(misc_first, nmisc)]])
+        return io
+
+    def board(self, index):
+        name, family, device, first_table, ntables, first_ext, nexts, first_conn, nconn_tables = self.record("boards", index)
+        connectors = {}
+        for i in range(first_conn, first_conn + nconn_tables):
+            table, conns_first, nconns = self.record("connectors_tables", i)
+            conns = connectors[self.string(table)] = {}
+            for j in range(conns_first, conns_first + nconns):
+                conn, pairs_first, npairs = self.record("connectors", j)
+                pairs = self.get_ids(pairs_first, npairs)
+                conns[self.string(conn)] = {self.string(pairs[k]): self.string(pairs[k + 1]) for k in range(0, npairs, 2)}
+        names = list(connectors)
+        tables, extensions = {}, {}
+        for i in range(first_table, first_ext + nexts):
+            table, signals_first, nsignals, conns_first, nconns = self.record("tables", i)
+            io = self.signals(signals_first, nsignals)
+            if i < first_table + ntables:
+                tables[self.string(table)] = {"io": io, "connectors": [names[c] for c in self.get_ids(conns_first, nconns)]}
+            else:
+                extensions[self.string(table)] = io
+        return {"family": self.string(family), "device": self.string(device),
+            "tables": tables, "extensions": extensions, "connectors": connectors}
+
+def load_binary(filename):
+    reader = _BinaryReader(filename)
+    _check_version(reader.version)
+    infos = {}
+    for i in range(reader.nboards):
+        name = reader.string(reader.record("boards", i)[0])
+        infos[name] = lambda i=i: reader.board(i)
+    return BoardDB(infos, reader.version)
+
+# Export -------------------------------------------------------------------------------------------
+
+def _signals(io):
+    # Signal rows of an IO table (requires LiteX).
+    from litex.build.generic_platform import Pins, IOStandard, Subsignal, Misc, Drive, Inverted
+    def get(constraints, default=None):
+        pins, iostandard, misc = [], default, []
+        for c in constraints:
+            if isinstance(c, Pins):
+                pins = list(c.identifiers)
+            elif isinstance(c, IOStandard):
+                iostandard = c.name
+            elif isinstance(c, Misc):
+                misc.append(str(c.misc))
+            elif isinstance(c, Drive):
+                misc.append(f"DRIVE={c.strength}")
+            elif isinstance(c, Inverted):
+                misc.append("INVERTED")
+        return pins, iostandard, misc
+    from litex_boards.tools.pincheck import is_resource
+    rows = []
+    for resource in filter(is_resource, io):
+        name, number, constraints = resource[0], resource[1], resource[2:]
+        subsignals = [c for c in constraints if isinstance(c, Subsignal)]
+        pins, iostandard, misc = get(constraints)
+        if not subsignals:
+            rows.append([name, number, None, pins, iostandard, misc])
+        for s in subsignals:
+            s_pins, s_iostandard, s_misc = get(s.constraints, iostandard)
+            rows.append([name, number, s.name, s_pins, s_iostandard, misc + s_misc])
+    return rows
+
+def _connectors(connectors):
+    # {name: {pin: pin}} of a connectors table (requires LiteX).
+    from litex.build.generic_platform import ConnectorManager
+    table = ConnectorManager(connectors).connector_table
+    return {name: {str(k): p for k, p in (pins.items() if isinstance(pins, dict) else enumerate(pins)) if p is not None}
+        for name, pins in table.items()}
+
+def export_board(name):
+    """Database entry of a platform (imports the platform, requires Migen/LiteX)."""
+    import importlib
+    from litex_boards import registry
+    from litex_boards.tools import pincheck
+    module = importlib.import_module(f"litex_boards.platforms.{name}")
+    ios, extensions, connectors = pincheck.get_tables(module)
+    platform = getattr(module, "Platform", None)
+    # IO only generated in the Platform (ex: _get_io(io_standard)): default Platform IO.
+    if not ios and platform is not None:
+        ios = {"_io": list(platform().constraint_manager.available)}
+    info = {
+        "family"     : platform.__bases__[0].__name__ if platform is not None else None,
+        "device"     : registry.load_index()["boards"].get(name, {}).get("device", None),
+        "tables"     : {},
+        "extensions" : {k: _signals(io) for k, io in extensions.items()},
+        "connectors" : {k: _connectors(pins) for k, pins in connectors.items()},
+    }
+    # IO variants use the common connectors and their own (_io_v7_0: _connectors + _connectors_v7_0).
+    for table, io in ios.items():
+        suffix = table[len("_io"):] if table.startswith("_io") else ""
+        names  = [n for n in ["_connectors", f"_connectors{suffix}"] if n in connectors] or list(connectors)[:1]
+        info["tables"][table] = {"io": _signals(io), "connectors": names}
+    return info
+
+def export(platforms=None):
+    """Database of the platforms (default: all)."""
+    from litex_boards.tools import matrix
+    platforms = matrix.collect_platforms(excluded=[]) if platforms is None else platforms
+    db = {"version": db_version, "boards": {}}
+    for name in platforms:
+        info = export_board(name)
+        if info["tables"]:
+            db["boards"][name] = info
+        else:
+            print(f"Skipping {name}: no Platform IO tables.")
+    return db
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards board database.")
+    parser.add_argument("database",  nargs="?",     help="Database to read (JSON or binary).")
+    parser.add_argument("boards",    nargs="*",     help="Boards to show (default: list boards).")
+    parser.add_argument("--export",  default=None,  help="Export all the platforms to JSON file (requires LiteX).")
+    parser.add_argument("--binary",  default=None,  help="Also export to binary file.")
+    args = parser.parse_args()
+
+    if args.export is not None or args.binary is not None:
+        db = export()
+        for filename, write in [(args.export, write_json), (args.binary, write_binary)]:
+            if filename is not None:
+                os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+                write(db, filename)
+                print(f"{len(db['boards'])} boards exported to {filename} ({os.path.getsize(filename)/1e3:.0f}kB).")
+    if args.database is not None:
+        db = load(args.database)
+        for name in args.boards or []:
+            board = db[name]
+            for table in board.tables:
+                print(f"{board.name}:{table}")
+                for s in board.pins(table):
+                    subsignal = "" if s.subsignal is None else f":{s.subsignal}"
+                    print(f"    {s.resource}:{s.number}{subsignal:20s} {' '.join(s.pins):40s} {s.iostandard or ''}")
+        if not args.boards:
+            for board in db:
+                print(f"{board.name:40s} {board.device or '-':32s} {len(board.tables)} IO tables")
+
+if __name__ == "__main__":
+    main()
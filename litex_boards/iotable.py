@@ -0,0 +1,182 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# IO Table: compiled form of the IOs/connectors of a platform, built once per platform IO list and
+# shared by all instances of the platform. Resources are indexed by name (in IO order) so that
+# request()/lookup_request() no longer scan the whole IO list on each call, which matters for the
+# large platforms (hundreds of IOs plus FMC/connector extensions). Connector pins ("pmoda:0") are
+# resolved once per platform and cached (with IndexedConstraintManager only: the platforms created
+# outside of --indexed-io keep the LiteX ConnectorManager).
+#
+# Opt-in: the runner's --indexed-io uses it for all the platforms created by the run. The platform
+# modules themselves keep the LiteX ConstraintManager and do not expose the indexed form.
+#
+# Extensions can be applied in bulk (on any platform: connector pins resolved once, single update of
+# the IO list/index):
+#
+# add_extensions(platform, [raw_pmod_io("pmoda"), usb_pmod_io("pmodb"), sdcard_pmod_io("pmodc")])
+#
+# python3 -m litex_boards.tools.run --indexed-io digilent_arty --build        (use on any platform)
+# python3 -m litex_boards.tools.bench --requests xilinx_vc707 xilinx_kc705   (request() benchmark)
+
+import contextlib
+
+from litex.build.generic_platform import ConstraintManager, ConnectorManager, ConstraintError
+
+# IO Table -----------------------------------------------------------------------------------------
+
+class IOTable:
+    """IO resources indexed by name (in IO order) and parsed connectors table."""
+    def __init__(self, io, connectors=[]):
+        self.io              = list(io)
+        self.resources       = index_resources(self.io)
+        self.connector_table = ConnectorManager(connectors).connector_table
+        self.resolved        = {} # Resolved connector pins: {"conn:pin": pin}.
+
+def index_resources(io):
+    # {name: [resources]}, resources in IO order.
+    resources = {}
+    for resource in io:
+        resources.setdefault(resource[0], []).append(resource)
+    return resources
+
+_io_tables = {}
+
+def get_io_table(io, connectors=[], key=None):
+    """IOTable of io/connectors, built on first use (key: cache key when io is built on each call)."""
+    by_id = key is None
+    if by_id:
+        key = (id(io), id(connectors))
+    entry = _io_tables.get(key, None)
+    # Keep the IO list referenced and check it is unchanged (ids can be reused otherwise).
+    if entry is None or (by_id and entry[0] is not io) or len(entry[1].io) != len(io):
+        entry = _io_tables[key] = (io, IOTable(io, connectors))
+    return entry[1]
+
+# Cached Connector Manager -------------------------------------------------------------------------
+
+class CachedConnectorManager(ConnectorManager):
+    """ConnectorManager caching resolved connector pins (shared with the IOTable for the platform
+    connectors, per instance for the connectors added to the instance)."""
+    def __init__(self, table):
+        self.connector_table = dict(table.connector_table)
+        self.table           = table
+        self.resolved        = {}
+
+    def resolve_identifier(self, identifier):
+        pin = self.resolved.get(identifier, None) or self.table.resolved.get(identifier, None)
+        if pin is None:
+            pin = ConnectorManager.resolve_identifiers(self, [identifier])[0]
+            if identifier.split(":")[0] in self.table.connector_table:
+                self.table.resolved[identifier] = pin
+            else:
+                self.resolved[identifier] = pin
+        return pin
+
+    def resolve_identifiers(self, identifiers):
+        return [self.resolve_identifier(i) if ":" in i else i for i in identifiers]
+
+# Indexed Constraint Manager -----------------------------------------------------------------------
+
+class IndexedConstraintManager(ConstraintManager):
+    """ConstraintManager using the (shared) IOTable index of the platform IOs."""
+    def __init__(self, io, connectors=[], key=None):
+        table = get_io_table(io, connectors, key)
+        # Connectors parsed once in the shared table.
+        super().__init__(table.io, [])
+        self.connector_manager = CachedConnectorManager(table)
+        self._available        = {name: list(resources) for name, resources in table.resources.items()}
+        self._matched          = {}
+
+    def add_extension(self, io, prepend=False):
+        ConstraintManager.add_extension(self, io, prepend)
+        for name, resources in index_resources(io).items():
+            available = self._available.setdefault(name, [])
+            if prepend:
+                available[:0] = resources
+            else:
+                available.extend(resources)
+
+    def _lookup(self, name, number):
+        for resource in self._available.get(name, []):
+            if number is None or resource[1] == number:
+                return resource
+        return None
+
+    def request(self, name, number=None, loose=False):
+        resource = self._lookup(name, number)
+        if resource is None:
+            if loose:
+                return None
+            raise ConstraintError("Resource not found: {}:{}".format(name, number))
+        # Create the Signal/Record with ConstraintManager.request on the looked up resource only.
+        available, self.available = self.available, [resource]
+        try:
+            obj = ConstraintManager.request(self, name, number, loose)
+        finally:
+            self.available = available
+        self.available.remove(resource)
+        self._available[name].remove(resource)
+        self._matched.setdefault(name, []).append((resource, obj))
+        return obj
+
+    def lookup_request(self, name, number=None, loose=False):
+        subname = None
+        if ":" in name: name, subname = name.split(":")
+        for resource, obj in self._matched.get(name, []):
+            if number is None or resource[1] == number:
+                return obj if subname is None else getattr(obj, subname)
+        if loose:
+            return None
+        raise ConstraintError("Resource not found: {}:{}".format(name, number))
+
+# Extensions ---------------------------------------------------------------------------------------
+
+def resolve_resource(resource, resolve):
+    """Resource with its connector pins resolved (Pins("pmoda:0") -> Pins("G13"))."""
+    from litex.build.generic_platform import Pins, Subsignal
+    def resolve_constraints(constraints):
+        r = []
+        for c in constraints:
+            if isinstance(c, Pins) and any(":" in i for i in c.identifiers):
+                c = Pins(*resolve(c.identifiers))
+            elif isinstance(c, Subsignal):
+                c = Subsignal(c.name, *resolve_constraints(c.constraints))
+            r.append(c)
+        return r
+    return tuple(resource[:2]) + tuple(resolve_constraints(resource[2:]))
+
+def add_extensions(platform, ios, prepend=False):
+    """Add several IO extensions to platform at once: connector pins resolved once (with the cache
+    of the platform connectors with an IndexedConstraintManager, per call otherwise) and a single
+    update of the IO list/index."""
+    manager = platform.constraint_manager.connector_manager
+    cache   = {}
+    def resolve(identifiers):
+        if isinstance(manager, CachedConnectorManager):
+            return manager.resolve_identifiers(identifiers)
+        for i in identifiers:
+            if i not in cache:
+                cache[i] = manager.resolve_identifiers([i])[0]
+        return [cache[i] for i in identifiers]
+    io = []
+    for resource in [resource for ext_io in ios for resource in ext_io]:
+        try:
+            io.append(resolve_resource(resource, resolve))
+        except (AssertionError, ValueError, KeyError, IndexError):
+            # Kept unresolved: LiteX only reports unknown connector pins on request.
+            io.append(resource)
+    platform.add_extension(io, prepend=prepend)
+
+# Hook ---------------------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def indexed_io_hook():
+    """Use IndexedConstraintManager for all platforms created in the context."""
+    from litex.build import generic_platform
+    from litex_boards.tools.hooks import patch
+    with patch(generic_platform, "ConstraintManager", lambda cls: IndexedConstraintManager):
+        yield
@@ -0,0 +1,395 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Board Registry: list and query boards from a precomputed index (litex_boards/index.json) without
+# importing the platforms; only the platform of the selected board is imported, on request.
+#
+# The index is extracted statically from the platforms/targets sources (no Migen/LiteX required):
+# python3 -m litex_boards.registry --update  (regenerate the index)
+# python3 -m litex_boards.registry --check   (check the index against the sources)
+
+import os
+import ast
+import sys
+import json
+import hashlib
+import argparse
+import importlib
+
+# Paths --------------------------------------------------------------------------------------------
+
+litex_boards_dir = os.path.dirname(os.path.abspath(__file__))
+index_filename   = os.path.join(litex_boards_dir, "index.json")
+index_version    = 1
+
+# Board --------------------------------------------------------------------------------------------
+
+class Board:
+    """Board entry of the index; Platform/platform() import the platform module on first use."""
+    def __init__(self, name, info):
+        self.name               = name
+        self.family             = info["family"]
+        self.device             = info["device"]
+        self.devices            = info["devices"]
+        self.default_clk_name   = info["default_clk_name"]
+        self.default_clk_period = info["default_clk_period"]
+        self.toolchain          = info["toolchain"]
+        self.options            = info["options"]
+        self.programmers        = info["programmers"]
+        self.io                 = info["io"]
+        self.connectors         = info["connectors"]
+        self.extensions         = info["extensions"]
+        self.targets            = info["targets"]
+
+    @property
+    def default_clk_freq(self):
+        if self.default_clk_period is None:
+            return None
+        return 1e9/self.default_clk_period
+
+    @property
+    def variants(self):
+        # Board variants/revisions (ex: variant="a7-35", revision="7.0").
+        return {k: v["values"] for k, v in self.options.items() if k != "toolchain" and v["values"]}
+
+    @property
+    def module_name(self):
+        return f"litex_boards.platforms.{self.name}"
+
+    def import_module(self):
+        return importlib.import_module(self.module_name)
+
+    @property
+    def Platform(self):
+        return self.import_module().Platform
+
+    def platform(self, **kwargs):
+        return self.Platform(**kwargs)
+
+    def __repr__(self):
+        return f"<Board {self.name} ({self.device})>"
+
+# Index --------------------------------------------------------------------------------------------
+
+_index = None
+
+def load_index(filename=None):
+    global _index
+    if filename is not None:
+        with open(filename) as f:
+            return json.load(f)
+    if _index is None:
+        with open(index_filename) as f:
+            _index = json.load(f)
+    return _index
+
+def boards(**filters):
+    """Return the list of Boards, optionally filtered on attributes (ex: family="GowinPlatform")."""
+    r = []
+    for name, info in sorted(load_index()["boards"].items()):
+        board = Board(name, info)
+        if all(getattr(board, k) == v for k, v in filters.items()):
+            r.append(board)
+    return r
+
+def get(name):
+    """Return the Board with the given name (ex: "digilent_arty")."""
+    infos = load_index()["boards"]
+    if name not in infos:
+        raise ValueError(f"Unknown board {name}, use litex_boards.boards() to list available boards.")
+    return Board(name, infos[name])
+
+# Sources Analysis ---------------------------------------------------------------------------------
+
+def _sha256(filename):
+    with open(filename, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _list_sources(kind):
+    sources = []
+    for file in sorted(os.listdir(os.path.join(litex_boards_dir, kind))):
+        if file.endswith(".py") and file != "__init__.py":
+            sources.append(os.path.join(kind, file))
+    return sources
+
+def _literal(node, env={}):
+    # Evaluate simple expressions (constants, containers, arithmetic, names from env).
+    if isinstance(node, ast.Name):
+        if node.id in env:
+            return env[node.id]
+        raise ValueError
+    if isinstance(node, ast.BinOp):
+        ops = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+               ast.Mult: lambda a, b: a*b, ast.Div: lambda a, b: a/b}
+        return ops[type(node.op)](_literal(node.left, env), _literal(node.right, env))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format"):
+        return _literal(node.func.value, env).format(*[_literal(arg, env) for arg in node.args])
+    if isinstance(node, ast.JoinedStr):
+        r = ""
+        for value in node.values:
+            r += str(_literal(value.value if isinstance(value, ast.FormattedValue) else value, env))
+        return r
+    return ast.literal_eval(node)
+
+def _resource_names(node):
+    # Names of the resources of an IO list: [("name", number, ...), ...].
+    names = []
+    if isinstance(node, ast.List):
+        for elt in node.elts:
+            if isinstance(elt, ast.Tuple) and elt.elts and isinstance(elt.elts[0], ast.Constant):
+                if isinstance(elt.elts[0].value, str) and elt.elts[0].value not in names:
+                    names.append(elt.elts[0].value)
+    return names
+
+def _param_values(func, param, module_env):
+    # Values a parameter of Platform.__init__ can take, from asserts/comparisons/dict lookups.
+    values = []
+    def add(node, env={}):
+        try:
+            value = _literal(node, env)
+        except Exception:
+            return
+        for v in (value if isinstance(value, (list, tuple, set)) else [value]):
+            if v not in values:
+                values.append(v)
+    for node in ast.walk(func):
+        # assert param in [...] / if param == "...".
+        if isinstance(node, ast.Compare) and isinstance(node.left, ast.Name) and node.left.id == param:
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.Eq)):
+                    # Also support assert param in _device_map.keys().
+                    if (isinstance(comparator, ast.Call) and isinstance(comparator.func, ast.Attribute) and
+                        comparator.func.attr == "keys"):
+                        comparator = comparator.func.value
+                    if isinstance(comparator, ast.Name) and isinstance(module_env.get(comparator.id), dict):
+                        add(ast.Constant(list(module_env[comparator.id].keys())))
+                    elif isinstance(comparator, ast.Dict):
+                        add(ast.List(elts=comparator.keys, ctx=ast.Load()))
+                    else:
+                        add(comparator)
+        # {...}[param].
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Name) and node.slice.id == param:
+            if isinstance(node.value, ast.Dict):
+                add(ast.List(elts=node.value.keys, ctx=ast.Load()))
+            elif isinstance(node.value, ast.Name) and isinstance(module_env.get(node.value.id), dict):
+                add(ast.Constant(list(module_env[node.value.id].keys())))
+    return values
+
+def _parse_platform(filename):
+    with open(filename) as f:
+        tree = ast.parse(f.read())
+
+    # Module level: IOs/Connectors lists (also from _get_io functions), extensions and constants.
+    io, connectors, extensions, module_env = [], [], [], {}
+    def add_names(names, dst):
+        dst += [name for name in names if name not in dst]
+    nodes = list(tree.body)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            if node.name.startswith("_get_io"):
+                nodes += [n for n in ast.walk(node) if n is not node]
+            elif node.name.endswith("_io") and not node.name.startswith("_"):
+                extensions.append(node.name)
+    for node in nodes:
+        if isinstance(node, (ast.Assign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id.startswith("_io"):
+                    add_names(_resource_names(node.value), io)
+                if target.id.startswith("_connectors"):
+                    add_names(_resource_names(node.value), connectors)
+                try:
+                    module_env[target.id] = _literal(node.value)
+                except Exception:
+                    pass
+
+    # Platform class.
+    platform = None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Platform":
+            platform = node
+    if platform is None:
+        return None
+    info = {
+        "family"             : platform.bases[0].id if isinstance(platform.bases[0], ast.Name) else None,
+        "device"             : None,
+        "devices"            : [],
+        "default_clk_name"   : None,
+        "default_clk_period" : None,
+        "toolchain"          : None,
+        "options"            : {},
+        "programmers"        : [],
+        "io"                 : io,
+        "connectors"         : connectors,
+        "extensions"         : extensions,
+    }
+    for node in platform.body:
+        # Default clock.
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id in ["default_clk_name", "default_clk_period"]:
+                try:
+                    info[node.targets[0].id] = _literal(node.value)
+                except Exception:
+                    pass
+        # Programmers.
+        if isinstance(node, ast.FunctionDef) and node.name == "create_programmer":
+            for n in ast.walk(node):
+                if isinstance(n, ast.Return) and isinstance(n.value, ast.Call):
+                    func = n.value.func
+                    name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+                    if name is not None and name not in info["programmers"]:
+                        info["programmers"].append(name)
+        # Options / Device.
+        if isinstance(node, ast.FunctionDef) and node.name == "__init__":
+            args     = node.args.args[1:]
+            defaults = [None]*(len(args) - len(node.args.defaults)) + node.args.defaults
+            env      = dict(module_env)
+            for arg, default in zip(args, defaults):
+                try:
+                    default = _literal(default) if default is not None else None
+                except Exception:
+                    default = None
+                values = _param_values(node, arg.arg, module_env)
+                if default is not None and values and default not in values:
+                    values.insert(0, default)
+                info["options"][arg.arg] = {"default": default, "values": values}
+                env[arg.arg] = default
+            info["toolchain"] = info["options"].get("toolchain", {}).get("default", None)
+            info["device"], info["devices"] = _parse_device(node, info, env)
+    return info
+
+def _parse_device(func, info, env):
+    # Find device/toolchain arguments of the vendor platform's __init__ call.
+    device = None
+    for node in ast.walk(func):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and
+            node.func.attr == "__init__" and isinstance(node.func.value, ast.Name) and
+            node.func.value.id == info["family"]):
+            args = node.args[1:]
+            if args:
+                device = args[0]
+            for keyword in node.keywords:
+                if keyword.arg == "device":
+                    device = keyword.value
+                if keyword.arg == "toolchain" and isinstance(keyword.value, ast.Constant):
+                    info["toolchain"] = keyword.value.value
+    if device is None:
+        return None, []
+
+    # Resolve local assignments (a name can be assigned in several branches).
+    assigns = {}
+    for node in ast.walk(func):
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            assigns.setdefault(node.targets[0].id, []).append(node.value)
+    candidates = [device]
+    for i in range(4):
+        candidates = sum([assigns.get(c.id, [c]) if isinstance(c, ast.Name) else [c] for c in candidates], [])
+
+    # Default device and all devices (over all values of the parameters used for the device).
+    def evaluate(node, env):
+        if isinstance(node, ast.Subscript):
+            table = _literal(node.value, env)
+            return table[_literal(node.slice, env)]
+        return _literal(node, env)
+    default, devices = None, []
+    for candidate in candidates:
+        envs   = [env]
+        params = [n.id for n in ast.walk(candidate) if isinstance(n, ast.Name) and n.id in info["options"]]
+        for param in params:
+            envs += [dict(env, **{param: value}) for value in info["options"][param]["values"]]
+        for e in envs:
+            try:
+                d = evaluate(candidate, e)
+            except Exception:
+                continue
+            if default is None and e is env:
+                default = d
+            if d not in devices:
+                devices.append(d)
+    if default is None and devices:
+        default = devices[0]
+    return default, devices
+
+def _parse_target_platforms(filename):
+    # Platforms imported by a target (from litex_boards.platforms import xyz).
+    with open(filename) as f:
+        tree = ast.parse(f.read())
+    platforms = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == "litex_boards.platforms":
+            platforms += [alias.name for alias in node.names]
+    return platforms
+
+def generate_index():
+    index = {"version": index_version, "sources": {}, "boards": {}}
+    targets = {}
+    for source in _list_sources("targets"):
+        index["sources"][source] = _sha256(os.path.join(litex_boards_dir, source))
+        for platform in _parse_target_platforms(os.path.join(litex_boards_dir, source)):
+            targets.setdefault(platform, []).append(os.path.basename(source)[:-3])
+    for source in _list_sources("platforms"):
+        index["sources"][source] = _sha256(os.path.join(litex_boards_dir, source))
+        name = os.path.basename(source)[:-3]
+        info = _parse_platform(os.path.join(litex_boards_dir, source))
+        if info is None:
+            continue # Not a platform (ex: daughterboards).
+        info["targets"] = targets.get(name, [])
+        index["boards"][name] = info
+    return index
+
+def write_index(index, filename=index_filename):
+    with open(filename, "w") as f:
+        json.dump(index, f, indent=1)
+        f.write("\n")
+
+def check_index(index=None):
+    """Return the list of sources (added/removed/modified) that are not up to date in the index."""
+    if index is None:
+        index = load_index()
+    stale   = []
+    sources = _list_sources("targets") + _list_sources("platforms")
+    for source in sources:
+        sha256 = index["sources"].get(source, None)
+        if sha256 is None:
+            stale.append((source, "added"))
+        elif sha256 != _sha256(os.path.join(litex_boards_dir, source)):
+            stale.append((source, "modified"))
+    for source in index["sources"]:
+        if source not in sources:
+            stale.append((source, "removed"))
+    if index.get("version", None) != index_version:
+        stale.append((os.path.basename(index_filename), "version"))
+    return stale
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards board registry.")
+    parser.add_argument("--update", action="store_true", help="Regenerate the index.")
+    parser.add_argument("--check",  action="store_true", help="Check the index against the sources.")
+    parser.add_argument("--list",   action="store_true", help="List boards.")
+    args = parser.parse_args()
+
+    if args.update:
+        index = generate_index()
+        write_index(index)
+        print(f"{len(index['boards'])} boards indexed in {index_filename}.")
+    if args.check:
+        stale = check_index(load_index(index_filename))
+        for source, reason in stale:
+            print(f"{source}: {reason}")
+        if stale:
+            print("Index is stale, regenerate it with: python3 -m litex_boards.registry --update")
+            sys.exit(1)
+        print("Index is up to date.")
+    if args.list:
+        for board in boards():
+            print(f"{board.name:40s} {board.device or '-':32s} {board.toolchain or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -51,12 +51,8 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 
 from litex.soc.cores.clock import *
-from litex.soc.cores.video import VideoS6HDMIPHY
 from litex.soc.cores.led import LedChaser
 
-from litedram.modules import MT48LC32M8, SDRModule
-from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -118,6 +114,8 @@ class BaseSoC(SoCCore):
 
         # Add SDRAM if a shield with RAM has been added
         if not self.integrated_main_ram_size and (with_hdmi_shield or with_sdram_shield):
+            from litedram.modules import MT48LC32M8
+            from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
             sdram_clk = ClockSignal("sys2x_ps" if sdram_rate == "1:2" else "sys_ps")
             self.crg.specials += DDROutput(1, 0, platform.request("sdram_clock"), sdram_clk)
 
@@ -131,6 +129,7 @@ class BaseSoC(SoCCore):
         
         # HDMI Options -----------------------------------------------------------------------------
         if with_hdmi_shield and (with_video_colorbars or with_video_framebuffer or with_video_terminal):
+            from litex.soc.cores.video import VideoS6HDMIPHY
             self.videophy = VideoS6HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_colorbars:
                 self.add_video_colorbars(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
@@ -21,19 +21,6 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 from litex.soc.cores.bitbang import I2CMaster
-from litex.soc.cores.video import VideoS7HDMIPHY
-
-from litedram.modules import MTA18ASF2G72PZ
-from litedram.phy.s7ddrphy import A7DDRPHY
-from litedram.init import get_sdram_phy_py_header
-from litedram.core.controller import ControllerSettings
-from litedram.common import PhySettings, GeomSettings, TimingSettings
-
-from liteeth.phy import LiteEthS7PHYRGMII
-from litex.soc.cores.hyperbus import HyperRAM
-
-from litespi.modules import S25FL128S0
-from litespi.opcodes import SpiNorFlashOpCodes as Codes
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -100,6 +87,8 @@ class BaseSoC(SoCCore):
 
         # DDR4 SDRAM RDIMM -------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
+            from litedram.modules import MTA18ASF2G72PZ
+            from litedram.phy.s7ddrphy import A7DDRPHY
             self.ddrphy = A7DDRPHY(platform.request("ddr4"),
                 memtype         = "DDR4",
                 iodelay_clk_freq = iodelay_clk_freq,
@@ -116,6 +105,7 @@ class BaseSoC(SoCCore):
 
         # HyperRAM ---------------------------------------------------------------------------------
         if with_hyperram:
+            from litex.soc.cores.hyperbus import HyperRAM
             self.hyperram = HyperRAM(platform.request("hyperram"), sys_clk_freq=sys_clk_freq)
             self.bus.add_slave("hyperram", slave=self.hyperram.bus, region=SoCRegion(origin=0x20000000, size=8*1024*1024))
 
@@ -125,6 +115,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy import LiteEthS7PHYRGMII
             # Traces between PHY and FPGA introduce ignorable delays of ~0.165ns +/- 0.015ns.
             # PHY chip does not introduce delays on TX (FPGA->PHY), however it includes 1.2ns
             # delay for RX CLK so we only need 0.8ns to match the desired 2ns.
@@ -151,6 +142,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoS7HDMIPHY
             self.videophy = VideoS7HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_terminal:
                 self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
@@ -159,6 +151,8 @@ class BaseSoC(SoCCore):
 
         # SPI Flash --------------------------------------------------------------------------------
         if with_spi_flash:
+            from litespi.modules import S25FL128S0
+            from litespi.opcodes import SpiNorFlashOpCodes as Codes
             self.add_spi_flash(mode="4x", module=S25FL128S0(Codes.READ_1_1_4), with_master=True)
 
         # System I2C (behing multiplexer) ----------------------------------------------------------
@@ -166,6 +160,7 @@ class BaseSoC(SoCCore):
         self.i2c = I2CMaster(i2c_pads)
 
     def generate_sdram_phy_py_header(self, output_file):
+        from litedram.init import get_sdram_phy_py_header
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         f = open(output_file, "w")
         f.write(get_sdram_phy_py_header(
@@ -178,6 +173,8 @@ class BaseSoC(SoCCore):
 
 class LiteDRAMSettingsEncoder(json.JSONEncoder):
     def default(self, o):
+        from litedram.core.controller import ControllerSettings
+        from litedram.common import PhySettings, GeomSettings, TimingSettings
         if isinstance(o, (ControllerSettings, GeomSettings, PhySettings, TimingSettings)):
             ignored = ["self", "refresh_cls"]
             return {k: v for k, v in vars(o).items() if k not in ignored}
@@ -24,8 +24,6 @@ from litex.soc.cores.led import LedChaser
 from litex.soc.interconnect import wishbone
 
 from litex.soc.integration.soc import colorer
-from litex.soc.cores.video import VideoVGAPHY
-from liteeth.phy.rmii import LiteEthPHYRMII
 
 
 # CRG ----------------------------------------------------------------------------------------------
@@ -186,6 +184,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.rmii import LiteEthPHYRMII
             self.ethphy = LiteEthPHYRMII(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"))
@@ -196,6 +195,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoVGAPHY
             self.videophy = VideoVGAPHY(platform.request("vga"), clock_domain="vga")
             if with_video_terminal:
                 self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="vga")
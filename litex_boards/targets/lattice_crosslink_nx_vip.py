@@ -16,8 +16,6 @@ from litex.gen import *
 
 from litex_boards.platforms import lattice_crosslink_nx_vip
 
-from litex.soc.cores.hyperbus import HyperRAM
-
 from litex.soc.cores.ram import NXLRAM
 from litex.build.io import CRG
 from litex.build.generic_platform import *
@@ -87,6 +85,7 @@ class BaseSoC(SoCCore):
             self.bus.add_slave("sram", slave=self.spram.bus, region=SoCRegion(origin=self.mem_map["sram"],
                 size=size))
         else:
+            from litex.soc.cores.hyperbus import HyperRAM
             # Use HyperRAM generic PHY as SRAM -----------------------------------------------------
             size = 8*1024*kB
             hr_pads = platform.request("hyperram", int(hyperram))
@@ -20,9 +20,6 @@ from litex.soc.integration.builder import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.cores.led import LedChaser
 
-from litedram.modules import MT41K64M16
-from litedram.phy import ECP5DDRPHY
-from litex.soc.cores.video import VideoVGAPHY
 from litex.soc.cores.bitbang import I2CMaster
 
 
@@ -88,6 +85,8 @@ class BaseSoC(SoCCore):
         with_video_terminal    = True,
         with_video_framebuffer = False,
         **kwargs):
+        from litedram.modules import MT41K64M16
+        from litedram.phy import ECP5DDRPHY
         platform = lattice_ecp5_vip.Platform(toolchain=toolchain)
 
         # CRG --------------------------------------------------------------------------------------
@@ -110,6 +109,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoVGAPHY
             pads = platform.request("hdmi")
             self.videophy = VideoVGAPHY(pads, clock_domain="hdmi")
             self.videoi2c = I2CMaster(pads)
@@ -19,10 +19,6 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.video import VideoDVIPHY
-
-from litedram.modules import MT40A512M16
-from litedram.phy import usddrphy
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -81,6 +77,8 @@ class BaseSoC(SoCCore):
 
         # DDR4 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
+            from litedram.modules import MT40A512M16
+            from litedram.phy import usddrphy
             self.ddrphy = usddrphy.USPDDRPHY(platform.request("ddram"),
                 memtype          = "DDR4",
                 sys_clk_freq     = sys_clk_freq,
@@ -107,6 +105,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_framebuffer:
+            from litex.soc.cores.video import VideoDVIPHY
             platform.add_extension(opalkelly_xem8320._dvi_pmod_io)
             self.videophy = VideoDVIPHY(platform.request("dvi"), clock_domain="hdmi")
             self.add_video_framebuffer(phy=self.videophy, timings="640x480@75Hz", clock_domain="hdmi")
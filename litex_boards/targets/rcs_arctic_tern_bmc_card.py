@@ -20,11 +20,6 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.integration.soc import SoCRegion
 
-from litedram.modules import MT41J256M16
-from litedram.phy import ECP5DDRPHY
-from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
-from litex.soc.cores.video import VideoGenericPHY
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -101,6 +96,8 @@ class BaseSoC(SoCCore):
         with_etherbone         = False,
         eth_ip                 = "192.168.1.50",
         **kwargs):
+        from litedram.modules import MT41J256M16
+        from litedram.phy import ECP5DDRPHY
         platform = rcs_arctic_tern_bmc_card.Platform(toolchain=toolchain)
 
         # CRG --------------------------------------------------------------------------------------
@@ -126,6 +123,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", 0),
                 pads       = self.platform.request("eth", 0),
@@ -138,6 +136,7 @@ class BaseSoC(SoCCore):
 
         # Video Output -----------------------------------------------------------------------------
         if with_video_colorbars or with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoGenericPHY
             dvo_pads = platform.request("dvo")
             self.videophy = VideoGenericPHY(dvo_pads, clock_domain="dvo", with_clk_ddr_output=False)
             if with_video_terminal:
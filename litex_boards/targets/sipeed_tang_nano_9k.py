@@ -18,9 +18,6 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.video import *
-
-from litex.soc.cores.hyperbus import HyperRAM
 
 kB = 1024
 mB = 1024*kB
@@ -91,6 +88,7 @@ class BaseSoC(SoCCore):
 
         # HyperRAM ---------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
+            from litex.soc.cores.hyperbus import HyperRAM
             # TODO: Use second 32Mbit PSRAM chip.
             dq      = platform.request("IO_psram_dq")
             rwds    = platform.request("IO_psram_rwds")
@@ -119,6 +117,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoGowinHDMIPHY
             self.videophy = VideoGowinHDMIPHY(platform.request("hdmi"), clock_domain="hdmi")
             self.add_video_colorbars(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
             #self.add_video_terminal(phy=self.videophy, timings="640x480@75Hz", clock_domain="hdmi") # FIXME: Free up BRAMs.
@@ -18,16 +18,9 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser, WS2812
 from litex.soc.cores.gpio import GPIOIn
-from litex.soc.cores.video import *
-
-from liteeth.phy.rmii import LiteEthPHYRMII
 
 from litex_boards.platforms import sipeed_tang_primer_20k
 
-from litedram.common import PHYPadsReducer
-from litedram.modules import MT41J128M16
-from litedram.phy import GW2DDRPHY
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -124,6 +117,9 @@ class BaseSoC(SoCCore):
         # DDR3 SDRAM -------------------------------------------------------------------------------
         # FIXME: WIP / Untested.
         if not self.integrated_main_ram_size:
+            from litedram.common import PHYPadsReducer
+            from litedram.modules import MT41J128M16
+            from litedram.phy import GW2DDRPHY
             self.ddrphy = GW2DDRPHY(
                 pads         = PHYPadsReducer(platform.request("ddram"), [0, 1]),
                 sys_clk_freq = sys_clk_freq
@@ -162,6 +158,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.rmii import LiteEthPHYRMII
             from liteeth.phy.rmii import LiteEthPHYRMII
             self.ethphy = LiteEthPHYRMII(
                 clock_pads = self.platform.request("eth_clocks"),
@@ -175,6 +172,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoHDMIPHY
             hdmi_pads = platform.request("hdmi")
             self.comb += hdmi_pads.hdp.eq(1)
             self.videophy = VideoHDMIPHY(hdmi_pads, clock_domain="hdmi")
@@ -15,13 +15,9 @@ from litex.soc.cores.clock import CycloneVPLL
 from litex.soc.integration.soc_core  import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.video import VideoVGAPHY
 
 from litex.build.io import DDROutput
 
-from litedram.modules import W9825G6KH6, AS4C32M16
-from litedram.phy import HalfRateGENSDRPHY, GENSDRPHY
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -85,6 +81,8 @@ class BaseSoC(SoCCore):
 
         # SDR SDRAM --------------------------------------------------------------------------------
         if mister_sdram is not None:
+            from litedram.modules import W9825G6KH6, AS4C32M16
+            from litedram.phy import HalfRateGENSDRPHY, GENSDRPHY
             sdrphy_cls = HalfRateGENSDRPHY if sdram_rate == "1:2" else GENSDRPHY
             sdrphy_mod = {"xs_v22": W9825G6KH6, "xs_v24": AS4C32M16}[mister_sdram]
             self.sdrphy = sdrphy_cls(platform.request("sdram"), sys_clk_freq)
@@ -96,6 +94,7 @@ class BaseSoC(SoCCore):
 
         # Video Terminal ---------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoVGAPHY
             vga_pads = platform.request("vga")
             self.comb += [ vga_pads.sync_n.eq(0), vga_pads.blank_n.eq(1) ]
             self.specials += DDROutput(i1=1, i2=0, o=vga_pads.clk, clk=ClockSignal("vga"))
@@ -18,8 +18,6 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
-from litex.soc.cores.hyperbus import HyperRAM
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -36,6 +34,7 @@ class _CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=100e6, with_led_chaser=True, **kwargs):
+        from litex.soc.cores.hyperbus import HyperRAM
         platform = trenz_te0725.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -22,9 +22,6 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
-from litedram.modules import MT48LC4M16  # FIXME: use EtronTech reference.
-from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
-
 kB = 1024
 mB = 1024*kB
 
@@ -86,6 +83,8 @@ class BaseSoC(SoCCore):
 
         # SDR SDRAM --------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
+            from litedram.modules import MT48LC4M16
+            from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
             class SDRAMPads:
                 def __init__(self):
                     self.clk   = platform.request("O_sdram_clk")
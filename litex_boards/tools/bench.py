@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Elaboration Benchmark: measure for each target (default configuration and heavy features supported
+# by the target) the import time, BaseSoC construction time, gateware generation time and peak
+# memory, compare them to a stored baseline and report regressions.
+#
+# python3 -m litex_boards.tools.bench --update-baseline                  (measure and store baseline)
+# python3 -m litex_boards.tools.bench --threshold=20                     (flag regressions > 20%)
+# python3 -m litex_boards.tools.bench xilinx_alveo_u280 sqrl_fk33        (selected targets)
+# python3 -m litex_boards.tools.bench --startup --startup-budget=1.0     (startup/--help time budget)
+# python3 -m litex_boards.tools.bench --requests xilinx_vc707            (platform.request() cost)
+#
+# Each benchmark runs in its own interpreter; use -j1 (default) for stable timings.
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import importlib
+import subprocess
+
+from litex_boards.tools import matrix
+
+# Parameters ---------------------------------------------------------------------------------------
+
+features = {
+    "pcie"              : ["--with-pcie"],
+    "ethernet"          : ["--with-ethernet"],
+    "video-framebuffer" : ["--with-video-framebuffer"],
+    "sata"              : ["--with-sata"],
+    "hbm"               : ["--with-hbm"],
+}
+
+metrics = {
+    # Name       : Noise floor (absolute differences below are not considered as regressions).
+    "import"     : 0.05, # s.
+    "construct"  : 0.05, # s.
+    "gateware"   : 0.10, # s.
+    "memory"     : 16,   # MB.
+}
+
+metrics_filename = "bench.json"
+
+# Cores only imported by targets when the corresponding feature is enabled.
+gated_modules = [
+    "litedram",
+    "liteeth",
+    "litepcie",
+    "litescope",
+    "litesata",
+    "litex.soc.cores.video",
+    "litex.soc.cores.hyperbus",
+    "litex.soc.cores.usb_ohci",
+]
+
+# Collect ------------------------------------------------------------------------------------------
+
+def get_features(target):
+    """Heavy features supported by a target (from its arguments)."""
+    with open(os.path.join(matrix.litex_boards_dir, "targets", f"{target}.py")) as f:
+        source = f.read()
+    return [name for name, args in features.items() if all(f'"{arg}"' in source for arg in args)]
+
+class BenchJob(matrix.Job):
+    """Elaboration benchmark of a target configuration, measured in its own interpreter."""
+    def get_command(self):
+        return [sys.executable, "-m", "litex_boards.tools.bench", "--measure", self.module] + self.args
+
+def bench_job(target, feature, output_dir):
+    name       = target if feature is None else f"{target}+{feature}"
+    output_dir = os.path.join(output_dir, name)
+    return BenchJob("bench", name,
+        module     = f"litex_boards.targets.{target}",
+        output_dir = output_dir,
+        args       = [
+            "--build",
+            "--no-compile",
+            f"--output-dir={os.path.abspath(output_dir)}",
+        ] + ([] if feature is None else features[feature])
+    )
+
+def collect_jobs(output_dir, targets, with_features=True):
+    jobs = []
+    for target in targets:
+        jobs.append(bench_job(target, None, output_dir))
+        if with_features:
+            jobs += [bench_job(target, feature, output_dir) for feature in get_features(target)]
+    return jobs
+
+# Measure ------------------------------------------------------------------------------------------
+
+def measure(module, args):
+    """Measure elaboration of a target module (in the current interpreter) and write metrics."""
+    from litex_boards.tools import elaborate
+    from litex_boards.tools.hooks import patch
+
+    results = {}
+    def timer(name):
+        def wrapper(method):
+            def _method(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    results[name] = results.get(name, 0.0) + time.perf_counter() - start
+            return _method
+        return wrapper
+
+    # Import.
+    start = time.perf_counter()
+    target = importlib.import_module(module)
+    results["import"] = time.perf_counter() - start
+
+    # BaseSoC construction/Gateware generation.
+    from litex.soc.integration.builder import Builder
+    returncode = elaborate.run_target(module, args, hooks=[
+        patch(target.BaseSoC, "__init__", timer("construct")),
+        patch(Builder,        "build",    timer("gateware")),
+    ])
+    results["memory"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024
+
+    with open(metrics_filename, "w") as f:
+        json.dump(results, f, indent=4)
+    return returncode
+
+def run_job(job):
+    result = matrix.run_job(job)
+    filename = os.path.join(job.output_dir, metrics_filename)
+    if result["passed"] and os.path.exists(filename):
+        with open(filename) as f:
+            result["metrics"] = json.load(f)
+    return result
+
+# Startup ------------------------------------------------------------------------------------------
+
+def measure_startup(target, runs=3):
+    """Return best --help time (in s) of a target and the gated cores imported with the target."""
+    module = f"litex_boards.targets.{target}"
+    env    = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(matrix.litex_boards_dir), env.get("PYTHONPATH")]))
+    durations = []
+    for run in range(runs):
+        start = time.perf_counter()
+        returncode = subprocess.call([sys.executable, "-m", module, "--help"],
+            env    = env,
+            stdout = subprocess.DEVNULL,
+            stderr = subprocess.DEVNULL,
+        )
+        if returncode != 0:
+            return None, []
+        durations.append(time.perf_counter() - start)
+    code   = f"import sys, json, {module}; print(json.dumps([m for m in {gated_modules!r} if m in sys.modules]))"
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, stderr=subprocess.DEVNULL)
+    return min(durations), json.loads(output.decode().splitlines()[-1])
+
+def check_startup(targets, budget, njobs=1):
+    """Check startup of targets; return number of failures."""
+    from concurrent.futures import ThreadPoolExecutor
+    failures = 0
+    with ThreadPoolExecutor(max_workers=njobs) as executor:
+        for target, (duration, gated) in zip(targets, executor.map(measure_startup, targets)):
+            errors = []
+            if duration is None:
+                errors.append("--help failed")
+            elif duration > budget:
+                errors.append(f"over budget ({budget:.2f}s)")
+            if gated:
+                errors.append("imports " + ", ".join(gated))
+            failures += bool(errors)
+            print("{:48s} {:>6s} {}".format(target,
+                "-" if duration is None else f"{duration:.2f}s",
+                "FAIL: " + ", ".join(errors) if errors else "OK"),
+                flush = True,
+            )
+    return failures
+
+# Requests -----------------------------------------------------------------------------------------
+
+# Largest platforms (number of IOs).
+requests_platforms = [
+    "xilinx_vc707",
+    "xilinx_kc705",
+    "xilinx_kcu105",
+    "sitlinv_stlv7325_v2",
+    "adi_adrv2crr_fmc",
+]
+
+def measure_requests(platform, runs=10):
+    """Return best times (in s) of the linear and indexed constraint managers to request all IOs of
+    platform, to look them up (lookup_request) and to resolve all connector pins, and the number of
+    IOs/connector pins."""
+    from litex.build.generic_platform import ConstraintManager
+    from litex_boards.iotable import IndexedConstraintManager
+    module     = importlib.import_module(f"litex_boards.platforms.{platform}")
+    io         = list(module.Platform().constraint_manager.available)
+    connectors = getattr(module, "_connectors", [])
+    names      = [(resource[0], resource[1]) for resource in io]
+    pins       = [f"{connector}:{pin}"
+        for connector, table in ConstraintManager([], connectors).connector_manager.connector_table.items()
+        for pin, value in (table.items() if isinstance(table, dict) else enumerate(table)) if value is not None]
+    managers   = {
+        "linear"  : lambda: ConstraintManager(io, connectors),
+        "indexed" : lambda: IndexedConstraintManager(io, connectors, key=("bench", platform)),
+    }
+    best = {(kind, step): float("inf") for kind in managers for step in ["request", "lookup", "resolve"]}
+    # Interleave runs of both managers (request time includes Signal/Record creation).
+    for _ in range(runs):
+        for kind, constraint_manager in managers.items():
+            start = time.perf_counter()
+            cm    = constraint_manager()
+            for name, number in names:
+                cm.request(name, number)
+            best[kind, "request"] = min(best[kind, "request"], time.perf_counter() - start)
+            start = time.perf_counter()
+            for name, number in names:
+                cm.lookup_request(name, number)
+            best[kind, "lookup"] = min(best[kind, "lookup"], time.perf_counter() - start)
+            start = time.perf_counter()
+            cm.connector_manager.resolve_identifiers(pins)
+            best[kind, "resolve"] = min(best[kind, "resolve"], time.perf_counter() - start)
+    return best, len(io), len(pins)
+
+def check_requests(platforms):
+    for platform in platforms:
+        best, n, npins = measure_requests(platform)
+        print("{:24s} {:3d} IOs, per IO (linear/indexed): request {:6.1f}/{:6.1f}us lookup {:4.2f}/{:4.2f}us, {:3d} connector pins: resolve {:4.2f}/{:4.2f}us".format(
+            platform, n,
+            best["linear", "request"]/n*1e6, best["indexed", "request"]/n*1e6,
+            best["linear", "lookup"]/n*1e6,  best["indexed", "lookup"]/n*1e6,
+            npins,
+            best["linear", "resolve"]/max(npins, 1)*1e6, best["indexed", "resolve"]/max(npins, 1)*1e6),
+            flush = True,
+        )
+
+# Compare ------------------------------------------------------------------------------------------
+
+def compare(results, baseline, threshold):
+    """Return regressions (name, metric, baseline value, value, %) above threshold (in %)."""
+    regressions = []
+    for name, values in results.items():
+        for metric, value in values.items():
+            base = baseline.get(name, {}).get(metric, None)
+            if (base is None) or (metric not in metrics):
+                continue
+            if (value - base) <= metrics[metric]:
+                continue
+            increase = 100*(value - base)/base if base else float("inf")
+            if increase > threshold:
+                regressions.append((name, metric, base, value, increase))
+    return regressions
+
+def load_baseline(filename):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)["results"]
+
+def write_baseline(results, filename):
+    from litex_boards.tools.cache import get_ecosystem_versions
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with open(filename, "w") as f:
+        json.dump({"versions": get_ecosystem_versions(), "results": results}, f, indent=1, sort_keys=True)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    # Internal: measurement in a separate interpreter.
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        sys.exit(measure(sys.argv[2], sys.argv[3:]))
+
+    parser = argparse.ArgumentParser(description="LiteX-Boards elaboration benchmark.")
+    parser.add_argument("targets",           nargs="*",                     help="Targets to benchmark (default: all).")
+    parser.add_argument("-j", "--jobs",      type=int,   default=1,         help="Number of parallel benchmarks.")
+    parser.add_argument("--output-dir",      default="build/bench",         help="Base output directory.")
+    parser.add_argument("--baseline",        default="bench_baseline.json", help="Baseline file.")
+    parser.add_argument("--threshold",       type=float, default=25.0,      help="Regression threshold (in %%).")
+    parser.add_argument("--no-features",     action="store_true",           help="Only benchmark default configurations.")
+    parser.add_argument("--update-baseline", action="store_true",           help="Store results as new baseline.")
+    parser.add_argument("--startup",         action="store_true",           help="Only check targets startup (--help) time and lazy imports.")
+    parser.add_argument("--startup-budget",  type=float, default=1.0,       help="Startup time budget (in s).")
+    parser.add_argument("--requests",        action="store_true",           help="Only benchmark platform.request()/lookup_request() (platforms, default: largest).")
+    args = parser.parse_args()
+
+    # Requests benchmark.
+    if args.requests:
+        check_requests(args.targets or requests_platforms)
+        sys.exit(0)
+
+    # Startup check.
+    targets = args.targets or matrix.collect_targets()
+    if args.startup:
+        failures = check_startup(targets, args.startup_budget, njobs=args.jobs)
+        print(f"{len(targets) - failures}/{len(targets)} targets within startup budget/with lazy imports.")
+        sys.exit(0 if failures == 0 else 1)
+
+    # Run benchmarks.
+    jobs    = collect_jobs(args.output_dir, targets, with_features=not args.no_features)
+    results = matrix.run_jobs(jobs, njobs=args.jobs, runner=run_job, callback=matrix.print_result)
+    results = {r["name"]: r["metrics"] for r in results if "metrics" in r}
+    for name, values in results.items():
+        print("{:48s} import: {:6.2f}s construct: {:6.2f}s gateware: {:6.2f}s memory: {:7.1f}MB".format(name,
+            values.get("import",    0.0),
+            values.get("construct", 0.0),
+            values.get("gateware",  0.0),
+            values.get("memory",    0.0),
+        ))
+
+    # Update baseline (keeping results of benchmarks not run).
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        write_baseline(baseline, args.baseline)
+        print(f"Baseline updated: {args.baseline}.")
+        sys.exit(0 if len(results) == len(jobs) else 1)
+
+    # Compare to baseline.
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    for name, metric, base, value, increase in regressions:
+        print(f"- {name}: {metric} regressed by {increase:.0f}% ({base:.2f} -> {value:.2f}).")
+    failures = [job.name for job in jobs if job.name not in results]
+    for name in failures:
+        print(f"- {name}: benchmark failed, see {os.path.join(args.output_dir, name, 'build.log')}")
+    print(f"{len(results)}/{len(jobs)} benchmarks, {len(regressions)} regressions (threshold: {args.threshold}%).")
+    sys.exit(0 if not (regressions or failures) else 1)
+
+if __name__ == "__main__":
+    main()
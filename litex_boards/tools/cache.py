@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Gateware Cache: content-addressed cache of the gateware/ and software/ trees generated by a target
+# build. The key covers the target and platform(s) sources, the build arguments, the versions of
+# the installed LiteX ecosystem and, when the build compiles, the gateware toolchains/software
+# compilers found in PATH (resolved executable, size and mtime: changed by upgrades) and their
+# environment (PATH, LITEX_ENV_*); on a hit, the trees are restored instead of re-elaborating the
+# SoC (and re-running the toolchains).
+# The cache is bounded in size with LRU eviction, so it can be shared between CI runs.
+#
+# python3 -m litex_boards.tools.cache digilent_arty --build --no-compile   (cached build)
+# python3 -m litex_boards.tools.cache --stats                              (hit/miss statistics)
+# python3 -m litex_boards.tools.matrix --targets --cache=~/.cache/gw      (cached build matrix)
+
+import os
+import re
+import sys
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import argparse
+import subprocess
+import contextlib
+import importlib.util
+
+# Parameters ---------------------------------------------------------------------------------------
+
+default_cache_dir = os.environ.get("LITEX_BOARDS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "gateware"))
+
+ecosystem_packages = [
+    "migen",
+    "litex",
+    "litedram",
+    "liteeth",
+    "litepcie",
+    "litesata",
+    "litesdcard",
+    "litespi",
+    "litescope",
+    "liteiclink",
+    "litejesd204b",
+    "litehyperbus",
+    "litei2c",
+    "pythondata-cpu-vexriscv",
+    "pythondata-software-picolibc",
+    "pythondata-software-compiler_rt",
+]
+
+# Gateware toolchains and software compilers run by the builds (when compiling).
+gateware_tools = [
+    "vivado", "xst", "yosys", "nextpnr-ecp5", "nextpnr-ice40", "nextpnr-nexus", "nextpnr-gowin",
+    "nextpnr-himbaechel", "nextpnr-xilinx", "ecppack", "icepack", "quartus_sh", "diamondc",
+    "radiantc", "gw_sh", "efx_run.py", "td", "libero", "symbiflow_synth", "openxc7",
+]
+software_tools = [
+    "riscv64-unknown-elf-gcc", "riscv64-elf-gcc", "riscv-none-elf-gcc", "riscv32-unknown-elf-gcc",
+    "riscv64-linux-gnu-gcc", "riscv64-zephyr-elf-gcc", "lm32-elf-gcc", "or1k-elf-gcc",
+    "or1k-linux-gcc", "arm-none-eabi-gcc", "aarch64-linux-gnu-gcc", "clang", "meson", "ninja",
+]
+
+cached_dirs = ["gateware", "software"]
+
+litex_boards_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_size(size):
+    units = {"K": 1e3, "M": 1e6, "G": 1e9, "T": 1e12}
+    size  = str(size).upper().rstrip("B")
+    if size[-1:] in units:
+        return int(float(size[:-1])*units[size[-1]])
+    return int(size)
+
+# Key ----------------------------------------------------------------------------------------------
+
+def get_git_revision(path):
+    # Git revision of a development (editable) install, read directly from .git.
+    for i in range(3):
+        git_dir = os.path.join(path, ".git")
+        if os.path.isdir(git_dir):
+            with open(os.path.join(git_dir, "HEAD")) as f:
+                head = f.read().strip()
+            if head.startswith("ref: "):
+                ref_filename = os.path.join(git_dir, head[5:])
+                if not os.path.exists(ref_filename):
+                    return head
+                with open(ref_filename) as f:
+                    head = f.read().strip()
+            return head
+        path = os.path.dirname(path)
+    return None
+
+def get_ecosystem_versions(packages=ecosystem_packages):
+    from importlib import metadata
+    versions = {}
+    for package in packages:
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            continue
+        # Development installs keep the same version across commits, also use the git revision.
+        try:
+            spec = importlib.util.find_spec(package.replace("-", "_"))
+        except (ImportError, ValueError):
+            spec = None
+        if spec is not None and spec.origin is not None:
+            revision = get_git_revision(os.path.dirname(spec.origin))
+            if revision is not None:
+                version += f"+{revision}"
+        versions[package] = version
+    return versions
+
+def get_sources(module, args=[]):
+    """Source files of a target: its module and the litex_boards platforms it (transitively) uses."""
+    sources = []
+    def add(kind, name):
+        filename = os.path.join(litex_boards_dir, kind, name + ".py")
+        if filename in sources or not os.path.exists(filename):
+            return
+        sources.append(filename)
+        with open(filename) as f:
+            content = f.read()
+        for names in re.findall(r"from litex_boards\.platforms import ([\w, ]+)", content):
+            for name in names.split(","):
+                add("platforms", name.strip())
+        for name in re.findall(r"litex_boards\.platforms\.(\w+)", content):
+            add("platforms", name)
+    add("targets", module.split(".")[-1])
+    for arg in args:
+        for name in re.findall(r"litex_boards\.platforms\.(\w+)", arg):
+            add("platforms", name)
+    return sources
+
+def strip_output_dir(args):
+    # Output directory does not change the generated contents (paths are relocated on restore).
+    r    = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == "--output-dir":
+            skip = True
+        elif not arg.startswith("--output-dir="):
+            r.append(arg)
+    return r
+
+def get_output_dir(module, args):
+    for i, arg in enumerate(args):
+        if arg == "--output-dir":
+            return args[i + 1]
+        if arg.startswith("--output-dir="):
+            return arg.split("=", 1)[1]
+    # Builder's default: build/<platform name> (platform name is the platform module name).
+    platforms = [os.path.basename(s)[:-3] for s in get_sources(module, args)[1:]]
+    return os.path.join("build", platforms[0] if platforms else module.split(".")[-1])
+
+def get_tool_version(tool, path=None):
+    """Identity of a tool found in PATH (resolved executable, size, mtime), None if not found."""
+    filename = shutil.which(tool, path=path)
+    if filename is None:
+        return None
+    filename = os.path.realpath(filename)
+    st       = os.stat(filename)
+    return f"{filename}:{st.st_size}:{int(st.st_mtime)}"
+
+def get_toolchain_versions(args, environ=None):
+    """Tools and environment of the compile steps of a build (none with --no-compile)."""
+    environ = os.environ if environ is None else environ
+    tools   = []
+    if "--no-compile" not in args:
+        if "--no-compile-gateware" not in args:
+            tools += gateware_tools
+        if "--no-compile-software" not in args:
+            tools += software_tools
+    if not tools:
+        return {}
+    versions = {tool: get_tool_version(tool, environ.get("PATH", None)) for tool in tools}
+    return {
+        "tools"   : {tool: version for tool, version in versions.items() if version is not None},
+        "environ" : {k: v for k, v in environ.items() if k == "PATH" or k.startswith("LITEX_ENV_")},
+    }
+
+def get_key(module, args, versions=None, toolchains=None):
+    h = hashlib.sha256()
+    for filename in get_sources(module, args):
+        h.update(os.path.basename(filename).encode())
+        with open(filename, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    h.update(json.dumps({
+        "module"     : module.split(".")[-1],
+        "args"       : strip_output_dir(args),
+        "versions"   : get_ecosystem_versions() if versions is None else versions,
+        "toolchains" : get_toolchain_versions(args) if toolchains is None else toolchains,
+    }, sort_keys=True).encode())
+    return h.hexdigest()
+
+# Cache --------------------------------------------------------------------------------------------
+
+class GatewareCache:
+    def __init__(self, cache_dir=default_cache_dir, max_size=None):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_size  = None if max_size is None else parse_size(max_size)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def lock(self):
+        # Cache can be shared between concurrent builds/processes.
+        with open(os.path.join(self.cache_dir, "lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def entries(self):
+        for prefix in os.listdir(self.cache_dir):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if len(prefix) == 2 and os.path.isdir(prefix_dir):
+                for key in os.listdir(prefix_dir):
+                    if ".tmp" in key:
+                        continue # Entry being stored.
+                    meta_filename = os.path.join(prefix_dir, key, "meta.json")
+                    if os.path.exists(meta_filename):
+                        with open(meta_filename) as f:
+                            meta = json.load(f)
+                        yield key, meta, os.path.getmtime(meta_filename)
+
+    # Stats.
+    def update_stats(self, **kwargs):
+        stats_filename = os.path.join(self.cache_dir, "stats.json")
+        with self.lock():
+            stats = self.stats()
+            for k, v in kwargs.items():
+                stats[k] = stats.get(k, 0) + v
+            with open(stats_filename, "w") as f:
+                json.dump(stats, f, indent=4)
+
+    def stats(self):
+        stats_filename = os.path.join(self.cache_dir, "stats.json")
+        stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        if os.path.exists(stats_filename):
+            with open(stats_filename) as f:
+                stats.update(json.load(f))
+        return stats
+
+    def size(self):
+        return sum(meta["size"] for key, meta, mtime in self.entries())
+
+    # Restore/Store.
+    def restore(self, key, output_dir):
+        entry_dir  = self.entry_dir(key)
+        output_dir = os.path.abspath(output_dir)
+        with self.lock():
+            meta_filename = os.path.join(entry_dir, "meta.json")
+            if not os.path.exists(meta_filename):
+                return False
+            with open(meta_filename) as f:
+                meta = json.load(f)
+            for d in cached_dirs:
+                shutil.rmtree(os.path.join(output_dir, d), ignore_errors=True)
+                if os.path.exists(os.path.join(entry_dir, d)):
+                    shutil.copytree(os.path.join(entry_dir, d), os.path.join(output_dir, d), symlinks=True)
+            os.utime(meta_filename) # Mark as recently used.
+        # Relocate absolute paths (ex: variables.mak) to the new output directory.
+        if meta["output_dir"] != output_dir:
+            for d in cached_dirs:
+                for root, dirs, files in os.walk(os.path.join(output_dir, d)):
+                    for file in files:
+                        relocate(os.path.join(root, file), meta["output_dir"], output_dir)
+        return True
+
+    def store(self, key, output_dir, **meta):
+        output_dir = os.path.abspath(output_dir)
+        entry_dir  = self.entry_dir(key)
+        tmp_dir    = entry_dir + f".tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        size = 0
+        for d in cached_dirs:
+            if os.path.exists(os.path.join(output_dir, d)):
+                shutil.copytree(os.path.join(output_dir, d), os.path.join(tmp_dir, d), symlinks=True)
+        for root, dirs, files in os.walk(tmp_dir):
+            size += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        os.makedirs(tmp_dir, exist_ok=True)
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(dict(meta, output_dir=output_dir, size=size, time=time.time()), f, indent=4)
+        with self.lock():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(tmp_dir, entry_dir)
+        self.update_stats(stores=1)
+        if self.max_size is not None:
+            self.evict(self.max_size)
+
+    def evict(self, max_size):
+        """Remove least recently used entries until the cache fits in max_size bytes."""
+        evictions = 0
+        with self.lock():
+            entries = sorted(self.entries(), key=lambda e: e[2])
+            size    = sum(meta["size"] for key, meta, mtime in entries)
+            for key, meta, mtime in entries:
+                if size <= max_size:
+                    break
+                shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+                size      -= meta["size"]
+                evictions += 1
+        if evictions:
+            self.update_stats(evictions=evictions)
+        return evictions
+
+    def clear(self):
+        with self.lock():
+            for key, meta, mtime in list(self.entries()):
+                shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            stats_filename = os.path.join(self.cache_dir, "stats.json")
+            if os.path.exists(stats_filename):
+                os.remove(stats_filename)
+
+def relocate(filename, old, new):
+    try:
+        with open(filename) as f:
+            content = f.read()
+    except UnicodeDecodeError:
+        return # Binary file.
+    if old in content:
+        with open(filename, "w") as f:
+            f.write(content.replace(old, new))
+
+# Cached Run ---------------------------------------------------------------------------------------
+
+def run_job(job, cache, runner):
+    """Run a matrix Job through the cache: restore on hit, run with runner and store on miss."""
+    start = time.time()
+    key   = get_key(job.module, job.args)
+    job.prepare()
+    if cache.restore(key, job.output_dir):
+        cache.update_stats(hits=1)
+        with open(job.log_filename, "w") as log:
+            log.write(f"Restored from gateware cache ({key}).\n")
+        return job.result(0, time.time() - start, cache="hit")
+    cache.update_stats(misses=1)
+    result = runner(job)
+    if result["passed"]:
+        cache.store(key, job.output_dir, module=job.module, args=job.args)
+    result["cache"] = "miss"
+    return result
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards gateware cache.")
+    parser.add_argument("--cache-dir", default=default_cache_dir, help="Cache directory.")
+    parser.add_argument("--max-size",  default=None,              help="Cache size quota (ex: 10G), LRU eviction.")
+    parser.add_argument("--stats",     action="store_true",       help="Show cache statistics.")
+    parser.add_argument("--clear",     action="store_true",       help="Clear the cache.")
+    parser.add_argument("target",      nargs="?",                 help="Target to build (ex: digilent_arty).")
+    parser.add_argument("args",        nargs=argparse.REMAINDER,  help="Target arguments.")
+    args = parser.parse_args()
+
+    cache = GatewareCache(args.cache_dir, args.max_size)
+    if args.clear:
+        cache.clear()
+    if args.target is not None:
+        module = args.target if "." in args.target else f"litex_boards.targets.{args.target}"
+        if "--build" not in args.args:
+            os.execv(sys.executable, [sys.executable, "-m", module] + args.args) # Nothing to cache.
+        key        = get_key(module, args.args)
+        output_dir = get_output_dir(module, args.args)
+        if cache.restore(key, output_dir):
+            cache.update_stats(hits=1)
+            print(f"Cache hit ({key[:16]}): restored {', '.join(cached_dirs)} to {output_dir}.")
+        else:
+            cache.update_stats(misses=1)
+            print(f"Cache miss ({key[:16]}): building.")
+            returncode = subprocess.call([sys.executable, "-m", module] + args.args)
+            if returncode != 0:
+                sys.exit(returncode)
+            cache.store(key, output_dir, module=module, args=args.args)
+    if args.max_size is not None:
+        cache.evict(cache.max_size)
+    if args.stats:
+        stats = cache.stats()
+        total = stats["hits"] + stats["misses"]
+        print("Hits: {} / Misses: {} ({:.1f}% hit rate), Stores: {}, Evictions: {}, Size: {:.1f}MB".format(
+            stats["hits"], stats["misses"], 100*stats["hits"]/max(total, 1),
+            stats["stores"], stats["evictions"], cache.size()/1e6))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Clock Plans: cache of the PLL/MMCM configurations solved by the LiteX clocking cores (S7PLL, S7MMCM,
+# USMMCM, ECP5PLL, GW2APLL, iCE40PLL...) at elaboration, per board. Plans are keyed on the clocking
+# core, its parameters (speedgrade dependent VCO/divider ranges), the input clock and the requested
+# outputs; on a hit the divider/multiplier search is skipped. (Efinix PLLs are solved in the Efinity
+# interface writer and are not cached).
+#
+# Plans are looked up in and recorded to the user cache (LITEX_BOARDS_CLOCK_PLANS_DIR), precomputed
+# by this tool or solved at build time.
+#
+# python3 -m litex_boards.tools.run --clock-plans digilent_arty --build    (build using clock plans)
+# python3 -m litex_boards.tools.clockplan -j8                              (precompute all boards)
+# python3 -m litex_boards.tools.clockplan digilent_arty --freqs=50e6,100e6 (selected board/freqs)
+
+import os
+import re
+import json
+import fcntl
+import hashlib
+import inspect
+import argparse
+import functools
+import contextlib
+
+from litex_boards.tools import matrix
+
+# Parameters ---------------------------------------------------------------------------------------
+
+default_plans_dir = os.environ.get("LITEX_BOARDS_CLOCK_PLANS_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "clock_plans"))
+
+# Common sys_clk_freqs precomputed for all boards (in addition to the default of the target).
+common_sys_clk_freqs = [25e6, 48e6, 50e6, 60e6, 75e6, 100e6, 125e6, 150e6]
+
+# Clocking core attributes that are build state, not parameters of the search.
+ignored_attributes = ["config", "params", "clkouts", "logger"]
+
+# Key ----------------------------------------------------------------------------------------------
+
+def _is_parameter(value):
+    if isinstance(value, (list, tuple)):
+        return all(_is_parameter(v) for v in value)
+    return isinstance(value, (int, float, str, bool, type(None)))
+
+def get_parameters(pll):
+    """Search parameters of a clocking core: class and instance scalar attributes (ranges, margins...)."""
+    parameters = {}
+    for cls in reversed(type(pll).__mro__):
+        if cls.__module__.startswith("litex.soc.cores.clock"):
+            parameters.update({k: v for k, v in vars(cls).items() if not k.startswith("_") and _is_parameter(v)})
+    parameters.update({k: v for k, v in vars(pll).items() if not k.startswith("_") and _is_parameter(v)})
+    for name in ignored_attributes:
+        parameters.pop(name, None)
+    return parameters
+
+def get_clkouts(pll):
+    # Requested outputs without their Signals: (freq, phase, margin, ...).
+    return {n: [v for v in clkout if _is_parameter(v)] for n, clkout in sorted(pll.clkouts.items())}
+
+def get_key(pll):
+    description = json.dumps({
+        "class"      : type(pll).__name__,
+        "parameters" : get_parameters(pll),
+        "clkouts"    : get_clkouts(pll),
+    }, sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()[:32]
+
+# Plans --------------------------------------------------------------------------------------------
+
+def plans_filename(plans_dir, board):
+    return os.path.join(plans_dir, f"{board}.json")
+
+def load_plans(plans_dir, board):
+    filename = plans_filename(plans_dir, board)
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)["plans"]
+
+def update_plans(plans_dir, board, plans):
+    """Merge plans into the plans file of a board (safe with concurrent builds)."""
+    os.makedirs(plans_dir, exist_ok=True)
+    filename = plans_filename(plans_dir, board)
+    with open(filename + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        merged = load_plans(plans_dir, board)
+        merged.update(plans)
+        with open(filename + ".tmp", "w") as f:
+            json.dump({"board": board, "plans": merged}, f, indent=1, sort_keys=True)
+        os.replace(filename + ".tmp", filename)
+
+# Hook ---------------------------------------------------------------------------------------------
+
+def clocking_classes():
+    """LiteX clocking cores classes implementing compute_config."""
+    from litex.soc.cores import clock
+    classes = set()
+    for obj in vars(clock).values():
+        if inspect.isclass(obj):
+            for cls in obj.__mro__:
+                if "compute_config" in vars(cls):
+                    classes.add(cls)
+    return sorted(classes, key=lambda cls: cls.__name__)
+
+@contextlib.contextmanager
+def clock_plan_hook(board, plans_dir=default_plans_dir, record=True):
+    """Reuse solved clock plans of board; record the newly solved ones in plans_dir."""
+    from migen import Signal
+    from litex_boards.tools.hooks import patch
+
+    plans = load_plans(plans_dir, board)
+    solved = {}
+
+    def wrapper(compute_config):
+        def _compute_config(self):
+            key  = get_key(self)
+            plan = plans.get(key, None)
+            if plan is None:
+                nclkouts = len(self.clkouts)
+                config   = compute_config(self)
+                # Only cache configurations returned as parameters (Efinix PLLs are configured
+                # through the interface writer).
+                if not (isinstance(config, dict) and _is_parameter(list(config.values()))):
+                    return config
+                plan = {
+                    "class"      : type(self).__name__,
+                    "clkin_freq" : self.clkin_freq,
+                    "clkouts"    : get_clkouts(self),
+                    "config"     : config,
+                    # Outputs added by the search (ex: ECP5PLL feedback output).
+                    "added"      : {n: get_clkouts(self)[n] for n in self.clkouts if n >= nclkouts},
+                }
+                plans[key] = solved[key] = plan
+                return config
+            # Replay outputs added by the search.
+            for n, clkout in plan["added"].items():
+                self.clkouts[int(n)] = (Signal(), *clkout)
+            return dict(plan["config"])
+        return _compute_config
+
+    with contextlib.ExitStack() as stack:
+        for cls in clocking_classes():
+            stack.enter_context(patch(cls, "compute_config", wrapper))
+        try:
+            yield plans
+        finally:
+            if record and solved:
+                update_plans(plans_dir, board, solved)
+
+# Generate -----------------------------------------------------------------------------------------
+
+def get_default_sys_clk_freq(target):
+    with open(os.path.join(matrix.litex_boards_dir, "targets", f"{target}.py")) as f:
+        source = f.read()
+    m = re.search(r"\"--sys-clk-freq\",\s*default=\s*(?:int\()?([0-9_.e]+)", source)
+    return float(m.group(1)) if m else None
+
+def generate_job(target, freq, output_dir):
+    name       = f"{target}@{freq/1e6:g}MHz"
+    output_dir = os.path.join(output_dir, name)
+    return matrix.Job("clockplan", name,
+        module     = f"litex_boards.targets.{target}",
+        output_dir = output_dir,
+        args       = [
+            f"--sys-clk-freq={freq:g}",
+            "--build",
+            "--no-compile",
+            f"--output-dir={os.path.abspath(output_dir)}",
+        ]
+    )
+
+def run_job(job, plans_dir):
+    from litex_boards.tools import elaborate
+    board = job.module.split(".")[-1]
+    return elaborate.run_job(job, hooks=[clock_plan_hook(board, plans_dir)])
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards clock plans generator.")
+    parser.add_argument("targets",      nargs="*",                  help="Targets (default: all).")
+    parser.add_argument("--freqs",      default=None,               help="Comma separated sys_clk_freqs (default: target default + common).")
+    parser.add_argument("--plans-dir",  default=default_plans_dir,  help="Output clock plans directory.")
+    parser.add_argument("--output-dir", default="build/clockplan",  help="Base build directory.")
+    parser.add_argument("-j", "--jobs", type=int,                   help="Number of parallel elaborations (default: CPU count).")
+    args = parser.parse_args()
+
+    # Collect targets/freqs. Infeasible freqs simply fail to elaborate.
+    jobs = []
+    for target in (args.targets or matrix.collect_targets()):
+        default = get_default_sys_clk_freq(target)
+        if default is None:
+            continue
+        if args.freqs is not None:
+            freqs = [float(f) for f in args.freqs.split(",")]
+        else:
+            freqs = sorted(set([default] + common_sys_clk_freqs))
+        jobs += [generate_job(target, freq, args.output_dir) for freq in freqs]
+
+    # Elaborate with clock plans recording.
+    from litex_boards.tools import elaborate
+    runner  = functools.partial(run_job, plans_dir=os.path.abspath(args.plans_dir))
+    results = elaborate.run_jobs(jobs, njobs=args.jobs, runner=runner, callback=matrix.print_result)
+    passed  = len([r for r in results if r["passed"]])
+    print(f"{passed}/{len(results)} configurations elaborated, clock plans in {args.plans_dir}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# In-Process Elaboration: run target builds in worker processes forked from a parent that already
+# imported Migen/LiteX and the cores, instead of starting (and importing into) one interpreter per
+# build. Workers are recycled after max_tasks_per_worker builds so that global Migen/LiteX state
+# (LiteXContext, naming, etc...) does not leak from one build to the next.
+
+import os
+import sys
+import time
+import importlib
+import traceback
+import contextlib
+import multiprocessing
+
+# Preload ------------------------------------------------------------------------------------------
+
+preload_modules = [
+    "migen",
+    "litex.gen",
+    "litex.build.generic_platform",
+    "litex.build.parser",
+    "litex.soc.cores.clock",
+    "litex.soc.integration.soc_core",
+    "litex.soc.integration.builder",
+    "litedram.modules",
+    "litedram.phy",
+    "liteeth.phy",
+    "litepcie.phy",
+    "litesata.phy",
+    "litesdcard.phy",
+    "litespi",
+    "litescope",
+]
+
+def preload(modules=preload_modules):
+    """Import the LiteX ecosystem once, so that forked workers inherit it."""
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass # Optional core not installed.
+
+# Run Target ---------------------------------------------------------------------------------------
+
+def run_target(module, args, hooks=[]):
+    """Run main() of a target module in the current interpreter with args as command line.
+
+    hooks are context managers entered around main(). Returns the exit code.
+    """
+    argv = sys.argv
+    sys.argv = [module] + list(args)
+    try:
+        with contextlib.ExitStack() as stack:
+            for hook in hooks:
+                stack.enter_context(hook)
+            importlib.import_module(module).main()
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    finally:
+        sys.argv = argv
+
+@contextlib.contextmanager
+def redirect_output(f):
+    """Redirect stdout/stderr (at file descriptor level, to also capture sub-processes) to f."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = [os.dup(1), os.dup(2)]
+    os.dup2(f.fileno(), 1)
+    os.dup2(f.fileno(), 2)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in saved:
+            os.close(fd)
+
+def run_job(job, hooks=[]):
+    """Run a matrix Job in the current interpreter, with its output directory as working directory."""
+    job.prepare()
+    cwd   = os.getcwd()
+    start = time.time()
+    with open(job.log_filename, "w") as log, redirect_output(log):
+        os.chdir(job.output_dir)
+        try:
+            returncode = run_target(job.module, job.args, hooks)
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            os.chdir(cwd)
+    return job.result(returncode, time.time() - start)
+
+# Run Jobs -----------------------------------------------------------------------------------------
+
+def run_jobs(jobs, njobs=None, max_tasks_per_worker=1, runner=run_job, callback=None):
+    """Run matrix Jobs in recycled worker processes and return results in Jobs order."""
+    preload()
+    results = {}
+    context = multiprocessing.get_context("fork")
+    with context.Pool(njobs or os.cpu_count(), maxtasksperchild=max_tasks_per_worker) as pool:
+        for result in pool.imap_unordered(runner, jobs):
+            results[f"{result['kind']}/{result['name']}"] = result
+            if callback is not None:
+                callback(result, done=len(results), total=len(jobs))
+    return [results[job.key] for job in jobs]
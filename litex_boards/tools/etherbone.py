@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Etherbone Stand-in: local Etherbone endpoint emulating the CSR/memory map of a target (from its
+# generated csr.csv/csr.json), with configurable latency and packet loss, to benchmark/tune host
+# tooling (batched reads/writes, pipelining depth) without the board:
+# - UDP: Etherbone packets as sent to the board (LiteEth Etherbone), any number of outstanding
+#   packets, responses delayed by --latency (round trip), request/responses dropped with --loss.
+# - TCP: litex_server compatible (RemoteClient, litescope...), accesses emulating the litex_server
+#   --udp link (one round trip per access, reads retried after a timeout on loss, lost writes).
+# LiteX's CommUDP binds the port it sends to, so it can't reach a stand-in on the same host: use
+# the TCP server (RemoteClient) or the benchmark client.
+#
+# Memory regions and CSR registers are 32-bit words (sparse), initialized to 0 (ctrl_scratch to its
+# reset value), writes to read-only CSRs are ignored, accesses outside the map are counted.
+#
+# python3 -m litex_boards.tools.etherbone serve build/digilent_arty/csr.csv --latency=200us --loss=0.01
+# python3 -m litex_boards.tools.etherbone bench build/digilent_arty/csr.csv --bursts=1,64,255 --depths=1,8
+# python3 -m litex_boards.tools.etherbone bench build/digilent_arty/csr.json --write --latency=1ms
+# python3 -m litex_boards.tools.etherbone bench build/digilent_arty/csr.csv --tcp   (litex_server path)
+
+import os
+import csv
+import sys
+import json
+import time
+import heapq
+import random
+import select
+import socket
+import struct
+import bisect
+import argparse
+import contextlib
+import collections
+
+from litex_boards.tools import matrix
+
+# Parameters ---------------------------------------------------------------------------------------
+
+default_port = 1234
+
+# CSR reset values (others are 0).
+reset_values = {
+    "ctrl_scratch" : 0x12345678,
+}
+
+# Etherbone ----------------------------------------------------------------------------------------
+
+# Packet header: magic, version/no reads/probe reply/probe flag, address size/port size, padding.
+# Record header: flags (wff: bit 6), byte enable, writes count, reads count.
+
+etherbone_magic   = 0x4e6f
+etherbone_version = 1
+packet_header     = struct.Struct(">HBB4x")
+record_header     = struct.Struct(">BBBB")
+record_wff        = 1 << 6
+max_burst         = 255
+
+Record = collections.namedtuple("Record", "flags base_addr writes base_ret_addr reads")
+
+def decode_packet(data):
+    """Decode an Etherbone packet, return (probe, probe_reply, addr_size, records)."""
+    magic, flags, sizes = packet_header.unpack_from(data)
+    if magic != etherbone_magic:
+        raise ValueError(f"Invalid Etherbone magic 0x{magic:04x}.")
+    addr_size = sizes >> 4
+    if addr_size not in [4, 8]:
+        raise ValueError(f"Unsupported Etherbone address size {addr_size}.")
+    fmt     = ">I" if addr_size == 4 else ">Q"
+    records = []
+    offset  = packet_header.size
+    while offset + record_header.size <= len(data):
+        rflags, _, wcount, rcount = record_header.unpack_from(data, offset)
+        offset += record_header.size
+        base_addr, writes, base_ret_addr, reads = 0, (), 0, ()
+        if wcount:
+            base_addr, = struct.unpack_from(fmt, data, offset)
+            writes     = struct.unpack_from(f">{wcount}I", data, offset + addr_size)
+            offset    += addr_size + 4*wcount
+        if rcount:
+            base_ret_addr, = struct.unpack_from(fmt, data, offset)
+            reads          = struct.unpack_from(f"{fmt[0]}{rcount}{fmt[1]}", data, offset + addr_size)
+            offset        += addr_size*(rcount + 1)
+        if wcount or rcount:
+            records.append(Record(rflags, base_addr, writes, base_ret_addr, reads))
+    return bool(flags & 0b001), bool(flags & 0b010), addr_size, records
+
+def encode_packet(records=[], addr_size=4, probe=False, probe_reply=False):
+    """Encode an Etherbone packet of records [(base_addr, writes, base_ret_addr, reads)]."""
+    fmt   = "I" if addr_size == 4 else "Q"
+    flags = (etherbone_version << 4) | (probe_reply << 1) | probe
+    data  = [packet_header.pack(etherbone_magic, flags, (addr_size << 4) | 4)]
+    for base_addr, writes, base_ret_addr, reads in records:
+        data.append(record_header.pack(0, 0x0f, len(writes), len(reads)))
+        if writes:
+            data.append(struct.pack(f">{fmt}{len(writes)}I", base_addr, *writes))
+        if reads:
+            data.append(struct.pack(f">{len(reads) + 1}{fmt}", base_ret_addr, *reads))
+    if probe or probe_reply:
+        data.append(bytes(4)) # Padding.
+    return b"".join(data)
+
+# Memory Map ---------------------------------------------------------------------------------------
+
+class MemoryMap:
+    """CSR registers and memory regions of a target, as sparse 32-bit words."""
+    def __init__(self, regions, registers, constants={}):
+        self.regions   = regions   # {name: (base, size, type)}.
+        self.registers = registers # {name: (addr, size, mode)}.
+        self.constants = constants
+        self.words     = {}
+        self.stats     = collections.Counter()
+        self.readonly  = {addr + 4*i for addr, size, mode in registers.values() if mode == "ro" for i in range(size)}
+        self.csr_words = {addr + 4*i for addr, size, mode in registers.values() for i in range(size)}
+        self.bounds    = sorted((base, base + size) for base, size, _ in regions.values())
+        self.starts    = [base for base, _ in self.bounds]
+        for name, value in reset_values.items():
+            if name in registers:
+                self.set(name, value)
+
+    def is_mapped(self, addr):
+        if addr in self.csr_words:
+            return True
+        i = bisect.bisect_right(self.starts, addr) - 1
+        return i >= 0 and addr < self.bounds[i][1]
+
+    def set(self, name, value):
+        """Set a CSR register (split in words of config_csr_data_width)."""
+        addr, size, _ = self.registers[name]
+        width = int(self.constants.get("config_csr_data_width", 32))
+        for i in range(size):
+            self.words[addr + 4*i] = (value >> ((size - 1 - i)*width)) & (2**width - 1)
+
+    def read(self, addr):
+        self.stats["reads"] += 1
+        if not self.is_mapped(addr):
+            self.stats["unmapped"] += 1
+        return self.words.get(addr & ~0b11, 0)
+
+    def write(self, addr, value):
+        self.stats["writes"] += 1
+        addr &= ~0b11
+        if addr in self.readonly:
+            self.stats["readonly"] += 1
+            return
+        if not self.is_mapped(addr):
+            self.stats["unmapped"] += 1
+        self.words[addr] = value & 0xffffffff
+
+    def get_region(self, name=None):
+        """(base, size) of region name or of the first RAM region (to benchmark memory accesses)."""
+        if name is not None:
+            return self.regions[name][:2]
+        for name in ["sram", "main_ram"] + sorted(self.regions):
+            if name in self.regions and name not in ["rom", "csr"]:
+                return self.regions[name][:2]
+        return self.regions.get("csr", (min(self.csr_words, default=0), 4))[:2]
+
+def _int(value):
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+def load_memory_map(filename):
+    """Load the MemoryMap of a target from its csr.csv or csr.json."""
+    regions, registers, constants = {}, {}, {}
+    if filename.endswith(".json"):
+        with open(filename) as f:
+            d = json.load(f)
+        for name, r in d.get("memories", {}).items():
+            regions[name] = (_int(r["base"]), _int(r["size"]), r.get("type", ""))
+        for name, r in d.get("csr_registers", {}).items():
+            registers[name] = (_int(r["addr"]), _int(r["size"]), r["type"])
+        constants = d.get("constants", {})
+    else:
+        with open(filename) as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith("#"):
+                    continue
+                if row[0] == "memory_region":
+                    regions[row[1]] = (_int(row[2]), _int(row[3]), row[4])
+                elif row[0] == "csr_register":
+                    registers[row[1]] = (_int(row[2]), _int(row[3]), row[4])
+                elif row[0] == "constant":
+                    constants[row[1]] = row[2]
+    return MemoryMap(regions, registers, constants)
+
+# UDP Server ---------------------------------------------------------------------------------------
+
+class EtherboneServer:
+    """Etherbone UDP endpoint of a MemoryMap, with latency (round trip, s) and packet loss."""
+    def __init__(self, memory, ip="127.0.0.1", port=default_port, latency=0.0, loss=0.0, seed=None):
+        self.memory  = memory
+        self.latency = latency
+        self.loss    = loss
+        self.random  = random.Random(seed)
+        self.pending = [] # (due, n, reply, address).
+        self.stats   = collections.Counter()
+        self.socket  = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((ip, port))
+        self.socket.setblocking(False)
+
+    def lost(self):
+        return self.loss > 0 and self.random.random() < self.loss
+
+    def handle(self, data):
+        """Execute an Etherbone packet, return the reply (None if none)."""
+        try:
+            probe, _, addr_size, records = decode_packet(data)
+        except (struct.error, ValueError):
+            self.stats["malformed"] += 1
+            return None
+        if probe:
+            return encode_packet(addr_size=addr_size, probe_reply=True)
+        replies = []
+        for record in records:
+            for i, value in enumerate(record.writes):
+                self.memory.write(record.base_addr + (0 if record.flags & record_wff else 4*i), value)
+            if record.reads:
+                replies.append((record.base_ret_addr, [self.memory.read(addr) for addr in record.reads], 0, []))
+        return encode_packet(replies, addr_size) if replies else None
+
+    def poll(self):
+        """Receive and execute the available packets, return the delay until the next reply (None: none)."""
+        while True:
+            try:
+                data, address = self.socket.recvfrom(65536)
+            except BlockingIOError:
+                break
+            self.stats["packets"] += 1
+            if self.lost():
+                self.stats["lost"] += 1
+                continue
+            reply = self.handle(data)
+            if reply is None:
+                continue
+            if self.lost():
+                self.stats["lost"] += 1
+                continue
+            heapq.heappush(self.pending, (time.perf_counter() + self.latency, self.stats["replies"], reply, address))
+            self.stats["replies"] += 1
+        now = time.perf_counter()
+        while self.pending and self.pending[0][0] <= now:
+            _, _, reply, address = heapq.heappop(self.pending)
+            self.socket.sendto(reply, address)
+        return None if not self.pending else self.pending[0][0] - now
+
+    def serve_forever(self):
+        timeout = None
+        while True:
+            select.select([self.socket], [], [], timeout)
+            timeout = self.poll()
+
+# TCP Server (litex_server) ------------------------------------------------------------------------
+
+class CommEmulator:
+    """Comm of a litex_server (RemoteServer) emulating its --udp link (CommUDP) to a MemoryMap."""
+    def __init__(self, memory, latency=0.0, loss=0.0, timeout=1.0, retries=10, seed=None):
+        self.memory  = memory
+        self.latency = latency
+        self.loss    = loss
+        self.timeout = timeout
+        self.retries = retries
+        self.random  = random.Random(seed)
+
+    def open(self, probe=True):
+        pass
+
+    def close(self):
+        pass
+
+    def lost(self):
+        return self.loss > 0 and self.random.random() < self.loss
+
+    def read(self, addr, length=None, burst="incr"):
+        n = 1 if length is None else length
+        for _ in range(self.retries):
+            if self.lost(): # Request lost.
+                time.sleep(self.timeout)
+                continue
+            datas = [self.memory.read(addr + (0 if burst == "fixed" else 4*i)) for i in range(n)]
+            if self.lost(): # Response lost.
+                time.sleep(self.timeout)
+                continue
+            time.sleep(self.latency)
+            return datas[0] if length is None else datas
+        raise socket.timeout
+
+    def write(self, addr, datas):
+        # Posted: no response, lost writes are not retried (as CommUDP).
+        datas = datas if isinstance(datas, list) else [datas]
+        if not self.lost():
+            for i, value in enumerate(datas):
+                self.memory.write(addr + 4*i, value)
+
+def start_tcp_server(memory, ip="127.0.0.1", port=default_port, latency=0.0, loss=0.0, timeout=1.0, seed=None):
+    """Start a litex_server compatible TCP server (threads) on memory, return it (None: no LiteX)."""
+    try:
+        from litex.tools.litex_server import RemoteServer
+    except ImportError:
+        return None
+    server = RemoteServer(CommEmulator(memory, latency, loss, timeout, seed=seed), ip, port)
+    server.open()
+    server.start(4)
+    return server
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def bench_udp(address, base, burst, depth, count, write=False, timeout=0.1):
+    """Pipelined reads (or writes with a read fence) of burst words at base, depth outstanding
+    packets, return the metrics."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(address)
+    sock.settimeout(timeout)
+    addrs   = [base + 4*i for i in range(burst)]
+    datas   = list(range(burst))
+
+    def request(tag):
+        if write:
+            return encode_packet([(base, datas, tag, [base])])
+        return encode_packet([(0, [], tag, addrs)])
+
+    outstanding = {} # tag: (time, request).
+    latencies   = []
+    sent, retransmits = 0, 0
+    start = time.perf_counter()
+    while len(latencies) < count:
+        while len(outstanding) < depth and sent < count:
+            data = request(sent)
+            sock.send(data)
+            outstanding[sent] = (time.perf_counter(), data)
+            sent += 1
+        try:
+            reply = sock.recv(65536)
+        except socket.timeout:
+            for _, data in outstanding.values():
+                sock.send(data)
+                retransmits += 1
+            continue
+        _, _, _, records = decode_packet(reply)
+        for record in records:
+            if record.base_addr in outstanding:
+                latencies.append(time.perf_counter() - outstanding.pop(record.base_addr)[0])
+    elapsed = time.perf_counter() - start
+    sock.close()
+    latencies.sort()
+    return {
+        "burst"       : burst,
+        "depth"       : depth,
+        "packets/s"   : count/elapsed,
+        "MB/s"        : count*burst*4/elapsed/1e6,
+        "latency"     : sum(latencies)/len(latencies),
+        "latency_p99" : latencies[int(len(latencies)*0.99)],
+        "retransmits" : retransmits,
+    }
+
+def bench_tcp(address, base, burst, count, write=False, csr_csv=None):
+    """litex_server path (RemoteClient): reads (or writes) of burst words at base."""
+    from litex import RemoteClient
+    bus = RemoteClient(host=address[0], port=address[1], csr_csv=csr_csv)
+    bus.open()
+    start = time.perf_counter()
+    for _ in range(count):
+        if write:
+            bus.write(base, list(range(burst)))
+        else:
+            bus.read(base, length=burst)
+    elapsed = time.perf_counter() - start
+    bus.close()
+    return {
+        "burst"     : burst,
+        "depth"     : 1,
+        "packets/s" : count/elapsed,
+        "MB/s"      : count*burst*4/elapsed/1e6,
+        "latency"   : elapsed/count,
+    }
+
+def spawn(memory, latency, loss, tcp=False, seed=None):
+    """Serve memory from a child process on ephemeral ports, return (pid, address)."""
+    if tcp:
+        from litex.tools.litex_server import RemoteServer
+        server = RemoteServer(CommEmulator(memory, latency, loss, seed=seed), "127.0.0.1", 0)
+        with contextlib.redirect_stdout(None):
+            server.open()
+        address = server.socket.getsockname()
+    else:
+        server  = EtherboneServer(memory, "127.0.0.1", 0, latency, loss, seed)
+        address = server.socket.getsockname()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            sys.stdout = open(os.devnull, "w")
+            if tcp:
+                server.start(1)
+                while True:
+                    time.sleep(3600)
+            server.serve_forever()
+        finally:
+            os._exit(0)
+    server.socket.close()
+    return pid, address
+
+def parse_time(value):
+    """Time in s from a value in s or with unit (ex: 0.001, 1ms, 200us)."""
+    for unit, scale in [("us", 1e-6), ("ms", 1e-3), ("s", 1)]:
+        if value.endswith(unit):
+            return float(value[:-len(unit)])*scale
+    return float(value)
+
+def print_results(results):
+    print("{:>6} {:>6} {:>12} {:>10} {:>13} {:>13} {:>12}".format(
+        "Burst", "Depth", "Packets/s", "MB/s", "Latency(ms)", "p99(ms)", "Retransmits"))
+    for r in results:
+        print("{:>6} {:>6} {:>12.0f} {:>10.3f} {:>13.3f} {:>13} {:>12}".format(
+            r["burst"], r["depth"], r["packets/s"], r["MB/s"], r["latency"]*1e3,
+            "-" if "latency_p99" not in r else "{:.3f}".format(r["latency_p99"]*1e3),
+            r.get("retransmits", "-")))
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards Etherbone stand-in (emulated target CSR/memory map).")
+    parser.add_argument("command",       choices=["serve", "bench"], help="Command.")
+    parser.add_argument("csr",                                       help="Target csr.csv or csr.json.")
+    parser.add_argument("--ip",          default="127.0.0.1",        help="Bind address (serve).")
+    parser.add_argument("--port",        default=default_port, type=int, help="UDP/TCP port (serve).")
+    parser.add_argument("--no-tcp",      action="store_true",        help="Only serve Etherbone over UDP (serve).")
+    parser.add_argument("--latency",     default="0",                help="Round trip latency (ex: 200us, 1ms).")
+    parser.add_argument("--loss",        default=0.0, type=float,    help="Packet loss probability.")
+    parser.add_argument("--seed",        default=None, type=int,     help="Packet loss random seed.")
+    parser.add_argument("--server",      default=None,               help="Benchmark a running stand-in/target (ip:port) (bench).")
+    parser.add_argument("--tcp",         action="store_true",        help="Benchmark the litex_server path (RemoteClient) (bench).")
+    parser.add_argument("--region",      default=None,               help="Benchmarked memory region (default: first RAM region) (bench).")
+    parser.add_argument("--write",       action="store_true",        help="Benchmark writes (with a read fence per packet) (bench).")
+    parser.add_argument("--bursts",      default="1,16,64,255",      help="Burst sizes in words (bench).")
+    parser.add_argument("--depths",      default="1,4,16",           help="Pipelining depths in packets (bench, UDP).")
+    parser.add_argument("--count",       default=2000, type=int,     help="Packets per measurement (bench).")
+    parser.add_argument("--json",        default=None,               help="Write benchmark results to JSON file (bench).")
+    args = parser.parse_args()
+
+    memory  = load_memory_map(args.csr)
+    latency = parse_time(args.latency)
+
+    # Serve.
+    if args.command == "serve":
+        server = EtherboneServer(memory, args.ip, args.port, latency, args.loss, args.seed)
+        print(f"Etherbone (UDP) on {args.ip}:{args.port}: {len(memory.regions)} regions, {len(memory.registers)} CSRs.")
+        if not args.no_tcp:
+            if start_tcp_server(memory, args.ip, args.port, latency, args.loss, seed=args.seed) is None:
+                print("LiteX not found, litex_server (TCP) not available.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(", ".join(f"{k}: {v}" for k, v in sorted({**server.stats, **memory.stats}.items())))
+        return
+
+    # Benchmark.
+    base, size = memory.get_region(args.region)
+    bursts  = [int(b) for b in args.bursts.split(",")]
+    depths  = [int(d) for d in args.depths.split(",")] if not args.tcp else [1]
+    if max(bursts) > max_burst or max(bursts)*4 > size:
+        parser.error(f"Bursts must be <= {max_burst} words and fit in the region ({size} bytes).")
+    pid = None
+    if args.server is None:
+        pid, address = spawn(memory, latency, args.loss, args.tcp, args.seed)
+    else:
+        ip, port = args.server.split(":")
+        address  = (ip, int(port))
+    results = []
+    try:
+        for burst in bursts:
+            for depth in depths:
+                if args.tcp:
+                    csr_csv = args.csr if args.csr.endswith(".csv") else None
+                    results.append(bench_tcp(address, base, burst, args.count, args.write, csr_csv))
+                else:
+                    results.append(bench_udp(address, base, burst, depth, args.count, args.write,
+                        timeout=max(0.1, 4*latency)))
+    finally:
+        if pid is not None:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+    print(f"{'Writes' if args.write else 'Reads'} @0x{base:08x}, latency {latency*1e3:g}ms, loss {args.loss:g}:")
+    print_results(results)
+    if args.json is not None:
+        matrix.write_summary(results, args.json)
+
+if __name__ == "__main__":
+    main()
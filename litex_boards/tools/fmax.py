@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Fmax Exploration: build targets at several sys_clk_freqs in parallel with Yosys/Nextpnr, parse the
+# Nextpnr timing results and report the maximum passing frequency per target and feature set.
+#
+# Frequencies are either swept from a list or found by a parallel search: each round builds -j
+# frequencies evenly spaced between the highest passing and the lowest failing frequencies.
+#
+# python3 -m litex_boards.tools.fmax colorlight_5a_75x --freqs=50e6,60e6,70e6,80e6
+# python3 -m litex_boards.tools.fmax orangecrab radiona_ulx3s --min=40e6 --max=120e6 -j8
+# python3 -m litex_boards.tools.fmax icebreaker --feature-set="" --feature-set="--with-spi-flash"
+
+import os
+import re
+import sys
+import argparse
+
+from litex_boards.tools import matrix
+
+# Nextpnr Timing -----------------------------------------------------------------------------------
+
+_max_freq_re = re.compile(r"Max frequency for clock\s+'([^']+)':\s+([0-9.]+) MHz \((PASS|FAIL) at ([0-9.]+) MHz\)")
+
+def parse_nextpnr_timing(log):
+    """Return {clock: {"fmax", "target", "passed"}} from a Nextpnr log (last report: post-routing)."""
+    clocks = {}
+    for clock, fmax, status, target in _max_freq_re.findall(log):
+        clocks[clock] = {
+            "fmax"   : float(fmax)*1e6,
+            "target" : float(target)*1e6,
+            "passed" : (status == "PASS"),
+        }
+    return clocks
+
+# Jobs ---------------------------------------------------------------------------------------------
+
+def get_config_name(target, feature_set):
+    return target + "".join(f"+{arg.lstrip('-')}" for arg in feature_set.split())
+
+def fmax_job(target, feature_set, freq, output_dir, toolchain=None):
+    name       = f"{get_config_name(target, feature_set)}@{freq/1e6:g}MHz"
+    output_dir = os.path.join(output_dir, name)
+    job = matrix.Job("fmax", name,
+        module     = f"litex_boards.targets.{target}",
+        output_dir = output_dir,
+        args       = [
+            f"--sys-clk-freq={freq!r}",
+            "--build",
+            "--no-compile-software",
+            f"--output-dir={os.path.abspath(output_dir)}",
+        ] + ([] if toolchain is None else [f"--toolchain={toolchain}"]) + feature_set.split()
+    )
+    job.freq = freq
+    return job
+
+def run_job(job):
+    result = matrix.run_job(job)
+    with open(job.log_filename, errors="replace") as f:
+        clocks = parse_nextpnr_timing(f.read())
+    result["freq"]   = job.freq
+    result["clocks"] = clocks
+    # Timing is met when the build succeeds and all clocks pass (Nextpnr reports are required).
+    result["timing_met"] = result["passed"] and len(clocks) > 0 and all(c["passed"] for c in clocks.values())
+    return result
+
+# Search -------------------------------------------------------------------------------------------
+
+class FmaxSearch:
+    """Maximum passing frequency search of a target configuration."""
+    def __init__(self, target, feature_set, freqs=None, fmin=None, fmax=None, resolution=1e6):
+        self.target      = target
+        self.feature_set = feature_set
+        self.freqs       = freqs
+        self.low         = fmin # Highest passing frequency (assumed passing until built).
+        self.high        = fmax # Lowest failing frequency.
+        self.resolution  = resolution
+        self.runs        = []
+
+    @property
+    def name(self):
+        return get_config_name(self.target, self.feature_set)
+
+    @property
+    def max_passing(self):
+        passing = [run["freq"] for run in self.runs if run["timing_met"]]
+        return max(passing) if passing else None
+
+    def next_freqs(self, n):
+        done = [run["freq"] for run in self.runs]
+        # Sweep: all frequencies at once.
+        if self.freqs is not None:
+            return [f for f in self.freqs if f not in done]
+        # Search: first round includes both bounds, then n frequencies evenly spaced in ]low, high[.
+        if not self.runs:
+            n = max(n, 2)
+            return [round(self.low + (self.high - self.low)*i/(n - 1), -3) for i in range(n)]
+        if self.max_passing is None or (self.high - self.low) <= self.resolution:
+            return []
+        step = (self.high - self.low)/(n + 1)
+        if step < self.resolution:
+            n    = max(int((self.high - self.low)/self.resolution) - 1, 1)
+            step = (self.high - self.low)/(n + 1)
+        return [round(self.low + step*(i + 1), -3) for i in range(n)]
+
+    def update(self, results):
+        self.runs += results
+        if self.freqs is None:
+            passing = [r["freq"] for r in self.runs if r["timing_met"]]
+            failing = [r["freq"] for r in self.runs if not r["timing_met"] and r["freq"] > max(passing + [0])]
+            self.low  = max(passing) if passing else self.low
+            self.high = min(failing) if failing else self.high
+
+    def get_report(self):
+        return {
+            "target"      : self.target,
+            "feature_set" : self.feature_set,
+            "max_passing" : self.max_passing,
+            "runs"        : sorted([{
+                "freq"       : r["freq"],
+                "timing_met" : r["timing_met"],
+                "returncode" : r["returncode"],
+                "clocks"     : r["clocks"],
+                "log"        : r["log"],
+            } for r in self.runs], key=lambda r: r["freq"]),
+        }
+
+def run_searches(searches, njobs, output_dir, toolchain=None):
+    """Run searches in rounds, each round running the next frequencies of all searches in parallel."""
+    while True:
+        jobs = {}
+        for search in searches:
+            for freq in search.next_freqs(njobs):
+                jobs[fmax_job(search.target, search.feature_set, freq, output_dir, toolchain)] = search
+        if not jobs:
+            break
+        results = matrix.run_jobs(list(jobs), njobs=njobs, runner=run_job, callback=print_result)
+        for job, result in zip(jobs, results):
+            result.setdefault("freq",       job.freq)
+            result.setdefault("clocks",     {})
+            result.setdefault("timing_met", False)
+        for search in searches:
+            search.update([r for job, r in zip(jobs, results) if jobs[job] is search])
+
+def print_result(result, done, total):
+    print("[{:>{w}}/{}] {} {} ({:.1f}s)".format(
+        done, total,
+        "MET " if result.get("timing_met", False) else ("FAIL" if result["passed"] else "ERR "),
+        result["name"],
+        result["duration"],
+        w = len(str(total))),
+        flush = True,
+    )
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards Fmax exploration (Yosys/Nextpnr).")
+    parser.add_argument("targets",       nargs="+",                 help="Targets to explore.")
+    parser.add_argument("--freqs",       default=None,              help="Comma separated sys_clk_freqs to sweep.")
+    parser.add_argument("--min",         type=float, default=25e6,  help="Search: minimum sys_clk_freq.")
+    parser.add_argument("--max",         type=float, default=200e6, help="Search: maximum sys_clk_freq.")
+    parser.add_argument("--resolution",  type=float, default=1e6,   help="Search: resolution.")
+    parser.add_argument("--feature-set", action="append",           help="Target arguments of a feature set (ex: \"--with-ethernet\"), can be repeated.")
+    parser.add_argument("--toolchain",   default=None,              help="Toolchain passed to the targets (ex: yosys+nextpnr, default: target's).")
+    parser.add_argument("-j", "--jobs",  type=int, default=os.cpu_count(), help="Number of parallel builds.")
+    parser.add_argument("--output-dir",  default="build/fmax",      help="Base output directory.")
+    parser.add_argument("--report",      default=None,              help="JSON report file (default: <output-dir>/fmax.json).")
+    args = parser.parse_args()
+
+    # Create searches.
+    freqs    = None if args.freqs is None else sorted(float(f) for f in args.freqs.split(","))
+    searches = []
+    for target in args.targets:
+        for feature_set in (args.feature_set or [""]):
+            searches.append(FmaxSearch(target, feature_set,
+                freqs      = freqs,
+                fmin       = args.min,
+                fmax       = args.max,
+                resolution = args.resolution,
+            ))
+
+    # Run.
+    run_searches(searches, args.jobs, args.output_dir, args.toolchain)
+
+    # Report.
+    report = [search.get_report() for search in searches]
+    report_filename = args.report or os.path.join(args.output_dir, "fmax.json")
+    matrix.write_summary(report, report_filename)
+    for search in searches:
+        max_passing = search.max_passing
+        print("{:48s} {}".format(search.name, "-" if max_passing is None else f"{max_passing/1e6:.2f}MHz"))
+    print(f"Report: {report_filename}")
+    sys.exit(0 if all(search.max_passing is not None for search in searches) else 1)
+
+if __name__ == "__main__":
+    main()
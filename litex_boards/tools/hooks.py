@@ -0,0 +1,46 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build Hooks: context managers instrumenting/extending the LiteX build of a target run in-process
+# (see litex_boards.tools.run). Originals are restored when leaving the context.
+
+import contextlib
+
+# Patch --------------------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def patch(obj, name, wrapper):
+    """Replace obj.name by wrapper(obj.name) during the context."""
+    original = getattr(obj, name)
+    setattr(obj, name, wrapper(original))
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
+# Toolchain Run ------------------------------------------------------------------------------------
+
+def toolchain_run_hook(callback):
+    """Call callback(toolchain, run_script, script) instead of toolchain.run_script(script).
+
+    The callback is called from the gateware directory (as run_script) and decides whether/how to
+    call run_script. Works for all toolchains since they all build through GenericToolchain.build.
+    """
+    from litex.build.generic_toolchain import GenericToolchain
+    def wrapper(build):
+        def _build(self, *args, **kwargs):
+            had_run_script = "run_script" in self.__dict__
+            run_script     = self.run_script
+            self.run_script = lambda script: callback(self, run_script, script)
+            try:
+                return build(self, *args, **kwargs)
+            finally:
+                if had_run_script:
+                    self.run_script = run_script
+                else:
+                    del self.run_script
+        return _build
+    return patch(GenericToolchain, "build", wrapper)
@@ -0,0 +1,143 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Incremental Toolchain Runs: skip the vendor toolchain (Vivado, Nextpnr, Quartus, Gowin...) when
+# its inputs are byte-identical to a previous successful run and reuse the outputs of this run
+# (bitstream, timing/utilization reports), from the build directory or from a shared artifact store.
+#
+# Inputs are the files present in the gateware directory when the toolchain is started (Verilog,
+# constraints, build script/project with the toolchain options, memory init files), except the ones
+# generated by the previous toolchain run, and the external sources of the platform (ex: CPU Verilog).
+
+import os
+import json
+import shutil
+import hashlib
+
+from litex_boards.tools.hooks import toolchain_run_hook
+
+# Parameters ---------------------------------------------------------------------------------------
+
+state_filename = "incremental.json"
+
+output_extensions = [
+    # Bitstreams.
+    ".bit", ".bin", ".svf", ".fs", ".sof", ".pof", ".rbf", ".jed", ".asc", ".config", ".hex",
+    # Reports/Logs.
+    ".rpt", ".txt", ".log", ".summary", ".json",
+]
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _sha256(filename):
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def list_files(directory):
+    files = {}
+    for root, dirs, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            files[os.path.relpath(path, directory)] = os.path.getmtime(path)
+    return files
+
+def get_inputs_hash(toolchain, build_dir=".", generated=[]):
+    h = hashlib.sha256()
+    h.update(type(toolchain).__name__.encode())
+    for filename in sorted(list_files(build_dir)):
+        if filename == state_filename or filename in generated:
+            continue
+        h.update(filename.encode())
+        h.update(_sha256(os.path.join(build_dir, filename)).encode())
+    # External sources (ex: CPU/IP Verilog files from pythondata packages).
+    for source in sorted(s[0] for s in toolchain.platform.sources):
+        if os.path.isabs(source) and os.path.exists(source):
+            h.update(os.path.basename(source).encode())
+            h.update(_sha256(source).encode())
+    return h.hexdigest()
+
+# Incremental Run ----------------------------------------------------------------------------------
+
+class IncrementalRun:
+    """Toolchain run callback skipping runs with unchanged inputs."""
+    def __init__(self, artifact_store=None):
+        self.artifact_store = None if artifact_store is None else os.path.abspath(artifact_store)
+        self.skipped        = False
+
+    def load_state(self):
+        if os.path.exists(state_filename):
+            with open(state_filename) as f:
+                return json.load(f)
+        return {}
+
+    def outputs_valid(self, state):
+        for filename, sha256 in state.get("outputs", {}).items():
+            if not os.path.exists(filename) or _sha256(filename) != sha256:
+                return False
+        return state.get("outputs", {}) != {}
+
+    def restore(self, inputs_hash):
+        store_dir = os.path.join(self.artifact_store, inputs_hash)
+        if not os.path.exists(os.path.join(store_dir, state_filename)):
+            return None
+        for filename in list_files(store_dir):
+            dst = filename
+            if os.path.dirname(dst):
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(os.path.join(store_dir, filename), dst)
+        return self.load_state()
+
+    def store(self, inputs_hash, state):
+        store_dir = os.path.join(self.artifact_store, inputs_hash)
+        tmp_dir   = store_dir + f".tmp{os.getpid()}"
+        for filename in list(state["outputs"]) + [state_filename]:
+            dst = os.path.join(tmp_dir, filename)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(filename, dst)
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.rename(tmp_dir, store_dir)
+
+    def __call__(self, toolchain, run_script, script):
+        state       = self.load_state()
+        inputs_hash = get_inputs_hash(toolchain, generated=state.get("generated", []))
+
+        # Outputs of a previous run with the same inputs in the build directory?
+        if state.get("inputs", None) == inputs_hash and self.outputs_valid(state):
+            print(f"Toolchain inputs unchanged ({inputs_hash[:16]}), reusing outputs from build directory.")
+            self.skipped = True
+            return
+
+        # Or in the artifact store?
+        if self.artifact_store is not None:
+            state = self.restore(inputs_hash)
+            if state is not None:
+                print(f"Toolchain inputs unchanged ({inputs_hash[:16]}), reusing outputs from {self.artifact_store}.")
+                self.skipped = True
+                return
+
+        # Run toolchain and record the files it generated (new/modified) and its outputs.
+        if os.path.exists(state_filename):
+            os.remove(state_filename)
+        before = list_files(".")
+        run_script(script)
+        generated, outputs = [], {}
+        for filename, mtime in list_files(".").items():
+            if before.get(filename, None) == mtime:
+                continue
+            generated.append(filename)
+            if os.path.splitext(filename)[1] in output_extensions:
+                outputs[filename] = _sha256(filename)
+        state = {"inputs": inputs_hash, "generated": sorted(generated), "outputs": outputs}
+        with open(state_filename, "w") as f:
+            json.dump(state, f, indent=4)
+        if self.artifact_store is not None:
+            self.store(inputs_hash, state)
+
+def incremental_hook(artifact_store=None):
+    return toolchain_run_hook(IncrementalRun(artifact_store))
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build Matrix: build all platforms (with the simple target) and/or all targets in parallel, each
+# build running in its own isolated output directory.
+#
+# python3 -m litex_boards.tools.matrix --targets -j64                    (all targets, 64 builds in parallel)
+# python3 -m litex_boards.tools.matrix --platforms                       (simple design for all platforms)
+# python3 -m litex_boards.tools.matrix --targets digilent_arty sqrl_acorn (selected targets)
+# python3 -m litex_boards.tools.matrix --targets --in-process            (elaborate in warm workers)
+# python3 -m litex_boards.tools.matrix --targets --cache=build/cache     (reuse unchanged builds)
+# python3 -m litex_boards.tools.matrix --targets --software-cache        (share software objects)
+# python3 -m litex_boards.tools.matrix --targets --shard=2/4             (2nd of 4 balanced CI shards)
+#
+# Builds are scheduled longest-first from historical costs (costs.json, updated after each run).
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import functools
+import contextlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Exclusions ---------------------------------------------------------------------------------------
+
+excluded_platforms = [
+    "qmtech_daughterboard",              # Reason: Not a real platform.
+    "enclustra_st1",                     # Readon: Not a real platform.
+    "quicklogic_quickfeather",           # Reason: No default clock.
+    "efinix_titanium_ti60_f225_dev_kit", # Reason: Require Efinity toolchain.
+    "efinix_trion_t120_bga576_dev_kit",  # Reason: Require Efinity toolchain.
+    "efinix_trion_t20_bga256_dev_kit",   # Reason: Require Efinity toolchain.
+    "efinix_trion_t20_mipi_dev_kit",     # Reason: Require Efinity toolchain.
+    "efinix_xyloni_dev_kit",             # Reason: Require Efinity toolchain.
+    "sipeed_tang_primer",                # Reason: Require Anlogic toolchain.
+    "jungle_electronics_fireant",        # Reason: Require Efinity toolchain.
+    "efinix_t8f81_dev_kit",              # Reason: Require Efinity toolchain.
+    "adi_plutosdr",                      # Reason: No default clock.
+    "newae_cw305",                       # Reason: No default clock.
+]
+
+excluded_targets = [
+    "simple",                            # Reason: Generic target.
+    "quicklogic_quickfeather",           # Reason: No default clock.
+    "efinix_titanium_ti60_f225_dev_kit", # Reason: Require Efinity toolchain.
+    "efinix_trion_t120_bga576_dev_kit",  # Reason: Require Efinity toolchain.
+    "efinix_trion_t20_bga256_dev_kit",   # Reason: Require Efinity toolchain.
+    "efinix_trion_t20_mipi_dev_kit",     # Reason: Require Efinity toolchain.
+    "efinix_xyloni_dev_kit",             # Reason: Require Efinity toolchain.
+    "sipeed_tang_primer",                # Reason: Require Anlogic toolchain.
+    "jungle_electronics_fireant",        # Reason: Require Efinity toolchain.
+    "efinix_t8f81_dev_kit",              # Reason: Require Efinity toolchain.
+]
+
+# Collect ------------------------------------------------------------------------------------------
+
+litex_boards_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def collect_modules(kind, excluded=[]):
+    names = []
+    for file in sorted(os.listdir(os.path.join(litex_boards_dir, kind))):
+        if file.endswith(".py"):
+            name = file.replace(".py", "")
+            if name not in ["__init__"] + excluded:
+                names.append(name)
+    return names
+
+def collect_platforms(excluded=excluded_platforms):
+    return collect_modules("platforms", excluded)
+
+def collect_targets(excluded=excluded_targets):
+    return collect_modules("targets", excluded)
+
+# Job ----------------------------------------------------------------------------------------------
+
+class Job:
+    """Build of a single platform/target, isolated in its own output directory."""
+    def __init__(self, kind, name, module, args, output_dir):
+        self.kind       = kind
+        self.name       = name
+        self.module     = module
+        self.args       = args
+        self.output_dir = os.path.abspath(output_dir)
+        self.environ    = {} # Additional environment variables.
+
+    @property
+    def key(self):
+        return f"{self.kind}/{self.name}"
+
+    @property
+    def log_filename(self):
+        return os.path.join(self.output_dir, "build.log")
+
+    def get_command(self):
+        return [sys.executable, "-m", self.module] + self.args
+
+    def prepare(self):
+        # Start from a clean output directory.
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+        os.makedirs(self.output_dir)
+
+    def result(self, returncode, duration, **kwargs):
+        return dict(
+            kind       = self.kind,
+            name       = self.name,
+            passed     = (returncode == 0),
+            returncode = returncode,
+            duration   = duration,
+            output_dir = self.output_dir,
+            log        = self.log_filename,
+            **kwargs
+        )
+
+def platform_job(name, output_dir, args=[]):
+    output_dir = os.path.join(output_dir, "platforms", name)
+    return Job("platform", name,
+        module     = "litex_boards.targets.simple",
+        output_dir = output_dir,
+        args       = [
+            f"litex_boards.platforms.{name}",
+            "--build",
+            "--no-compile",
+            "--uart-name=stub",
+            f"--output-dir={os.path.abspath(output_dir)}",
+        ] + args
+    )
+
+def target_job(name, output_dir, args=[]):
+    output_dir = os.path.join(output_dir, "targets", name)
+    return Job("target", name,
+        module     = f"litex_boards.targets.{name}",
+        output_dir = output_dir,
+        args       = [
+            "--cpu-type=vexriscv",
+            "--cpu-variant=minimal",
+            "--build",
+            "--no-compile",
+            f"--output-dir={os.path.abspath(output_dir)}",
+        ] + args
+    )
+
+def collect_jobs(output_dir, platforms=[], targets=[], args=[]):
+    jobs  = [platform_job(name, output_dir, args) for name in platforms]
+    jobs += [target_job(name,   output_dir, args) for name in targets]
+    return jobs
+
+# Run ----------------------------------------------------------------------------------------------
+
+def run_job(job):
+    """Run a Job in a separate interpreter, with its output directory as working directory."""
+    job.prepare()
+    # Make sure litex_boards is still importable from the output directory.
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(litex_boards_dir), env.get("PYTHONPATH")]))
+    env.update(job.environ)
+    start = time.time()
+    with open(job.log_filename, "w") as log:
+        returncode = subprocess.call(job.get_command(),
+            cwd    = job.output_dir,
+            env    = env,
+            stdout = log,
+            stderr = subprocess.STDOUT,
+        )
+    return job.result(returncode, time.time() - start)
+
+def run_jobs(jobs, njobs=None, runner=run_job, callback=None):
+    """Run Jobs on njobs workers (default: one per CPU) and return results in Jobs order."""
+    results = {}
+    with ThreadPoolExecutor(max_workers=njobs or os.cpu_count()) as executor:
+        futures = {executor.submit(runner, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = job.result(returncode=-1, duration=0.0, error=repr(e))
+            results[job.key] = result
+            if callback is not None:
+                callback(result, done=len(results), total=len(jobs))
+    return [results[job.key] for job in jobs]
+
+def print_result(result, done, total):
+    print("[{:>{w}}/{}] {} {}/{} ({:.1f}s){}".format(
+        done, total,
+        "PASS" if result["passed"] else "FAIL",
+        result["kind"],
+        result["name"],
+        result["duration"],
+        " [cache hit]" if result.get("cache", None) == "hit" else "",
+        w = len(str(total))),
+        flush = True,
+    )
+
+# Scheduling ---------------------------------------------------------------------------------------
+
+# Historical costs: {job key: duration (s)}, exponential moving average over runs.
+costs_smoothing = 0.5
+
+def load_costs(filename):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+def update_costs(filename, results):
+    """Update historical costs with the durations of the (built, not restored) results."""
+    costs = load_costs(filename)
+    for result in results:
+        if result["passed"] and result.get("cache", None) != "hit":
+            key  = f"{result['kind']}/{result['name']}"
+            cost = costs.get(key, None)
+            costs[key] = result["duration"] if cost is None else \
+                (1 - costs_smoothing)*cost + costs_smoothing*result["duration"]
+    write_summary(dict(sorted(costs.items())), filename)
+
+def get_costs(jobs, costs):
+    """Cost of each job, jobs without history costing the median of known costs."""
+    known   = sorted(costs[job.key] for job in jobs if job.key in costs)
+    default = known[len(known)//2] if known else 1.0
+    return {job.key: costs.get(job.key, default) for job in jobs}
+
+def sort_jobs(jobs, costs):
+    """Longest-first order (deterministic: ties ordered by key)."""
+    costs = get_costs(jobs, costs)
+    return sorted(jobs, key=lambda job: (-costs[job.key], job.key))
+
+def shard_jobs(jobs, costs, shard, nshards):
+    """Jobs of shard (0-based) out of nshards balanced shards (longest processing time first)."""
+    costs  = get_costs(jobs, costs)
+    loads  = [0.0]*nshards
+    shards = [[] for _ in range(nshards)]
+    for job in sort_jobs(jobs, costs):
+        n = loads.index(min(loads))
+        loads[n] += costs[job.key]
+        shards[n].append(job)
+    return shards[shard]
+
+def estimate_duration(jobs, costs, njobs):
+    """Estimated wall time of jobs run longest-first on njobs workers."""
+    costs   = get_costs(jobs, costs)
+    workers = [0.0]*njobs
+    for job in sort_jobs(jobs, costs):
+        n = workers.index(min(workers))
+        workers[n] += costs[job.key]
+    return max(workers)
+
+def get_critical_path(results, njobs):
+    """Job bounding the wall time (last to finish) and wall time lower bounds."""
+    results = [r for r in results if "finished" in r]
+    if not results:
+        return None
+    last    = max(results, key=lambda r: r["finished"])
+    longest = max(results, key=lambda r: r["duration"])
+    return {
+        "last"    : f"{last['kind']}/{last['name']}",
+        "start"   : last["finished"] - last["duration"],
+        "finish"  : last["finished"],
+        "longest" : f"{longest['kind']}/{longest['name']}",
+        "bound"   : max(longest["duration"], sum(r["duration"] for r in results)/njobs),
+    }
+
+def parse_shard(shard):
+    # "i/N" (1-based) -> (i - 1, N).
+    i, n = (int(v) for v in shard.split("/"))
+    if not (1 <= i <= n):
+        raise ValueError(shard)
+    return i - 1, n
+
+# Summary ------------------------------------------------------------------------------------------
+
+def get_summary(results, duration):
+    passed = [r for r in results if r["passed"]]
+    return {
+        "jobs"     : len(results),
+        "passed"   : len(passed),
+        "failed"   : len(results) - len(passed),
+        "duration" : duration,
+        "results"  : results,
+    }
+
+def write_summary(summary, filename):
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with open(filename, "w") as f:
+        json.dump(summary, f, indent=4)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards build matrix.")
+    parser.add_argument("names",        nargs="*",             help="Platforms/Targets to build (default: all).")
+    parser.add_argument("--platforms",  action="store_true",   help="Build simple design for platforms.")
+    parser.add_argument("--targets",    action="store_true",   help="Build default configuration for targets.")
+    parser.add_argument("-j", "--jobs", type=int,              help="Number of parallel builds (default: CPU count).")
+    parser.add_argument("--output-dir", default="build/matrix", help="Base output directory.")
+    parser.add_argument("--summary",    default=None,          help="JSON summary file (default: <output-dir>/summary.json).")
+    parser.add_argument("--args",       default="",            help="Additional arguments passed to each build.")
+    parser.add_argument("--in-process", action="store_true",   help="Elaborate in workers forked from a warm interpreter.")
+    parser.add_argument("--max-tasks-per-worker", type=int, default=1, help="Builds per worker before recycling (with --in-process).")
+    parser.add_argument("--cache",          default=None, help="Gateware cache directory (restore unchanged builds).")
+    parser.add_argument("--cache-max-size", default=None, help="Gateware cache size quota (ex: 10G).")
+    parser.add_argument("--software-cache", nargs="?", const="", help="Share compiled software objects between builds (optional directory).")
+    parser.add_argument("--costs",          default=None, help="Historical build costs JSON file (default: <output-dir>/costs.json).")
+    parser.add_argument("--shard",          default=None, help="Only run shard i of N balanced shards (ex: 2/4).")
+    args = parser.parse_args()
+    njobs = args.jobs or os.cpu_count()
+
+    # Select platforms/targets (both when none specified).
+    if not (args.platforms or args.targets):
+        args.platforms = args.targets = True
+    def select(names):
+        return [name for name in names if (not args.names) or (name in args.names)]
+    platforms = select(collect_platforms()) if args.platforms else []
+    targets   = select(collect_targets())   if args.targets   else []
+
+    # Schedule builds: longest-first from historical costs, optionally sharded.
+    jobs  = collect_jobs(args.output_dir, platforms, targets, args.args.split())
+    costs_filename = args.costs or os.path.join(args.output_dir, "costs.json")
+    costs = load_costs(costs_filename)
+    if args.shard is not None:
+        try:
+            shard, nshards = parse_shard(args.shard)
+        except ValueError:
+            parser.error(f"Invalid shard {args.shard} (expected i/N with 1 <= i <= N).")
+        jobs = shard_jobs(jobs, costs, shard, nshards)
+        print(f"Shard {args.shard}: {len(jobs)} jobs.")
+    print(f"Estimated duration: {estimate_duration(jobs, costs, njobs):.1f}s on {njobs} workers.")
+    schedule = sort_jobs(jobs, costs)
+
+    # Run builds.
+    start   = time.time()
+    def callback(result, done, total):
+        result["finished"] = time.time() - start
+        print_result(result, done, total)
+    if args.in_process:
+        from litex_boards.tools import elaborate
+        runner = elaborate.run_job
+    else:
+        runner = run_job
+    if args.cache is not None:
+        from litex_boards.tools import cache
+        gateware_cache = cache.GatewareCache(args.cache, args.cache_max_size)
+        runner = functools.partial(cache.run_job, cache=gateware_cache, runner=runner)
+    software_cache = contextlib.nullcontext()
+    if args.software_cache is not None:
+        from litex_boards.tools import swcache
+        software_cache = swcache.software_cache(*filter(None, [args.software_cache]))
+    with software_cache:
+        if args.in_process:
+            results = elaborate.run_jobs(schedule,
+                njobs                = njobs,
+                max_tasks_per_worker = args.max_tasks_per_worker,
+                runner               = runner,
+                callback             = callback,
+            )
+        else:
+            results = run_jobs(schedule, njobs=njobs, runner=runner, callback=callback)
+    results = dict(zip([job.key for job in schedule], results))
+    results = [results[job.key] for job in jobs]
+    summary = get_summary(results, time.time() - start)
+    summary["critical_path"] = get_critical_path(results, njobs)
+    update_costs(costs_filename, results)
+
+    # Write summary.
+    summary_filename = args.summary or os.path.join(args.output_dir, "summary.json")
+    write_summary(summary, summary_filename)
+    print(f"{summary['passed']}/{summary['jobs']} passed in {summary['duration']:.1f}s, summary: {summary_filename}")
+    if args.cache is not None:
+        hits = len([r for r in results if r.get("cache", None) == "hit"])
+        print(f"Gateware cache: {hits} hits, {len(results) - hits} misses.")
+    critical_path = summary["critical_path"]
+    if critical_path is not None:
+        print("Critical path: {} (started at {:.1f}s, finished at {:.1f}s), longest build: {}, lower bound: {:.1f}s.".format(
+            critical_path["last"], critical_path["start"], critical_path["finish"],
+            critical_path["longest"], critical_path["bound"]))
+    for result in results:
+        if not result["passed"]:
+            print(f"- {result['kind']}/{result['name']} failed, see {result['log']}")
+    sys.exit(0 if summary["failed"] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
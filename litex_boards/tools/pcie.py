@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# PCIe Endpoint Model: software model of the LitePCIe endpoint of a target, to run the generated
+# LitePCIe userspace library/tools (and applications built on it) and benchmark DMA throughput and
+# latency without the board/driver:
+# - pcie_model.c is an LD_PRELOAD shim emulating the LitePCIe driver (/dev/litepcieN: ioctl, read,
+#   write, poll, mmap) and the endpoint, compiled against the generated driver headers of the
+#   target (<build>/driver/kernel: csr.h, soc.h), so the CSR space (BAR0), DMA channels and MSI
+#   vectors are the ones of the target.
+# - DMA reader/writer engines are free-running over the DMA tables (as the hardware) at the link
+#   bandwidth, with loopback (reader -> writer, after --latency), software-visible counts are
+#   updated on MSIs (one per DMA_BUFFER_PER_IRQ buffers).
+# - Loopback latency is measured from buffer submission (write/mmap update) to consumption, lost
+#   buffers (submitted too late, overwritten before consumption) are counted on both paths.
+#
+# The driver software is generated with the target (--driver), the userspace tools are built with
+# the model on first use.
+#
+# python3 -m litex_boards.tools.pcie run build/sqrl_acorn/driver -- litepcie_util info
+# python3 -m litex_boards.tools.pcie run build/sqrl_acorn/driver -- litepcie_util scratch_test
+# python3 -m litex_boards.tools.pcie bench build/sqrl_acorn/driver --link=gen2x4 --duration=5
+# python3 -m litex_boards.tools.pcie bench build/sqrl_acorn/driver --bandwidth=20 --latency=5us --json=pcie.json
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+from litex_boards.tools import matrix
+from litex_boards.tools.etherbone import parse_time
+
+# Parameters ---------------------------------------------------------------------------------------
+
+model_source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pcie_model.c")
+
+# Data rate per lane (Gbps, after line encoding).
+pcie_links = {
+    "gen1" : 2.0,
+    "gen2" : 4.0,
+    "gen3" : 7.877,
+    "gen4" : 15.754,
+}
+
+default_link = "gen2x4"
+
+def get_bandwidth(link):
+    """Link bandwidth in Gbps from a link (ex: gen2x4)."""
+    m = re.fullmatch(r"(gen\d)x(\d+)", link)
+    if m is None or m.group(1) not in pcie_links:
+        raise ValueError(f"Invalid PCIe link {link} (ex: gen2x4, supported: {', '.join(pcie_links)}).")
+    return pcie_links[m.group(1)]*int(m.group(2))
+
+# Build --------------------------------------------------------------------------------------------
+
+def build(driver_dir):
+    """Build the model (against the target headers) and the userspace tools, return the model."""
+    kernel_dir = os.path.join(driver_dir, "kernel")
+    if not os.path.exists(os.path.join(kernel_dir, "csr.h")):
+        raise OSError(f"No generated driver in {driver_dir} (build the target with --driver).")
+    model = os.path.join(driver_dir, "model", "libpcie_model.so")
+    deps  = [model_source] + [os.path.join(kernel_dir, f) for f in ["csr.h", "soc.h", "config.h", "litepcie.h"]]
+    if not os.path.exists(model) or os.path.getmtime(model) < max(os.path.getmtime(d) for d in deps if os.path.exists(d)):
+        os.makedirs(os.path.dirname(model), exist_ok=True)
+        subprocess.check_call([os.environ.get("CC", "gcc"), "-O2", "-Wall", "-shared", "-fPIC",
+            "-I" + kernel_dir, "-o", model, model_source, "-ldl", "-lpthread"])
+    subprocess.check_call(["make", "-s", "-C", os.path.join(driver_dir, "user")])
+    return model
+
+def get_env(model, bandwidth=None, latency=None, stats=None):
+    env = dict(os.environ)
+    env["LD_PRELOAD"] = " ".join(p for p in [model, env.get("LD_PRELOAD", "")] if p)
+    if bandwidth is not None:
+        env["LITEPCIE_MODEL_BANDWIDTH"] = str(bandwidth)
+    if latency is not None:
+        env["LITEPCIE_MODEL_LATENCY"] = str(latency*1e6)
+    if stats is not None:
+        env["LITEPCIE_MODEL_STATS"] = stats
+    return env
+
+def get_command(driver_dir, command):
+    # Generated tools (litepcie_util, litepcie_test) from the driver directory.
+    tool = os.path.join(driver_dir, "user", command[0])
+    if os.sep not in command[0] and os.path.exists(tool):
+        return [tool] + command[1:]
+    return command
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def bench(driver_dir, model, bandwidth, latency, duration, zero_copy=False, channel=0):
+    """Run litepcie_util dma_test on the model, return the measurements."""
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = os.path.join(tmp, "stats.json")
+        command = get_command(driver_dir, ["litepcie_util", "-c", str(channel), "-t", str(duration)] +
+            (["-z"] if zero_copy else []) + ["dma_test"])
+        output = subprocess.run(command, env=get_env(model, bandwidth, latency, stats),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True).stdout
+        if not os.path.exists(stats):
+            raise RuntimeError(f"dma_test failed:\n{output}")
+        with open(stats) as f:
+            stats = json.load(f)
+    # DMA_SPEED(Gbps) TX_BUFFERS RX_BUFFERS DIFF ERRORS lines (after the first 128 loops).
+    rows = [line.split() for line in output.splitlines()]
+    rows = [[float(v) for v in row] for row in rows if len(row) == 5 and re.fullmatch(r"[\d.]+", row[0])]
+    speeds = [row[0] for row in rows[1:]] or [row[0] for row in rows] # Skip the start.
+    result = {
+        "channel"   : channel,
+        "zero_copy" : zero_copy,
+        "bandwidth" : bandwidth,
+        "latency"   : latency,
+        "speed"     : sum(speeds)/len(speeds) if speeds else 0.0,
+        "errors"    : int(sum(row[4] for row in rows)),
+        "checked"   : len(rows) > 0,
+        "model"     : stats,
+    }
+    # Lost buffers (read/write and zero-copy mmap updates): reader underruns, writer overruns.
+    result["lost"] = stats["channels"][channel]["reader_underruns"] + stats["channels"][channel]["writer_overruns"]
+    return result
+
+def print_results(results):
+    print("{:>8} {:>10} {:>12} {:>12} {:>8} {:>8} {:>14} {:>14} {:>10}".format(
+        "Channel", "Zero-copy", "Link(Gbps)", "DMA(Gbps)", "Errors", "Lost", "Latency(us)", "p99(us)", "MSIs"))
+    for r in results:
+        latency  = r["model"]["loopback_latency"]
+        channel  = r["model"]["channels"][r["channel"]]
+        print("{:>8} {:>10} {:>12.2f} {:>12.2f} {:>8} {:>8} {:>14} {:>14} {:>10}".format(
+            r["channel"], "yes" if r["zero_copy"] else "no", r["bandwidth"], r["speed"],
+            r["errors"] if r["checked"] else "-", r["lost"],
+            "{:.1f}".format(latency["mean"]) if "mean" in latency else "-",
+            "{:.1f}".format(latency["p99"])  if "p99"  in latency else "-",
+            channel["reader_msis"] + channel["writer_msis"]))
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards PCIe endpoint model (LitePCIe driver/DMA emulation).",
+        usage="%(prog)s [options] {run,bench} driver [-- command [arguments]]")
+    parser.add_argument("command",     choices=["run", "bench"],       help="Command.")
+    parser.add_argument("driver",                                      help="Target generated driver directory (<build>/driver).")
+    parser.add_argument("--link",      default=default_link,           help="PCIe link (ex: gen1x1, gen2x4, gen3x8).")
+    parser.add_argument("--bandwidth", default=None, type=float,       help="DMA bandwidth per direction in Gbps (overrides --link).")
+    parser.add_argument("--latency",   default="1us",                  help="Loopback latency (ex: 1us, 0.5ms).")
+    parser.add_argument("--duration",  default=5, type=int,            help="Measurement duration in s (bench).")
+    parser.add_argument("--channels",  default="0",                    help="Benchmarked DMA channels (bench).")
+    parser.add_argument("--json",      default=None,                   help="Write benchmark results to JSON file (bench).")
+    # Command to run: after "--" (run).
+    argv    = sys.argv[1:]
+    command = argv[argv.index("--") + 1:] if "--" in argv else []
+    argv    = argv[:argv.index("--")]     if "--" in argv else argv
+    args    = parser.parse_args(argv)
+
+    try:
+        bandwidth = args.bandwidth if args.bandwidth is not None else get_bandwidth(args.link)
+    except ValueError as e:
+        parser.error(str(e))
+    latency = parse_time(args.latency)
+    model   = build(args.driver)
+
+    # Run.
+    if args.command == "run":
+        if not command:
+            parser.error("No command to run (ex: -- litepcie_util info).")
+        command = get_command(args.driver, command)
+        sys.exit(subprocess.call(command, env=get_env(model, bandwidth, latency)))
+
+    # Benchmark.
+    results = []
+    for channel in [int(c) for c in args.channels.split(",")]:
+        for zero_copy in [False, True]:
+            results.append(bench(args.driver, model, bandwidth, latency, args.duration, zero_copy, channel))
+    print(f"DMA loopback, {bandwidth:g}Gbps, latency {latency*1e6:g}us, {args.duration}s:")
+    print_results(results)
+    if args.json is not None:
+        matrix.write_summary(results, args.json)
+    if any(r["errors"] or not r["checked"] for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
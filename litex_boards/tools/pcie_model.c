@@ -0,0 +1,821 @@
+/*
+ * This file is part of LiteX-Boards.
+ *
+ * Copyright (c) 2023 LiteX-Hub community
+ * SPDX-License-Identifier: BSD-2-Clause
+ *
+ * LitePCIe endpoint model: LD_PRELOAD shim emulating the LitePCIe driver (/dev/litepcieN) and the
+ * PCIe endpoint of a target, built from the target's generated driver headers (csr.h, soc.h,
+ * config.h, litepcie.h), so that the generated userspace library/tools run without a card.
+ *
+ * - BAR0: CSR space (registers stored, ctrl_scratch/identifier initialized), DMA/MSI registers
+ *   reflecting the model state.
+ * - DMA channels (DMA_CHANNELS): free-running reader/writer over the DMA_BUFFER_COUNT buffers
+ *   table as programmed by the driver, at the link bandwidth, with loopback (reader -> writer,
+ *   after the loopback latency).
+ * - MSIs: one per DMA_BUFFER_PER_IRQ buffers per direction (vectors of soc.h), software-visible
+ *   hw counts updated on MSIs (as the driver IRQ handler), only when the MSI is enabled.
+ * - Driver: open/close/read/write/poll/mmap/ioctl with the semantics of the LitePCIe driver.
+ *
+ * Environment: LITEPCIE_MODEL_BANDWIDTH (Gbps per direction, default 16), LITEPCIE_MODEL_LATENCY
+ * (loopback latency in us, default 1), LITEPCIE_MODEL_IDENTIFIER, LITEPCIE_MODEL_STATS (JSON
+ * statistics file written at exit: buffers, MSIs, lost buffers (reader underruns, writer overruns,
+ * for read/write and mmap updates), submit->consume loopback latencies).
+ */
+
+#define _GNU_SOURCE
+#include <dlfcn.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <poll.h>
+#include <pthread.h>
+#include <stdarg.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/eventfd.h>
+#include <sys/ioctl.h>
+#include <sys/mman.h>
+
+#include "litepcie.h"
+
+#ifndef CSR_BASE
+#define CSR_BASE 0x00000000
+#endif
+
+#define MODEL_CSR_SIZE    (1 << 20)
+#define MODEL_MAX_FILES   1024
+#define MODEL_MAX_SAMPLES (1 << 16)
+
+/* Channels -------------------------------------------------------------------------------------*/
+
+struct chan_config {
+    uint32_t base;
+    int writer_vector;
+    int reader_vector;
+};
+
+#define CHAN(n) {CSR_PCIE_DMA##n##_BASE, PCIE_DMA##n##_WRITER_INTERRUPT, PCIE_DMA##n##_READER_INTERRUPT}
+
+static const struct chan_config chan_configs[] = {
+#ifdef CSR_PCIE_DMA0_BASE
+    CHAN(0),
+#endif
+#ifdef CSR_PCIE_DMA1_BASE
+    CHAN(1),
+#endif
+#ifdef CSR_PCIE_DMA2_BASE
+    CHAN(2),
+#endif
+#ifdef CSR_PCIE_DMA3_BASE
+    CHAN(3),
+#endif
+#ifdef CSR_PCIE_DMA4_BASE
+    CHAN(4),
+#endif
+#ifdef CSR_PCIE_DMA5_BASE
+    CHAN(5),
+#endif
+#ifdef CSR_PCIE_DMA6_BASE
+    CHAN(6),
+#endif
+#ifdef CSR_PCIE_DMA7_BASE
+    CHAN(7),
+#endif
+    {0, 0, 0}
+};
+
+#define NCHANS ((int)(sizeof(chan_configs)/sizeof(chan_configs[0])) - 1)
+
+struct chan {
+    const struct chan_config *config;
+    char *reader_buf, *writer_buf;
+    uint8_t reader_enable, writer_enable, loopback;
+    uint8_t reader_lock, writer_lock;
+    /* Engine counts, software-visible counts (updated on MSIs) and software counts. */
+    int64_t reader_hw, writer_hw;
+    int64_t reader_hw_count, writer_hw_count;
+    int64_t reader_sw_count, writer_sw_count;
+    int64_t reader_start;
+    /* Loopback: reader buffers (and their due time) waiting for the writer. */
+    int64_t loopback_slot[DMA_BUFFER_COUNT], loopback_due[DMA_BUFFER_COUNT];
+    int64_t loopback_rd, loopback_wr;
+    /* Submit times of reader buffers, carried to writer buffers through the loopback. */
+    int64_t reader_ts[DMA_BUFFER_COUNT], writer_ts[DMA_BUFFER_COUNT];
+    uint64_t reader_msis, writer_msis;
+    /* Buffers lost: submitted after the reader passed them, overwritten before consumption. */
+    uint64_t reader_underruns, writer_overruns;
+};
+
+struct file {
+    struct chan *chan;
+    int flags;
+    uint8_t reader, writer;
+};
+
+static struct chan chans[NCHANS > 0 ? NCHANS : 1];
+static struct file *files[MODEL_MAX_FILES];
+static uint32_t *regs;
+static uint32_t msi_enable;
+static double bandwidth;  /* bits/ns. */
+static int64_t latency;   /* ns. */
+static int64_t samples[MODEL_MAX_SAMPLES];
+static uint64_t nsamples;
+
+static pthread_mutex_t lock = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t engine_cond, sw_cond;
+static pthread_t engine_thread;
+static int initialized;
+
+/* libc functions */
+static int (*real_open)(const char *, int, ...);
+static int (*real_close)(int);
+static ssize_t (*real_read)(int, void *, size_t);
+static ssize_t (*real_write)(int, const void *, size_t);
+static int (*real_ioctl)(int, unsigned long, ...);
+static int (*real_poll)(struct pollfd *, nfds_t, int);
+static void *(*real_mmap)(void *, size_t, int, int, int, off_t);
+static int (*real_munmap)(void *, size_t);
+
+static int64_t now_ns(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (int64_t)ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static void cond_init(pthread_cond_t *cond)
+{
+    pthread_condattr_t attr;
+    pthread_condattr_init(&attr);
+    pthread_condattr_setclock(&attr, CLOCK_MONOTONIC);
+    pthread_cond_init(cond, &attr);
+}
+
+static void cond_wait_until(pthread_cond_t *cond, int64_t deadline)
+{
+    struct timespec ts;
+    if (deadline < 0) {
+        pthread_cond_wait(cond, &lock);
+        return;
+    }
+    ts.tv_sec = deadline / 1000000000;
+    ts.tv_nsec = deadline % 1000000000;
+    pthread_cond_timedwait(cond, &lock, &ts);
+}
+
+/* MSIs / DMA engine ----------------------------------------------------------------------------*/
+
+static void msi(struct chan *c, int writer)
+{
+    /* IRQ of the descriptors with i % DMA_BUFFER_PER_IRQ == 0, driver IRQ handler. */
+    int vector = writer ? c->config->writer_vector : c->config->reader_vector;
+    if (!(msi_enable & (1 << vector)))
+        return;
+    if (writer) {
+        c->writer_msis++;
+        c->writer_hw_count = c->writer_hw;
+    } else {
+        c->reader_msis++;
+        c->reader_hw_count = c->reader_hw;
+    }
+    pthread_cond_broadcast(&sw_cond);
+}
+
+static int64_t next_irq(int64_t count)
+{
+    /* Buffers before the next descriptor with IRQ. */
+    return (DMA_BUFFER_PER_IRQ - count % DMA_BUFFER_PER_IRQ) % DMA_BUFFER_PER_IRQ;
+}
+
+static int64_t engine_step(struct chan *c, int64_t now)
+{
+    /* Run the engines of a channel until now, return the next due time (-1: none). */
+    double buffer_ns = DMA_BUFFER_SIZE * 8 / bandwidth;
+    int64_t next = -1;
+
+    if (c->reader_enable) {
+        int64_t target = (int64_t)((now - c->reader_start) / buffer_ns);
+        while (c->reader_hw < target) {
+            int64_t slot = c->reader_hw % DMA_BUFFER_COUNT;
+            if (c->loopback && c->writer_enable && c->loopback_wr - c->loopback_rd < DMA_BUFFER_COUNT) {
+                c->loopback_slot[c->loopback_wr % DMA_BUFFER_COUNT] = slot;
+                c->loopback_due[c->loopback_wr % DMA_BUFFER_COUNT] = c->reader_start + (int64_t)((c->reader_hw + 1) * buffer_ns) + latency;
+                c->loopback_wr++;
+            }
+            c->reader_hw++;
+            if (slot % DMA_BUFFER_PER_IRQ == 0)
+                msi(c, 0);
+        }
+        /* Next MSI (nothing visible to software in between). */
+        next = c->reader_start + (int64_t)((c->reader_hw + 1 + next_irq(c->reader_hw)) * buffer_ns);
+    }
+
+    while (c->loopback_rd < c->loopback_wr && c->loopback_due[c->loopback_rd % DMA_BUFFER_COUNT] <= now) {
+        int64_t src = c->loopback_slot[c->loopback_rd % DMA_BUFFER_COUNT];
+        int64_t dst = c->writer_hw % DMA_BUFFER_COUNT;
+        c->loopback_rd++;
+        if (!c->writer_enable)
+            continue;
+        memcpy(c->writer_buf + dst * DMA_BUFFER_SIZE, c->reader_buf + src * DMA_BUFFER_SIZE, DMA_BUFFER_SIZE);
+        c->writer_ts[dst] = c->reader_ts[src];
+        c->writer_hw++;
+        if (dst % DMA_BUFFER_PER_IRQ == 0)
+            msi(c, 1);
+    }
+    if (c->loopback_wr - c->loopback_rd > next_irq(c->writer_hw)) {
+        int64_t due = c->loopback_due[(c->loopback_rd + next_irq(c->writer_hw)) % DMA_BUFFER_COUNT];
+        if (next < 0 || due < next)
+            next = due;
+    }
+    return next;
+}
+
+static int64_t engine_update(void)
+{
+    /* Run the engines until now (called on each driver access too, so the engines are never late
+     * when the engine thread is not scheduled in time), return the next due time. */
+    int64_t now = now_ns();
+    int64_t next = -1;
+    for (int i = 0; i < NCHANS; i++) {
+        int64_t due = engine_step(&chans[i], now);
+        if (due >= 0 && (next < 0 || due < next))
+            next = due;
+    }
+    return next;
+}
+
+static void *engine(void *arg)
+{
+    (void)arg;
+    pthread_mutex_lock(&lock);
+    for (;;)
+        cond_wait_until(&engine_cond, engine_update());
+    return NULL;
+}
+
+static void engine_reader(struct chan *c, uint8_t enable)
+{
+    if (enable && !c->reader_enable) {
+        c->reader_start = now_ns() - (int64_t)(c->reader_hw * DMA_BUFFER_SIZE * 8 / bandwidth);
+    }
+    c->reader_enable = enable;
+    pthread_cond_broadcast(&engine_cond);
+}
+
+static void engine_writer(struct chan *c, uint8_t enable)
+{
+    c->writer_enable = enable;
+    if (!enable)
+        c->loopback_rd = c->loopback_wr;
+    pthread_cond_broadcast(&engine_cond);
+}
+
+/* Registers ------------------------------------------------------------------------------------*/
+
+static uint32_t reg_read(uint32_t addr)
+{
+    for (int i = 0; i < NCHANS; i++) {
+        struct chan *c = &chans[i];
+        int64_t hw;
+        switch (addr - c->config->base) {
+        case PCIE_DMA_WRITER_ENABLE_OFFSET: return c->writer_enable;
+        case PCIE_DMA_READER_ENABLE_OFFSET: return c->reader_enable;
+        case PCIE_DMA_LOOPBACK_ENABLE_OFFSET: return c->loopback;
+        case PCIE_DMA_WRITER_TABLE_LOOP_STATUS_OFFSET:
+        case PCIE_DMA_READER_TABLE_LOOP_STATUS_OFFSET:
+            hw = (addr - c->config->base == PCIE_DMA_WRITER_TABLE_LOOP_STATUS_OFFSET) ? c->writer_hw : c->reader_hw;
+            return (uint32_t)(((hw / DMA_BUFFER_COUNT) & 0xffff) << 16) | (hw % DMA_BUFFER_COUNT);
+        }
+    }
+#ifdef CSR_PCIE_MSI_ENABLE_ADDR
+    if (addr == CSR_PCIE_MSI_ENABLE_ADDR)
+        return msi_enable;
+#endif
+    addr -= CSR_BASE;
+    return (addr < MODEL_CSR_SIZE) ? regs[addr / 4] : 0;
+}
+
+static void reg_write(uint32_t addr, uint32_t val)
+{
+    for (int i = 0; i < NCHANS; i++) {
+        struct chan *c = &chans[i];
+        switch (addr - c->config->base) {
+        case PCIE_DMA_WRITER_ENABLE_OFFSET: engine_writer(c, val & 1); return;
+        case PCIE_DMA_READER_ENABLE_OFFSET: engine_reader(c, val & 1); return;
+        case PCIE_DMA_LOOPBACK_ENABLE_OFFSET: c->loopback = val & 1; return;
+        }
+    }
+#ifdef CSR_PCIE_MSI_ENABLE_ADDR
+    if (addr == CSR_PCIE_MSI_ENABLE_ADDR) {
+        msi_enable = val;
+        return;
+    }
+#endif
+    addr -= CSR_BASE;
+    if (addr < MODEL_CSR_SIZE)
+        regs[addr / 4] = val;
+}
+
+/* Init / Stats ---------------------------------------------------------------------------------*/
+
+static void resolve(void)
+{
+    real_open   = dlsym(RTLD_NEXT, "open");
+    real_close  = dlsym(RTLD_NEXT, "close");
+    real_read   = dlsym(RTLD_NEXT, "read");
+    real_write  = dlsym(RTLD_NEXT, "write");
+    real_ioctl  = dlsym(RTLD_NEXT, "ioctl");
+    real_poll   = dlsym(RTLD_NEXT, "poll");
+    real_mmap   = dlsym(RTLD_NEXT, "mmap");
+    real_munmap = dlsym(RTLD_NEXT, "munmap");
+}
+
+static void model_init(void)
+{
+    const char *identifier = getenv("LITEPCIE_MODEL_IDENTIFIER");
+    const char *env;
+
+    bandwidth = (env = getenv("LITEPCIE_MODEL_BANDWIDTH")) ? atof(env) : 16.0;
+    latency = (int64_t)(((env = getenv("LITEPCIE_MODEL_LATENCY")) ? atof(env) : 1.0) * 1000);
+    if (bandwidth <= 0)
+        bandwidth = 16.0;
+
+    regs = calloc(MODEL_CSR_SIZE / 4, sizeof(uint32_t));
+#ifdef CSR_CTRL_SCRATCH_ADDR
+    regs[(CSR_CTRL_SCRATCH_ADDR - CSR_BASE) / 4] = 0x12345678;
+#endif
+#ifdef CSR_IDENTIFIER_MEM_BASE
+    if (!identifier)
+        identifier = "LiteX SoC (LitePCIe endpoint model)";
+    for (size_t i = 0; i <= strlen(identifier) && i < 256; i++)
+        regs[(CSR_IDENTIFIER_MEM_BASE - CSR_BASE) / 4 + i] = (uint8_t)identifier[i];
+#else
+    (void)identifier;
+#endif
+    for (int i = 0; i < NCHANS; i++) {
+        chans[i].config = &chan_configs[i];
+        chans[i].reader_buf = real_mmap(NULL, DMA_BUFFER_TOTAL_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_ANONYMOUS, -1, 0);
+        chans[i].writer_buf = real_mmap(NULL, DMA_BUFFER_TOTAL_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_ANONYMOUS, -1, 0);
+    }
+    cond_init(&engine_cond);
+    cond_init(&sw_cond);
+    pthread_create(&engine_thread, NULL, engine, NULL);
+    initialized = 1;
+}
+
+static int compare(const void *a, const void *b)
+{
+    int64_t x = *(const int64_t *)a, y = *(const int64_t *)b;
+    return (x > y) - (x < y);
+}
+
+__attribute__((destructor)) static void model_stats(void)
+{
+    const char *filename = getenv("LITEPCIE_MODEL_STATS");
+    uint64_t n = nsamples < MODEL_MAX_SAMPLES ? nsamples : MODEL_MAX_SAMPLES;
+    double mean = 0;
+    FILE *f;
+
+    if (!initialized || !filename || !(f = fopen(filename, "w")))
+        return;
+    pthread_mutex_lock(&lock);
+    qsort(samples, n, sizeof(int64_t), compare);
+    for (uint64_t i = 0; i < n; i++)
+        mean += samples[i];
+    fprintf(f, "{\n    \"bandwidth\": %.3f,\n    \"latency\": %.3f,\n    \"channels\": [\n", bandwidth, latency / 1e3);
+    for (int i = 0; i < NCHANS; i++)
+        fprintf(f, "        {\"reader_buffers\": %lld, \"writer_buffers\": %lld, \"reader_msis\": %llu, \"writer_msis\": %llu, "
+            "\"reader_underruns\": %llu, \"writer_overruns\": %llu}%s\n",
+            (long long)chans[i].reader_hw, (long long)chans[i].writer_hw,
+            (unsigned long long)chans[i].reader_msis, (unsigned long long)chans[i].writer_msis,
+            (unsigned long long)chans[i].reader_underruns, (unsigned long long)chans[i].writer_overruns,
+            i < NCHANS - 1 ? "," : "");
+    fprintf(f, "    ],\n    \"loopback_latency\": {\"samples\": %llu", (unsigned long long)nsamples);
+    if (n)
+        fprintf(f, ", \"mean\": %.3f, \"p50\": %.3f, \"p99\": %.3f, \"max\": %.3f",
+            mean / n / 1e3, samples[n / 2] / 1e3, samples[n * 99 / 100] / 1e3, samples[n - 1] / 1e3);
+    fprintf(f, "}\n}\n");
+    fclose(f);
+    pthread_mutex_unlock(&lock);
+}
+
+/* Driver ---------------------------------------------------------------------------------------*/
+
+static struct file *get_file(int fd)
+{
+    return (fd >= 0 && fd < MODEL_MAX_FILES) ? files[fd] : NULL;
+}
+
+static int get_minor(const char *path)
+{
+    int minor;
+    char end;
+    if (!path || sscanf(path, "/dev/litepcie%d%c", &minor, &end) != 1)
+        return -1;
+    return (minor >= 0 && minor < NCHANS) ? minor : -1;
+}
+
+static int submitted(struct chan *c, int64_t sw_count)
+{
+    /* Software made reader buffers available (write or mmap update), return the underruns. */
+    int64_t now = now_ns();
+    int underruns = 0;
+    for (int64_t i = c->reader_sw_count; i < sw_count; i++) {
+        if (i < c->reader_hw_count)
+            underruns++;
+        else
+            c->reader_ts[i % DMA_BUFFER_COUNT] = now;
+    }
+    c->reader_underruns += underruns;
+    c->reader_sw_count = sw_count;
+    return underruns;
+}
+
+static int consumed(struct chan *c, int64_t sw_count)
+{
+    /* Software consumed writer buffers (read or mmap update): loopback latencies, return the
+     * overruns (as the driver: buffers more than DMA_BUFFER_COUNT/2 behind the hw count). */
+    int64_t now = now_ns();
+    int overruns = 0;
+    for (int64_t i = c->writer_sw_count; i < sw_count && i < c->writer_hw; i++) {
+        int64_t ts = c->writer_ts[i % DMA_BUFFER_COUNT];
+        if (c->writer_hw_count - i > DMA_BUFFER_COUNT / 2)
+            overruns++;
+        else if (ts > 0)
+            samples[nsamples++ % MODEL_MAX_SAMPLES] = now - ts;
+    }
+    c->writer_overruns += overruns;
+    c->writer_sw_count = sw_count;
+    return overruns;
+}
+
+static int model_open(int minor, int flags)
+{
+    struct chan *c;
+    struct file *f;
+    int fd;
+
+    pthread_mutex_lock(&lock);
+    if (!initialized)
+        model_init();
+    fd = eventfd(0, EFD_CLOEXEC);
+    if (fd < 0 || fd >= MODEL_MAX_FILES) {
+        pthread_mutex_unlock(&lock);
+        if (fd >= 0)
+            real_close(fd);
+        errno = EMFILE;
+        return -1;
+    }
+    c = &chans[minor];
+    f = calloc(1, sizeof(*f));
+    f->chan = c;
+    f->flags = flags;
+    files[fd] = f;
+    if (!c->reader_enable) {
+        c->reader_hw = c->reader_hw_count = c->reader_sw_count = 0;
+        c->loopback_rd = c->loopback_wr = 0;
+    }
+    if (!c->writer_enable)
+        c->writer_hw = c->writer_hw_count = c->writer_sw_count = 0;
+    pthread_mutex_unlock(&lock);
+    return fd;
+}
+
+static void model_release(struct file *f)
+{
+    struct chan *c = f->chan;
+    if (f->reader) {
+        msi_enable &= ~(1 << c->config->reader_vector);
+        engine_reader(c, 0);
+        c->reader_lock = 0;
+    }
+    if (f->writer) {
+        msi_enable &= ~(1 << c->config->writer_vector);
+        engine_writer(c, 0);
+        c->writer_lock = 0;
+    }
+}
+
+static int model_ioctl(struct file *f, unsigned long cmd, void *arg)
+{
+    struct chan *c = f->chan;
+
+    switch (cmd) {
+    case LITEPCIE_IOCTL_REG: {
+        struct litepcie_ioctl_reg *m = arg;
+        if (m->is_write)
+            reg_write(m->addr, m->val);
+        else
+            m->val = reg_read(m->addr);
+        return 0;
+    }
+    case LITEPCIE_IOCTL_DMA: {
+        struct litepcie_ioctl_dma *m = arg;
+        c->loopback = m->loopback_enable;
+        return 0;
+    }
+    case LITEPCIE_IOCTL_DMA_WRITER: {
+        struct litepcie_ioctl_dma_writer *m = arg;
+        if (m->enable != c->writer_enable) {
+            if (m->enable)
+                msi_enable |= 1 << c->config->writer_vector;
+            else
+                msi_enable &= ~(1 << c->config->writer_vector);
+            engine_writer(c, m->enable);
+        }
+        m->hw_count = c->writer_hw_count;
+        m->sw_count = c->writer_sw_count;
+        return 0;
+    }
+    case LITEPCIE_IOCTL_DMA_READER: {
+        struct litepcie_ioctl_dma_reader *m = arg;
+        if (m->enable != c->reader_enable) {
+            if (m->enable)
+                msi_enable |= 1 << c->config->reader_vector;
+            else
+                msi_enable &= ~(1 << c->config->reader_vector);
+            engine_reader(c, m->enable);
+        }
+        m->hw_count = c->reader_hw_count;
+        m->sw_count = c->reader_sw_count;
+        return 0;
+    }
+    case LITEPCIE_IOCTL_MMAP_DMA_INFO: {
+        struct litepcie_ioctl_mmap_dma_info *m = arg;
+        m->dma_tx_buf_offset = 0;
+        m->dma_tx_buf_size = DMA_BUFFER_SIZE;
+        m->dma_tx_buf_count = DMA_BUFFER_COUNT;
+        m->dma_rx_buf_offset = DMA_BUFFER_TOTAL_SIZE;
+        m->dma_rx_buf_size = DMA_BUFFER_SIZE;
+        m->dma_rx_buf_count = DMA_BUFFER_COUNT;
+        return 0;
+    }
+    case LITEPCIE_IOCTL_MMAP_DMA_WRITER_UPDATE:
+        consumed(c, ((struct litepcie_ioctl_mmap_dma_update *)arg)->sw_count);
+        return 0;
+    case LITEPCIE_IOCTL_MMAP_DMA_READER_UPDATE:
+        submitted(c, ((struct litepcie_ioctl_mmap_dma_update *)arg)->sw_count);
+        return 0;
+    case LITEPCIE_IOCTL_LOCK: {
+        struct litepcie_ioctl_lock *m = arg;
+        m->dma_reader_status = 1;
+        if (m->dma_reader_request) {
+            if (c->reader_lock)
+                m->dma_reader_status = 0;
+            else
+                c->reader_lock = f->reader = 1;
+        }
+        if (m->dma_reader_release)
+            c->reader_lock = f->reader = 0;
+        m->dma_writer_status = 1;
+        if (m->dma_writer_request) {
+            if (c->writer_lock)
+                m->dma_writer_status = 0;
+            else
+                c->writer_lock = f->writer = 1;
+        }
+        if (m->dma_writer_release)
+            c->writer_lock = f->writer = 0;
+        return 0;
+    }
+    }
+    errno = ENOTTY;
+    return -1;
+}
+
+static unsigned poll_mask(struct chan *c)
+{
+    unsigned mask = 0;
+    if (c->writer_hw_count - c->writer_sw_count > 2)
+        mask |= POLLIN | POLLRDNORM;
+    if (c->reader_sw_count - c->reader_hw_count < DMA_BUFFER_COUNT / 2)
+        mask |= POLLOUT | POLLWRNORM;
+    return mask;
+}
+
+/* Interposed functions -------------------------------------------------------------------------*/
+
+int open(const char *path, int flags, ...)
+{
+    mode_t mode = 0;
+    int minor = get_minor(path);
+    if (!real_open)
+        resolve();
+    if (flags & (O_CREAT | O_TMPFILE)) {
+        va_list ap;
+        va_start(ap, flags);
+        mode = va_arg(ap, mode_t);
+        va_end(ap);
+    }
+    if (minor >= 0)
+        return model_open(minor, flags);
+    return real_open(path, flags, mode);
+}
+
+int open64(const char *path, int flags, ...) __attribute__((alias("open")));
+
+int __open_2(const char *path, int flags)
+{
+    return open(path, flags);
+}
+
+int close(int fd)
+{
+    struct file *f = get_file(fd);
+    if (!real_close)
+        resolve();
+    if (f) {
+        pthread_mutex_lock(&lock);
+        model_release(f);
+        files[fd] = NULL;
+        pthread_mutex_unlock(&lock);
+        free(f);
+    }
+    return real_close(fd);
+}
+
+int ioctl(int fd, unsigned long cmd, ...)
+{
+    struct file *f = get_file(fd);
+    void *arg;
+    va_list ap;
+    int ret;
+
+    va_start(ap, cmd);
+    arg = va_arg(ap, void *);
+    va_end(ap);
+    if (!real_ioctl)
+        resolve();
+    if (!f)
+        return real_ioctl(fd, cmd, arg);
+    pthread_mutex_lock(&lock);
+    engine_update();
+    ret = model_ioctl(f, cmd, arg);
+    pthread_mutex_unlock(&lock);
+    return ret;
+}
+
+ssize_t read(int fd, void *data, size_t size)
+{
+    struct file *f = get_file(fd);
+    struct chan *c;
+    size_t len = size;
+    int i = 0, overflows = 0;
+
+    if (!real_read)
+        resolve();
+    if (!f)
+        return real_read(fd, data, size);
+    c = f->chan;
+    pthread_mutex_lock(&lock);
+    engine_update();
+    if (f->flags & O_NONBLOCK) {
+        if (c->writer_hw_count == c->writer_sw_count) {
+            pthread_mutex_unlock(&lock);
+            errno = EAGAIN;
+            return -1;
+        }
+    } else {
+        while (c->writer_hw_count - c->writer_sw_count <= 0) {
+            cond_wait_until(&sw_cond, -1);
+            engine_update();
+        }
+    }
+    while (len >= DMA_BUFFER_SIZE && c->writer_hw_count - c->writer_sw_count > 0) {
+        if (c->writer_hw_count - c->writer_sw_count <= DMA_BUFFER_COUNT / 2)
+            memcpy((char *)data + i * DMA_BUFFER_SIZE,
+                c->writer_buf + (c->writer_sw_count % DMA_BUFFER_COUNT) * DMA_BUFFER_SIZE, DMA_BUFFER_SIZE);
+        overflows += consumed(c, c->writer_sw_count + 1);
+        len -= DMA_BUFFER_SIZE;
+        i++;
+    }
+    pthread_mutex_unlock(&lock);
+    if (overflows)
+        fprintf(stderr, "litepcie model: reading too late, %d buffers lost\n", overflows);
+    return size - len;
+}
+
+ssize_t write(int fd, const void *data, size_t size)
+{
+    struct file *f = get_file(fd);
+    struct chan *c;
+    size_t len = size;
+    int i = 0, underflows = 0;
+
+    if (!real_write)
+        resolve();
+    if (!f)
+        return real_write(fd, data, size);
+    c = f->chan;
+    pthread_mutex_lock(&lock);
+    engine_update();
+    if (f->flags & O_NONBLOCK) {
+        if (c->reader_hw_count == c->reader_sw_count) {
+            pthread_mutex_unlock(&lock);
+            errno = EAGAIN;
+            return -1;
+        }
+    } else {
+        while (c->reader_sw_count - c->reader_hw_count >= DMA_BUFFER_COUNT / 2) {
+            cond_wait_until(&sw_cond, -1);
+            engine_update();
+        }
+    }
+    while (len >= DMA_BUFFER_SIZE && c->reader_sw_count - c->reader_hw_count < DMA_BUFFER_COUNT / 2) {
+        if (c->reader_sw_count - c->reader_hw_count >= 0)
+            memcpy(c->reader_buf + (c->reader_sw_count % DMA_BUFFER_COUNT) * DMA_BUFFER_SIZE,
+                (const char *)data + i * DMA_BUFFER_SIZE, DMA_BUFFER_SIZE);
+        underflows += submitted(c, c->reader_sw_count + 1);
+        len -= DMA_BUFFER_SIZE;
+        i++;
+    }
+    pthread_mutex_unlock(&lock);
+    if (underflows)
+        fprintf(stderr, "litepcie model: writing too late, %d buffers lost\n", underflows);
+    return size - len;
+}
+
+int poll(struct pollfd *fds, nfds_t nfds, int timeout)
+{
+    int64_t deadline = timeout < 0 ? -1 : now_ns() + (int64_t)timeout * 1000000;
+    int ours = 0, others = 0;
+    int n;
+
+    if (!real_poll)
+        resolve();
+    for (nfds_t i = 0; i < nfds; i++) {
+        if (get_file(fds[i].fd))
+            ours++;
+        else
+            others++;
+    }
+    if (!ours)
+        return real_poll(fds, nfds, timeout);
+
+    for (;;) {
+        n = 0;
+        pthread_mutex_lock(&lock);
+        engine_update();
+        for (nfds_t i = 0; i < nfds; i++) {
+            struct file *f = get_file(fds[i].fd);
+            if (f) {
+                fds[i].revents = poll_mask(f->chan) & (fds[i].events | POLLERR | POLLHUP);
+                n += fds[i].revents != 0;
+            }
+        }
+        if (n == 0 && (deadline < 0 || now_ns() < deadline) && !others) {
+            cond_wait_until(&sw_cond, deadline);
+            pthread_mutex_unlock(&lock);
+            continue;
+        }
+        pthread_mutex_unlock(&lock);
+        for (nfds_t i = 0; i < nfds; i++) {
+            if (!get_file(fds[i].fd)) {
+                int ret = real_poll(&fds[i], 1, 0);
+                if (ret < 0)
+                    return ret;
+                n += ret;
+            }
+        }
+        if (n || (deadline >= 0 && now_ns() >= deadline))
+            return n;
+        if (others)
+            usleep(100);
+    }
+}
+
+void *mmap(void *addr, size_t length, int prot, int flags, int fd, off_t offset)
+{
+    struct file *f = get_file(fd);
+    if (!real_mmap)
+        resolve();
+    if (!f)
+        return real_mmap(addr, length, prot, flags, fd, offset);
+    if (length != DMA_BUFFER_TOTAL_SIZE) {
+        errno = EINVAL;
+        return MAP_FAILED;
+    }
+    if (offset == 0)
+        return f->chan->reader_buf;
+    if (offset == DMA_BUFFER_TOTAL_SIZE)
+        return f->chan->writer_buf;
+    errno = EINVAL;
+    return MAP_FAILED;
+}
+
+void *mmap64(void *addr, size_t length, int prot, int flags, int fd, off_t offset) __attribute__((alias("mmap")));
+
+int munmap(void *addr, size_t length)
+{
+    if (!real_munmap)
+        resolve();
+    /* DMA buffers are kept for the other/next opens. */
+    for (int i = 0; i < NCHANS; i++)
+        if (addr == chans[i].reader_buf || addr == chans[i].writer_buf)
+            return 0;
+    return real_munmap(addr, length);
+}
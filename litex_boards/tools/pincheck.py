@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Pin Checker: load the IOs of all platforms (all IO variants/revisions: _io, _io_v7_0, _get_io()...,
+# module-level extensions and connector extension functions called on each compatible connector:
+# sdcard_pmod_io(pmoda), sdcard_pmod_io(pmodb)...) into a single pin table, with connector pins
+# resolved, and check:
+# - duplicate pins: same pin used twice in a resource (error), pins shared between resources
+#   (warning, often alternate functions or shared buses).
+# - IOStandards: same pin used with IOStandards of different voltages (error) and, when the device
+#   package pinout is available (Xilinx <package>pkg.txt files in --package-dir), banks mixing
+#   IOStandards of different voltages (error).
+# - extensions: extension pins colliding with the base IOs (warning) and connector pins that can't
+#   be resolved (error).
+#
+# python3 -m litex_boards.tools.pincheck                                   (all platforms, errors)
+# python3 -m litex_boards.tools.pincheck digilent_arty --warnings          (with warnings)
+# python3 -m litex_boards.tools.pincheck --package-dir=xilinx_packages     (with banks checks)
+
+import os
+import re
+import sys
+import time
+import inspect
+import argparse
+import importlib
+import itertools
+import collections
+
+from litex_boards import registry
+from litex_boards.tools import matrix
+
+# Parameters ---------------------------------------------------------------------------------------
+
+# Pins identifiers of unconnected pins.
+unconnected_pins = ["X", "x", "None", "NC", "-"]
+
+# Pin Table ----------------------------------------------------------------------------------------
+
+Pin = collections.namedtuple("Pin", "platform table extension resource number subsignal pin iostandard")
+
+def is_resource(value):
+    return isinstance(value, tuple) and len(value) >= 3 and isinstance(value[0], str) and isinstance(value[1], int)
+
+def is_io(value):
+    # IO lists with malformed entries (missing number...) are still loaded, see check_resources.
+    return isinstance(value, list) and any(is_resource(r) for r in value)
+
+def get_extension_calls(function, connector_names):
+    """Calls of a connector extension function (ex: sdcard_pmod_io(pmod)) on the compatible
+    connectors: connectors named after its parameters (pmod: pmoda, pmodb...; pmoda/pmodb: pmod*)."""
+    parameters = [p for p in inspect.signature(function).parameters.values()
+        if p.default is inspect.Parameter.empty and p.kind is p.POSITIONAL_OR_KEYWORD]
+    if not parameters:
+        return []
+    prefix = os.path.commonprefix([p.name for p in parameters]) if len(parameters) > 1 else parameters[0].name
+    compatible = [c for c in connector_names if prefix and c.lower().startswith(prefix.lower())]
+    return list(itertools.permutations(compatible, len(parameters)))
+
+def get_tables(module):
+    """Return base IO tables, extension IO tables and connectors tables of a platform module."""
+    ios, extensions, connectors = {}, {}, {}
+    functions = {}
+    for name, value in vars(module).items():
+        # IO generated by functions with default arguments (ex: _get_io(vccio="2.5V")).
+        if name.startswith("_get_io") and callable(value):
+            try:
+                value = value()
+            except TypeError:
+                continue
+        # Connector extensions (ex: raw_pmod_io(pmod)), called once the connectors are known.
+        elif name.endswith("_io") and inspect.isfunction(value) and value.__module__ == module.__name__:
+            functions[name] = value
+            continue
+        if is_io(value):
+            (ios if name.startswith(("_io", "_get_io")) else extensions)[name] = value
+        elif name.startswith("_connectors") and isinstance(value, list):
+            connectors[name] = value
+    connector_names = list(dict.fromkeys(c[0] for table in connectors.values() for c in table))
+    for name, function in functions.items():
+        for args in get_extension_calls(function, connector_names):
+            try:
+                value = function(*args)
+            except Exception:
+                continue
+            if is_io(value):
+                extensions[f"{name}({', '.join(args)})"] = value
+    return ios, extensions, connectors
+
+def merge_connectors(*tables):
+    # Later connectors override earlier ones with the same name.
+    merged = {}
+    for table in tables:
+        for connector in table:
+            merged[connector[0]] = connector
+    return list(merged.values())
+
+def get_connectors(table, connectors):
+    # Connectors of an IO variant: _connectors + _connectors_v7_0 for _io_v7_0.
+    suffix = table[len("_io"):] if table.startswith("_io") else ""
+    tables = [connectors[name] for name in ["_connectors", f"_connectors{suffix}"] if name in connectors]
+    if not tables:
+        tables = list(connectors.values())[:1]
+    return merge_connectors(*tables)
+
+def get_voltage(iostandard):
+    """IO voltage of an IOStandard (ex: LVCMOS33: 3.3, SSTL135: 1.35, "2.5 V": 2.5), None if unknown."""
+    if iostandard is None:
+        return None
+    m = re.search(r"(\d)\.(\d+)\s*-?\s*V", iostandard)
+    if m is None:
+        m = re.search(r"(\d)(\d{1,2})(?!\d)", iostandard)
+    return None if m is None else float(f"{m.group(1)}.{m.group(2)}")
+
+def flatten(resource):
+    """(subsignal, identifiers, iostandard) of a resource."""
+    from litex.build.generic_platform import Pins, IOStandard, Subsignal
+    def get(constraints, cls, attr):
+        for c in constraints:
+            if isinstance(c, cls):
+                return getattr(c, attr)
+        return None
+    constraints = resource[2:]
+    subsignals  = [c for c in constraints if isinstance(c, Subsignal)]
+    iostandard  = get(constraints, IOStandard, "name")
+    if not subsignals:
+        yield None, get(constraints, Pins, "identifiers") or [], iostandard
+    for s in subsignals:
+        yield s.name, get(s.constraints, Pins, "identifiers") or [], get(s.constraints, IOStandard, "name") or iostandard
+
+def get_pins(platform, table, io, connectors, extension=None):
+    """Return the Pins of an IO table and its unresolved connector pins."""
+    from litex.build.generic_platform import ConnectorManager
+    connector_manager = ConnectorManager(connectors)
+    pins, unresolved  = [], []
+    for resource in filter(is_resource, io):
+        for subsignal, identifiers, iostandard in flatten(resource):
+            for identifier in identifiers:
+                if identifier in unconnected_pins:
+                    continue
+                try:
+                    pin = connector_manager.resolve_identifiers([identifier])[0]
+                except (AssertionError, ValueError, KeyError, TypeError, IndexError):
+                    unresolved.append((resource[0], resource[1], subsignal, identifier))
+                    continue
+                # Unconnected connector pins (ex: "pmodh:0" on "- E19 B3...").
+                if pin in unconnected_pins:
+                    continue
+                pins.append(Pin(platform, table, extension, resource[0], resource[1], subsignal, pin, iostandard))
+    return pins, unresolved
+
+# Checks -------------------------------------------------------------------------------------------
+
+def describe(p):
+    return f"{p.resource}:{p.number}" + ("" if p.subsignal is None else f":{p.subsignal}")
+
+def check_resources(io):
+    """Malformed entries of an IO table (ignored by the checks)."""
+    return [("error", "malformed-resource", repr(r)[:80]) for r in io if not is_resource(r)]
+
+def check_pins(pins):
+    """Duplicate pins and IOStandard conflicts of the pins of an IO table."""
+    issues = []
+    by_pin = collections.defaultdict(list)
+    for p in pins:
+        by_pin[p.pin].append(p)
+    for pin, entries in sorted(by_pin.items()):
+        if len(entries) > 1:
+            resources = [(e.resource, e.number) for e in entries]
+            users     = ", ".join(describe(e) for e in entries)
+            if len(set(resources)) < len(resources):
+                issues.append(("error", "duplicate-pin", f"{pin} used by {users}"))
+            else:
+                issues.append(("warning", "shared-pin", f"{pin} shared by {users}"))
+            voltages = {get_voltage(e.iostandard) for e in entries} - {None}
+            if len(voltages) > 1:
+                standards = ", ".join(f"{describe(e)}={e.iostandard}" for e in entries)
+                issues.append(("error", "iostandard-conflict", f"{pin}: {standards}"))
+    return issues
+
+def check_banks(pins, banks):
+    """IOStandards of different voltages within a bank ({pin: bank} from the package pinout)."""
+    issues   = []
+    by_bank  = collections.defaultdict(lambda: collections.defaultdict(list))
+    for p in pins:
+        voltage = get_voltage(p.iostandard)
+        if p.pin in banks and voltage is not None:
+            by_bank[banks[p.pin]][voltage].append(p)
+    for bank, voltages in sorted(by_bank.items()):
+        if len(voltages) > 1:
+            details = "; ".join("{}V: {}".format(v, ", ".join(describe(p) for p in ps[:4]) + (", ..." if len(ps) > 4 else ""))
+                for v, ps in sorted(voltages.items()))
+            issues.append(("error", "bank-iostandard", f"bank {bank} mixes {details}"))
+    return issues
+
+def check_extension(pins, base_pins):
+    """Extension pins colliding with base IO pins."""
+    issues = []
+    base   = {}
+    for p in base_pins:
+        base.setdefault(p.pin, p)
+    for p in pins:
+        if p.pin in base:
+            issues.append(("warning", "extension-collision", f"{p.pin} of {describe(p)} used by base {describe(base[p.pin])}"))
+    return issues
+
+# Packages -----------------------------------------------------------------------------------------
+
+def load_xilinx_package(package_dir, device):
+    """{pin: bank} from the Xilinx package pinout file (<device><package>pkg.txt) of device."""
+    if package_dir is None or not os.path.isdir(package_dir):
+        return {}
+    base = device.lower().split("-")[0]
+    def matches(stem):
+        # Package files omit the temperature grade (ex: xc7a35ticsg324 -> xc7a35tcsg324pkg.txt).
+        it = iter(base)
+        return all(c in it for c in stem) and len(base) - len(stem) <= 1
+    for filename in sorted(os.listdir(package_dir)):
+        stem = filename.lower()[:-len("pkg.txt")]
+        if filename.lower().endswith("pkg.txt") and matches(stem):
+            banks = {}
+            with open(os.path.join(package_dir, filename), errors="replace") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 4 and fields[3].isdigit():
+                        banks[fields[0]] = fields[3]
+            return banks
+    return {}
+
+# Analyze ------------------------------------------------------------------------------------------
+
+def analyze_platform(name, package_dir=None):
+    """Return (pins, issues) of a platform, issues: [(severity, kind, table, message)]."""
+    module = importlib.import_module(f"litex_boards.platforms.{name}")
+    ios, extensions, connectors = get_tables(module)
+    # Device set on the Platform instances (default variant): from the registry index.
+    device = registry.load_index()["boards"].get(name, {}).get("device", None) or ""
+    banks  = load_xilinx_package(package_dir, device) if device.startswith("xc") else {}
+    pins, issues = [], []
+    def add(table, found):
+        issues.extend((severity, kind, table, message) for severity, kind, message in found)
+    for table, io in ios.items():
+        table_connectors = get_connectors(table, connectors)
+        base_pins, unresolved = get_pins(name, table, io, table_connectors)
+        pins += base_pins
+        add(table, check_resources(io))
+        add(table, check_pins(base_pins))
+        add(table, check_banks(base_pins, banks))
+        add(table, [("error", "unresolved-pin", f"{identifier} of {resource}:{number}") for resource, number, _, identifier in unresolved])
+        # Extensions may use the connectors of any variant.
+        for extension, ext_io in extensions.items():
+            ext_connectors       = merge_connectors(table_connectors, *connectors.values())
+            ext_pins, unresolved = get_pins(name, table, ext_io, ext_connectors, extension)
+            pins += ext_pins
+            add(f"{table}+{extension}", check_resources(ext_io) + check_pins(ext_pins) + check_extension(ext_pins, base_pins))
+            # Connector extension functions may not fit all the connectors of their kind (ex: 6-pin PMOD).
+            severity = "warning" if extension.endswith(")") else "error"
+            add(f"{table}+{extension}", [(severity, "unresolved-pin", f"{identifier} of {resource}:{number}") for resource, number, _, identifier in unresolved])
+    return pins, issues
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards static pin conflicts/IOStandards checker.")
+    parser.add_argument("platforms",     nargs="*",           help="Platforms to check (default: all).")
+    parser.add_argument("--warnings",    action="store_true", help="Also report warnings (shared pins, extension collisions).")
+    parser.add_argument("--package-dir", default=None,        help="Directory with Xilinx package pinout files (<device>pkg.txt) for banks checks.")
+    parser.add_argument("--json",        default=None,        help="Write issues to JSON file.")
+    args = parser.parse_args()
+
+    start     = time.time()
+    platforms = args.platforms or matrix.collect_platforms(excluded=[])
+    npins     = 0
+    report    = {}
+    for name in platforms:
+        try:
+            pins, issues = analyze_platform(name, args.package_dir)
+        except Exception as e:
+            pins, issues = [], [("error", "load", "-", repr(e))]
+        npins += len(pins)
+        report[name] = [{"severity": s, "kind": k, "table": t, "message": m} for s, k, t, m in issues]
+        for severity, kind, table, message in issues:
+            if severity == "error" or args.warnings:
+                print(f"{name}:{table}: {severity}: {kind}: {message}")
+
+    issues   = [i for issues in report.values() for i in issues]
+    errors   = len([i for i in issues if i["severity"] == "error"])
+    warnings = len(issues) - errors
+    print(f"{len(platforms)} platforms, {npins} pins checked in {time.time() - start:.1f}s: {errors} errors, {warnings} warnings.")
+    if args.json is not None:
+        matrix.write_summary(report, args.json)
+    sys.exit(0 if errors == 0 else 1)
+
+if __name__ == "__main__":
+    main()
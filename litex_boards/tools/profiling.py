@@ -0,0 +1,165 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build Profiling: record wall time, CPU time and peak RSS of each phase of a target build and write
+# them as JSON (+ optional cProfile dump of the Python phases) into the build directory.
+#
+# Phases:
+# - elaboration : Imports, arguments parsing and SoC construction (BaseSoC.__init__).
+# - finalize    : SoC finalization.
+# - software    : BIOS/Software compilation.
+# - verilog     : Verilog/Constraints emission.
+# - toolchain   : Vendor toolchain run (Vivado, Yosys/Nextpnr, Quartus, Gowin...).
+#
+# Enabled for any target through the runner (the target arguments are parsed by LiteX):
+#
+# python3 -m litex_boards.tools.run --profile-build digilent_arty --build
+
+import os
+import json
+import time
+import cProfile
+import resource
+import contextlib
+
+from litex_boards.tools.hooks import patch, toolchain_run_hook
+
+# Parameters ---------------------------------------------------------------------------------------
+
+profile_filename  = "profile.json"
+cprofile_filename = "profile.prof"
+cprofile_phases   = ["elaboration", "finalize", "verilog"]
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _measure():
+    times    = os.times()
+    self     = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "wall"              : time.perf_counter(),
+        "cpu"               : times.user + times.system,
+        "cpu_children"      : times.children_user + times.children_system,
+        # ru_maxrss is in KiB on Linux (peak of the process/of the largest child so far).
+        "rss_peak"          : self.ru_maxrss/1024,
+        "rss_peak_children" : children.ru_maxrss/1024,
+    }
+
+# Build Profiler -----------------------------------------------------------------------------------
+
+class BuildProfiler:
+    """Per-phase wall/CPU time and peak RSS of a target build."""
+    def __init__(self, with_cprofile=False):
+        self.phases     = {}
+        self.current    = None
+        self.start_meas = None
+        self.output_dir = None
+        self.cprofile   = cProfile.Profile() if with_cprofile else None
+
+    def start(self, name):
+        self.current    = name
+        self.start_meas = _measure()
+        if (self.cprofile is not None) and (name in cprofile_phases):
+            self.cprofile.enable()
+
+    def stop(self):
+        if self.current is None:
+            return
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        end   = _measure()
+        phase = self.phases.setdefault(self.current, {
+            "wall"                 : 0.0,
+            "cpu"                  : 0.0,
+            "rss_peak_mb"          : 0.0,
+            "rss_peak_children_mb" : 0.0,
+        })
+        phase["wall"] += end["wall"] - self.start_meas["wall"]
+        phase["cpu"]  += (end["cpu"] - self.start_meas["cpu"]) + (end["cpu_children"] - self.start_meas["cpu_children"])
+        phase["rss_peak_mb"]          = max(phase["rss_peak_mb"],          end["rss_peak"])
+        phase["rss_peak_children_mb"] = max(phase["rss_peak_children_mb"], end["rss_peak_children"])
+        self.current = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        # Phases do not nest (ex: finalize called again from get_verilog): keep the outer one.
+        if self.current not in [None, "elaboration"]:
+            yield
+            return
+        self.stop()
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def phase_wrapper(self, name):
+        def wrapper(method):
+            def _method(*args, **kwargs):
+                with self.phase(name):
+                    return method(*args, **kwargs)
+            return _method
+        return wrapper
+
+    def get_report(self):
+        phases = {}
+        for name in ["elaboration", "finalize", "software", "verilog", "toolchain"]:
+            if name in self.phases:
+                phases[name] = {k: round(v, 3) for k, v in self.phases[name].items()}
+        def total(key, reduce):
+            return round(reduce([p[key] for p in self.phases.values()] + [0]), 3)
+        return {
+            "phases" : phases,
+            "total"  : {
+                "wall"                 : total("wall",                 sum),
+                "cpu"                  : total("cpu",                  sum),
+                "rss_peak_mb"          : total("rss_peak_mb",          max),
+                "rss_peak_children_mb" : total("rss_peak_children_mb", max),
+            },
+        }
+
+    def write(self):
+        output_dir = self.output_dir or os.getcwd()
+        os.makedirs(output_dir, exist_ok=True)
+        filename = os.path.join(output_dir, profile_filename)
+        with open(filename, "w") as f:
+            json.dump(self.get_report(), f, indent=4)
+        print(f"Build profile written to {filename}.")
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(os.path.join(output_dir, cprofile_filename))
+        return filename
+
+# Hook ---------------------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def profile_hook(with_cprofile=False):
+    from litex.soc.integration.soc import SoC
+    from litex.soc.integration.builder import Builder
+    from litex.build.generic_platform import GenericPlatform
+
+    profiler = BuildProfiler(with_cprofile=with_cprofile)
+
+    # Elaboration ends when the Builder is started; capture the build directory.
+    def builder_wrapper(build):
+        def _build(self, *args, **kwargs):
+            profiler.stop()
+            profiler.output_dir = os.path.abspath(self.output_dir)
+            return build(self, *args, **kwargs)
+        return _build
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch(Builder,         "build",                  builder_wrapper))
+        stack.enter_context(patch(SoC,             "finalize",               profiler.phase_wrapper("finalize")))
+        stack.enter_context(patch(Builder,         "_generate_rom_software", profiler.phase_wrapper("software")))
+        stack.enter_context(patch(GenericPlatform, "get_verilog",            profiler.phase_wrapper("verilog")))
+        stack.enter_context(toolchain_run_hook(
+            lambda toolchain, run_script, script: profiler.phase_wrapper("toolchain")(run_script)(script)))
+        profiler.start("elaboration")
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            profiler.write()
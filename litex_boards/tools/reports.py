@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build Reports: parse the timing/utilization reports of the vendor toolchains (Vivado, Nextpnr,
+# Quartus, Gowin, Efinity) into a normalized record (setup/hold slack and Fmax per clock, LUT/FF/
+# BRAM/DSP usage, build time) written as report.json in the gateware directory and accumulated in a
+# SQLite database to compare boards, features and LiteX versions.
+#
+# python3 -m litex_boards.tools.run --report-db=reports.db digilent_arty --build     (build + record)
+# python3 -m litex_boards.tools.reports --db=reports.db --add build/digilent_arty  (record a build)
+# python3 -m litex_boards.tools.reports --db=reports.db --list                     (list records)
+# python3 -m litex_boards.tools.reports --db=reports.db --sql="SELECT target, lut FROM builds"
+
+import os
+import re
+import sys
+import json
+import glob
+import time
+import sqlite3
+import argparse
+import subprocess
+import contextlib
+
+# Parameters ---------------------------------------------------------------------------------------
+
+report_filename    = "report.json"
+toolchain_log_name = "toolchain.log"
+
+# Record -------------------------------------------------------------------------------------------
+
+def new_record(toolchain):
+    return {
+        "toolchain"   : toolchain,
+        "clocks"      : {}, # {name: {"setup_slack", "hold_slack", "fmax", "target"}} (ns/Hz).
+        "utilization" : {}, # {lut/ff/bram/dsp: {"used", "available"}}.
+        "resources"   : {}, # Raw toolchain resources: {name: {"used", "available"}}.
+    }
+
+def add_clock(record, name, setup_slack=None, hold_slack=None, fmax=None, target=None):
+    clock = record["clocks"].setdefault(name, {"setup_slack": None, "hold_slack": None, "fmax": None, "target": None})
+    # Keep worst values over corners/reports.
+    for key, value, worst in [("setup_slack", setup_slack, min), ("hold_slack", hold_slack, min), ("fmax", fmax, min)]:
+        if value is not None:
+            clock[key] = value if clock[key] is None else worst(clock[key], value)
+    if target is not None:
+        clock["target"] = target
+    # Derive Fmax from setup slack when not reported.
+    if clock["fmax"] is None and clock["target"] and clock["setup_slack"] is not None:
+        period = 1e9/clock["target"] - clock["setup_slack"]
+        clock["fmax"] = 1e9/period if period > 0 else None
+
+def add_resource(record, name, used, available=None, kinds={}):
+    record["resources"][name] = {"used": used, "available": available}
+    kind = kinds.get(name, None)
+    if kind is not None:
+        utilization = record["utilization"].setdefault(kind, {"used": 0, "available": 0})
+        utilization["used"]      += used
+        utilization["available"] += available or 0
+
+def _number(s):
+    return float(s.replace(",", ""))
+
+def _read(filename):
+    with open(filename, errors="replace") as f:
+        return f.read()
+
+# Vivado -------------------------------------------------------------------------------------------
+
+vivado_resources = {
+    "Slice LUTs"      : "lut",
+    "CLB LUTs"        : "lut",
+    "Slice Registers" : "ff",
+    "CLB Registers"   : "ff",
+    "Block RAM Tile"  : "bram",
+    "DSPs"            : "dsp",
+}
+
+def _vivado_table(report, title):
+    # Lines of a "| Title" section up to the next section.
+    m = re.search(r"\|\s*" + re.escape(title) + r"\s*\n(.*?)(?:\n-{20,}\n\|)", report, re.S)
+    return m.group(1).splitlines() if m else []
+
+def parse_vivado(build_dir, build_name):
+    timing_rpt = os.path.join(build_dir, f"{build_name}_timing.rpt")
+    if not os.path.exists(timing_rpt):
+        return None
+    record = new_record("vivado")
+    report = _read(timing_rpt)
+
+    # Clock periods.
+    for line in _vivado_table(report, "Clock Summary"):
+        m = re.match(r"\s*(\S+)\s+\{[^}]*\}\s+([0-9.]+)\s+([0-9.]+)", line)
+        if m:
+            add_clock(record, m.group(1), target=_number(m.group(3))*1e6)
+    # Intra clock WNS/WHS.
+    for line in _vivado_table(report, "Intra Clock Table"):
+        fields = line.split()
+        if len(fields) >= 6 and re.match(r"-?[0-9.]+$", fields[1]) and re.match(r"-?[0-9.]+$", fields[5]):
+            add_clock(record, fields[0], setup_slack=_number(fields[1]), hold_slack=_number(fields[5]))
+
+    # Utilization.
+    for utilization_rpt in [f"{build_name}_utilization_place.rpt", f"{build_name}_utilization.rpt"]:
+        utilization_rpt = os.path.join(build_dir, utilization_rpt)
+        if os.path.exists(utilization_rpt):
+            header = None
+            for line in _read(utilization_rpt).splitlines():
+                cells = [c.strip() for c in line.strip().strip("|").split("|")]
+                if "Site Type" in cells:
+                    header = cells
+                    continue
+                if header is None or len(cells) != len(header):
+                    continue
+                name = cells[0].rstrip("*").strip()
+                try:
+                    used      = _number(cells[header.index("Used")])
+                    available = _number(cells[header.index("Available")])
+                except ValueError:
+                    continue
+                if name not in record["resources"]:
+                    add_resource(record, name, used, available, vivado_resources)
+            break
+    return record
+
+# Nextpnr ------------------------------------------------------------------------------------------
+
+nextpnr_resources = {
+    # ECP5.
+    "TRELLIS_COMB" : "lut",  "TRELLIS_FF"    : "ff",  "DP16KD"     : "bram", "MULT18X18D" : "dsp",
+    # iCE40.
+    "ICESTORM_LC"  : "lut",  "ICESTORM_RAM"  : "bram", "ICESTORM_DSP" : "dsp",
+    # Nexus.
+    "OXIDE_COMB"   : "lut",  "OXIDE_FF"      : "ff",  "OXIDE_EBR"  : "bram", "MULT18_CORE" : "dsp",
+    # Gowin (Apicula).
+    "LUT4"         : "lut",  "DFF"           : "ff",  "BSRAM"      : "bram", "MULTALU18X18" : "dsp",
+}
+
+def parse_nextpnr_log(log):
+    from litex_boards.tools.fmax import parse_nextpnr_timing
+    if "nextpnr" not in log and "Max frequency for clock" not in log:
+        return None
+    record = new_record("nextpnr")
+    for name, clock in parse_nextpnr_timing(log).items():
+        slack = 1e9/clock["target"] - 1e9/clock["fmax"] if clock["fmax"] > 0 else None
+        add_clock(record, name, setup_slack=slack, fmax=clock["fmax"], target=clock["target"])
+    # Utilisation (last report: after routing).
+    utilisation = log.rsplit("Device utilisation:", 1)
+    if len(utilisation) == 2:
+        for name, used, available in re.findall(r"^Info:\s+(\S+):\s+(\d+)\s*/\s*(\d+)", utilisation[1], re.M):
+            if name not in record["resources"]:
+                add_resource(record, name, int(used), int(available), nextpnr_resources)
+    return record
+
+def parse_nextpnr(build_dir, build_name):
+    for log in [toolchain_log_name, "nextpnr.log"]:
+        log = os.path.join(build_dir, log)
+        if os.path.exists(log):
+            record = parse_nextpnr_log(_read(log))
+            if record is not None and (record["clocks"] or record["resources"]):
+                return record
+    return None
+
+# Quartus ------------------------------------------------------------------------------------------
+
+quartus_resources = {
+    "Total logic elements"               : "lut",
+    "Logic utilization (in ALMs)"        : "lut",
+    "Total registers"                    : "ff",
+    "Total RAM Blocks"                   : "bram",
+    "Total block memory bits"            : "bram_bits",
+    "Total memory bits"                  : "bram_bits",
+    "Total DSP Blocks"                   : "dsp",
+    "Embedded Multiplier 9-bit elements" : "dsp",
+}
+
+def parse_quartus(build_dir, build_name):
+    sta_rpt = os.path.join(build_dir, f"{build_name}.sta.rpt")
+    if not os.path.exists(sta_rpt):
+        return None
+    record = new_record("quartus")
+    report = _read(sta_rpt)
+    # Setup/Hold summaries (all corners): ; Clock ; Slack ; End Point TNS ;
+    for kind, section in re.findall(r"^; (?:[^;\n]*Model )?(Setup|Hold) Summary\s*;\n(.*?)\n\n", report, re.S | re.M):
+        for clock, slack in re.findall(r"^; (\S+)\s*; (-?[0-9.]+)\s*;", section, re.M):
+            add_clock(record, clock, **{f"{kind.lower()}_slack": _number(slack)})
+    # Fmax summaries: ; Fmax ; Restricted Fmax ; Clock Name ; Note ;
+    for fmax, restricted, clock in re.findall(r"^; ([0-9.]+) MHz\s*; ([0-9.]+) MHz\s*; (\S+)\s*;", report, re.M):
+        add_clock(record, clock, fmax=_number(restricted)*1e6)
+    # Utilization: Name : used / available ( x % ).
+    fit_summary = os.path.join(build_dir, f"{build_name}.fit.summary")
+    if os.path.exists(fit_summary):
+        for name, used, available in re.findall(r"^(.+?)\s*:\s*([0-9,]+)(?:\s*/\s*([0-9,]+))?", _read(fit_summary), re.M):
+            if not (available or name.strip() in quartus_resources):
+                continue # Not a resource (ex: Version).
+            add_resource(record, name.strip(), _number(used), _number(available) if available else None, quartus_resources)
+    return record
+
+# Gowin --------------------------------------------------------------------------------------------
+
+gowin_resources = {
+    "Logic"    : "lut",
+    "Register" : "ff",
+    "BSRAM"    : "bram",
+    "DSP"      : "dsp",
+}
+
+def parse_gowin(build_dir, build_name):
+    pnr_dir = os.path.join(build_dir, "impl", "pnr")
+    if not os.path.isdir(pnr_dir):
+        return None
+    record = new_record("gowin")
+    # Timing: Max Frequency Summary: <n> <clock> <constraint>(MHz) <actual>(MHz) ...
+    for tr in glob.glob(os.path.join(pnr_dir, "*.tr")):
+        for clock, target, fmax in re.findall(r"^\s*\d+\s+(\S+)\s+([0-9.]+)\(MHz\)\s+([0-9.]+)\(MHz\)", _read(tr), re.M):
+            add_clock(record, clock, fmax=_number(fmax)*1e6, target=_number(target)*1e6,
+                setup_slack=1e3/_number(target) - 1e3/_number(fmax))
+    # Utilization: | Name | used/available | x% |
+    rpt = os.path.join(pnr_dir, f"{build_name}.rpt.txt")
+    if os.path.exists(rpt):
+        for name, used, available in re.findall(r"^\s*\|?\s*([A-Za-z][\w ]*?)\s*\|\s*([0-9,]+)\s*/\s*([0-9,]+)", _read(rpt), re.M):
+            if name not in record["resources"]:
+                add_resource(record, name, _number(used), _number(available), gowin_resources)
+    return record
+
+# Efinity ------------------------------------------------------------------------------------------
+
+efinity_resources = {
+    "EFX_LUT4"   : "lut",
+    "EFX_FF"     : "ff",
+    "EFX_RAM_5K" : "bram",
+    "EFX_RAM10"  : "bram",
+    "EFX_MULT"   : "dsp",
+    "EFX_DSP48"  : "dsp",
+}
+
+# Placement "Resource Summary" (used / available).
+efinity_place_resources = {
+    "LE: LUTs/Adders" : "lut",
+    "LE: Registers"   : "ff",
+    "Memory Blocks"   : "bram",
+    "Multipliers"     : "dsp",
+    "DSP Blocks"      : "dsp",
+}
+
+def parse_efinity(build_dir, build_name):
+    timing_rpt = os.path.join(build_dir, "outflow", f"{build_name}.timing.rpt")
+    if not os.path.exists(timing_rpt):
+        return None
+    record = new_record("efinity")
+    report = _read(timing_rpt)
+    # Clock Name / Period (ns) / Frequency (MHz) of "Maximum possible analyzed clocks frequency".
+    section = report.split("Maximum possible analyzed clocks frequency", 1)
+    if len(section) == 2:
+        for clock, period, fmax in re.findall(r"^\s*(\S+)\s+([0-9.]+)\s+([0-9.]+)\s+\(", section[1].split("\n\n\n")[0], re.M):
+            add_clock(record, clock, fmax=_number(fmax)*1e6)
+    # Clock Name / Slack of "Geomean"-less setup/hold tables: "Setup (Max) Clock Relationship".
+    for kind, section in re.findall(r"(Setup|Hold) \(M..\) Clock Relationship\s*\n(.*?)\n\n", report, re.S):
+        for launch, capture, constraint, slack in re.findall(r"^\s*(\S+)\s+(\S+)\s+([0-9.]+)\s+(-?[0-9.]+)", section, re.M):
+            if launch == capture:
+                # Target from the setup constraint (hold constraints are 0).
+                target = 1e9/_number(constraint) if kind == "Setup" and _number(constraint) > 0 else None
+                add_clock(record, launch, target=target, **{f"{kind.lower()}_slack": _number(slack)})
+    # Utilization: placement resource summary (used / available), else mapped primitives.
+    place_rpt = os.path.join(build_dir, "outflow", f"{build_name}.place.rpt")
+    map_rpt   = os.path.join(build_dir, "outflow", f"{build_name}.map.rpt")
+    if os.path.exists(place_rpt):
+        section = _read(place_rpt).split("Resource Summary (begin)", 1)[-1].split("Resource Summary (end)", 1)[0]
+        for name, used, available in re.findall(r"^\s*([A-Za-z][\w :/]*?)\s*:\s*([0-9,]+)\s*/\s*([0-9,]+)", section, re.M):
+            add_resource(record, name, _number(used), _number(available), efinity_place_resources)
+    kinds = efinity_resources if not record["utilization"] else {}
+    if os.path.exists(map_rpt):
+        for name, used, available in re.findall(r"^\s*(EFX_\w+)\s*:\s*([0-9,]+)(?:\s*/\s*([0-9,]+))?", _read(map_rpt), re.M):
+            if name not in record["resources"]:
+                add_resource(record, name, _number(used), _number(available) if available else None, kinds)
+    return record
+
+# Parse --------------------------------------------------------------------------------------------
+
+parsers = [parse_vivado, parse_quartus, parse_gowin, parse_efinity, parse_nextpnr]
+
+def get_build_name(build_dir):
+    # Build name from the build script (build_<build_name>.sh/.tcl/.bat).
+    for filename in sorted(os.listdir(build_dir)):
+        m = re.match(r"build_(.+)\.(sh|bat|tcl)$", filename)
+        if m:
+            return m.group(1)
+    return None
+
+def parse_reports(build_dir, build_name=None):
+    """Parse reports of a gateware directory into a normalized record (None when no reports)."""
+    build_name = build_name or get_build_name(build_dir)
+    if build_name is None:
+        return None
+    for parser in parsers:
+        record = parser(build_dir, build_name)
+        if record is not None:
+            break
+    else:
+        return None
+    clocks = record["clocks"].values()
+    setup  = [c["setup_slack"] for c in clocks if c["setup_slack"] is not None]
+    hold   = [c["hold_slack"]  for c in clocks if c["hold_slack"]  is not None]
+    fmax   = [c["fmax"]        for c in clocks if c["fmax"]        is not None]
+    record.update({
+        "build_name"        : build_name,
+        "worst_setup_slack" : min(setup) if setup else None,
+        "worst_hold_slack"  : min(hold)  if hold  else None,
+        "fmax"              : min(fmax)  if fmax  else None,
+    })
+    return record
+
+# Database -----------------------------------------------------------------------------------------
+
+columns = [
+    ("timestamp",         "REAL"),
+    ("target",            "TEXT"),
+    ("args",              "TEXT"),
+    ("toolchain",         "TEXT"),
+    ("litex",             "TEXT"),
+    ("build_time",        "REAL"),
+    ("worst_setup_slack", "REAL"),
+    ("worst_hold_slack",  "REAL"),
+    ("fmax",              "REAL"),
+    ("lut",               "REAL"),
+    ("ff",                "REAL"),
+    ("bram",              "REAL"),
+    ("dsp",               "REAL"),
+    ("record",            "TEXT"),
+]
+
+def open_db(filename):
+    db = sqlite3.connect(filename, timeout=60)
+    db.execute("CREATE TABLE IF NOT EXISTS builds (id INTEGER PRIMARY KEY, {})".format(
+        ", ".join(f"{name} {kind}" for name, kind in columns)))
+    db.execute("CREATE TABLE IF NOT EXISTS clocks (build INTEGER, clock TEXT, setup_slack REAL, hold_slack REAL, fmax REAL, target REAL)")
+    return db
+
+def insert_record(db, record):
+    row = dict(record, record=json.dumps(record))
+    for kind in ["lut", "ff", "bram", "dsp"]:
+        row[kind] = record["utilization"].get(kind, {}).get("used", None)
+    row["litex"] = record.get("versions", {}).get("litex", None)
+    with db:
+        cursor = db.execute("INSERT INTO builds ({}) VALUES ({})".format(
+            ", ".join(name for name, _ in columns), ", ".join("?" for _ in columns)),
+            [row.get(name, None) for name, _ in columns])
+        db.executemany("INSERT INTO clocks VALUES (?, ?, ?, ?, ?, ?)", [
+            (cursor.lastrowid, name, c["setup_slack"], c["hold_slack"], c["fmax"], c["target"])
+            for name, c in record["clocks"].items()])
+    return cursor.lastrowid
+
+def add_build(db_filename, build_dir, target=None, args=[], build_time=None):
+    """Parse reports of a gateware directory, write report.json and record it in the database."""
+    from litex_boards.tools.cache import get_ecosystem_versions
+    record = parse_reports(build_dir)
+    if record is None:
+        return None
+    record.update({
+        "timestamp"  : time.time(),
+        "target"     : target,
+        "args"       : " ".join(args),
+        "build_time" : build_time,
+        "versions"   : get_ecosystem_versions(),
+    })
+    with open(os.path.join(build_dir, report_filename), "w") as f:
+        json.dump(record, f, indent=4)
+    if db_filename is not None:
+        insert_record(open_db(db_filename), record)
+    return record
+
+# Hook ---------------------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def tee_output(filename):
+    """Copy stdout/stderr (at file descriptor level, including sub-processes) to filename."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    tee   = subprocess.Popen(["tee", filename], stdin=subprocess.PIPE)
+    saved = [os.dup(1), os.dup(2)]
+    os.dup2(tee.stdin.fileno(), 1)
+    os.dup2(tee.stdin.fileno(), 2)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in saved:
+            os.close(fd)
+        tee.stdin.close()
+        tee.wait()
+
+def report_hook(db_filename, target=None, args=[]):
+    """Record the reports of the toolchain run (from the gateware directory) in the database."""
+    from litex_boards.tools.hooks import toolchain_run_hook
+    def callback(toolchain, run_script, script):
+        start = time.time()
+        with tee_output(toolchain_log_name):
+            run_script(script)
+        record = add_build(db_filename, ".", target, args, build_time=time.time() - start)
+        if record is not None:
+            print(f"Build report: {report_filename} ({record['toolchain']}, recorded in {db_filename}).")
+    return toolchain_run_hook(callback)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards build reports database.")
+    parser.add_argument("--db",     default="reports.db", help="SQLite database.")
+    parser.add_argument("--add",    default=None,         help="Parse and record reports of a build directory.")
+    parser.add_argument("--target", default=None,         help="Target name of the recorded build.")
+    parser.add_argument("--list",   nargs="?", const="",  help="List recorded builds (optionally of a target).")
+    parser.add_argument("--sql",    default=None,         help="Run a SQL query on the database.")
+    args = parser.parse_args()
+
+    if args.add is not None:
+        build_dir = args.add
+        if os.path.isdir(os.path.join(build_dir, "gateware")):
+            build_dir = os.path.join(build_dir, "gateware")
+        target = args.target or os.path.basename(os.path.dirname(os.path.abspath(build_dir)))
+        record = add_build(args.db, build_dir, target)
+        if record is None:
+            print(f"No reports found in {build_dir}.")
+            sys.exit(1)
+        print(json.dumps({k: v for k, v in record.items() if k not in ["resources", "versions"]}, indent=4))
+
+    if args.list is not None:
+        db    = open_db(args.db)
+        query = "SELECT id, target, toolchain, litex, worst_setup_slack, fmax, lut, ff, bram, dsp, build_time FROM builds"
+        rows  = db.execute(query + (" WHERE target = ?" if args.list else "") + " ORDER BY id", [args.list] if args.list else [])
+        print("{:>5s} {:32s} {:10s} {:>10s} {:>9s} {:>8s} {:>8s} {:>5s} {:>5s} {:>8s}".format(
+            "id", "target", "toolchain", "wns(ns)", "fmax", "lut", "ff", "bram", "dsp", "time(s)"))
+        def fmt(value, spec):
+            return "-" if value is None else format(value, spec)
+        for id, target, toolchain, litex, wns, fmax, lut, ff, bram, dsp, build_time in rows:
+            print("{:>5d} {:32s} {:10s} {:>10s} {:>9s} {:>8s} {:>8s} {:>5s} {:>5s} {:>8s}".format(
+                id, target or "-", toolchain, fmt(wns, ".3f"), fmt(fmax and fmax/1e6, ".1f"),
+                fmt(lut, ".0f"), fmt(ff, ".0f"), fmt(bram, ".0f"), fmt(dsp, ".0f"), fmt(build_time, ".0f")))
+
+    if args.sql is not None:
+        for row in open_db(args.db).execute(args.sql):
+            print(" | ".join(str(v) for v in row))
+
+if __name__ == "__main__":
+    main()
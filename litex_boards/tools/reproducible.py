@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Reproducible Builds: reproducibility mode and checker for the generated artifacts of the targets
+# (Verilog, constraints, build scripts, csr.csv/csr.json, software headers).
+#
+# The mode (--reproducible of the runner) pins the sources of nondeterminism of the LiteX generators:
+# - Timestamps: banners/identifiers use SOURCE_DATE_EPOCH (default: 0) in UTC.
+# - Git revisions: replaced by the LiteX version.
+# - Dict/set order: Python hash seed pinned (PYTHONHASHSEED=0).
+# - Absolute paths: the output directory is an input of the build (as the source paths: generated
+#   build scripts, variables.mak, tcl files embed it), differences that are only the output
+#   directory prefix are equivalent when checking the mode.
+#
+# The checker builds each target twice in different directories (with different hash seeds, at
+# different times), diffs the outputs and classifies each difference (timestamp, path, git, order,
+# other) per board.
+#
+# python3 -m litex_boards.tools.run --reproducible digilent_arty --build
+# python3 -m litex_boards.tools.reproducible digilent_arty sqrl_acorn             (check sources)
+# python3 -m litex_boards.tools.reproducible --targets --reproducible -j32       (check the mode)
+
+import os
+import re
+import sys
+import time
+import types
+import argparse
+import datetime
+import contextlib
+import collections
+import importlib
+
+from litex_boards.tools import matrix
+
+# Parameters ---------------------------------------------------------------------------------------
+
+# LiteX modules embedding time.time()/datetime.now() timestamps in generated files.
+time_modules = [
+    "litex.build.tools",
+    "litex.gen.fhdl.verilog",
+    "litex.soc.integration.common",
+    "litex.soc.integration.soc",
+    "litex.soc.integration.export",
+]
+datetime_modules = [
+    "litex.build.efinix.efinity",
+    "litex.build.anlogic.anlogic",
+]
+
+# LiteX modules embedding the git revision (imported by name).
+git_modules = [
+    "litex.build.tools",
+    "litex.gen.fhdl.verilog",
+]
+
+# Mode ---------------------------------------------------------------------------------------------
+
+def get_source_date_epoch():
+    return int(os.environ.get("SOURCE_DATE_EPOCH", "0"))
+
+def get_revision():
+    # Deterministic replacement of the git revision: LiteX version.
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return version("litex")
+    except PackageNotFoundError:
+        return "--------"
+
+def ensure_hash_seed():
+    """Re-execute the interpreter with a pinned hash seed (dict/set order) when not already."""
+    if os.environ.get("PYTHONHASHSEED", None) != "0":
+        os.environ["PYTHONHASHSEED"] = "0"
+        argv = getattr(sys, "orig_argv", [sys.executable, "-m", "litex_boards.tools.run"] + sys.argv[1:])
+        os.execv(sys.executable, [sys.executable] + argv[1:])
+
+def _module_proxy(module, **overrides):
+    proxy = types.ModuleType(module.__name__)
+    proxy.__dict__.update(vars(module))
+    proxy.__dict__.update(overrides)
+    return proxy
+
+@contextlib.contextmanager
+def reproducible_hook(epoch=None):
+    """Fixed timestamps (SOURCE_DATE_EPOCH, UTC) and git revision in the generated files."""
+    from litex_boards.tools.hooks import patch
+    epoch    = get_source_date_epoch() if epoch is None else epoch
+    revision = get_revision()
+
+    class FixedDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(epoch, tz)
+
+    fixed_time     = _module_proxy(time,     time=lambda: float(epoch))
+    fixed_datetime = _module_proxy(datetime, datetime=FixedDatetime)
+    patches = [
+        (time_modules,     "time",                   lambda t: fixed_time),
+        (datetime_modules, "datetime",               lambda d: fixed_datetime),
+        (git_modules,      "get_litex_git_revision", lambda f: lambda: revision),
+    ]
+
+    tz = os.environ.get("TZ", None)
+    os.environ["TZ"] = "UTC"
+    time.tzset()
+    try:
+        with contextlib.ExitStack() as stack:
+            # Only the modules/attributes of the installed LiteX version.
+            for names, attribute, wrapper in patches:
+                for name in names:
+                    try:
+                        module = importlib.import_module(name)
+                    except ImportError:
+                        continue
+                    if hasattr(module, attribute):
+                        stack.enter_context(patch(module, attribute, wrapper))
+            yield
+    finally:
+        if tz is None:
+            del os.environ["TZ"]
+        else:
+            os.environ["TZ"] = tz
+        time.tzset()
+
+# Diff ---------------------------------------------------------------------------------------------
+
+_timestamp_re = re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?")
+_git_re       = re.compile(r"\b[0-9a-f]{7,40}\b")
+
+def get_normalizers(dir_a, dir_b):
+    """(kind, normalize) of the known differences, in application order."""
+    def path(line):
+        return line.replace(dir_a, "<build>").replace(dir_b, "<build>")
+    return [
+        ("path",      path),
+        ("timestamp", lambda line: _timestamp_re.sub("<timestamp>", line)),
+        ("git",       lambda line: _git_re.sub("<sha>", line)),
+    ]
+
+def _count_differences(lines_a, lines_b):
+    # Lines of a not in b (and conversely), regardless of order.
+    a, b = collections.Counter(lines_a), collections.Counter(lines_b)
+    return sum(((a - b) + (b - a)).values())
+
+def classify_file(file_a, file_b, dir_a, dir_b, paths=True):
+    """Kinds of differences between two versions of a generated file (empty set when identical).
+
+    With paths=False, differences that are only the build directories prefix are equivalent.
+    """
+    with open(file_a, "rb") as fa, open(file_b, "rb") as fb:
+        data_a, data_b = fa.read(), fb.read()
+    if data_a == data_b:
+        return set()
+    try:
+        lines_a = data_a.decode().splitlines()
+        lines_b = data_b.decode().splitlines()
+    except UnicodeDecodeError:
+        return {"binary"}
+
+    # Normalize known differences, keeping the kinds that explain differing lines.
+    kinds       = set()
+    differences = _count_differences(lines_a, lines_b)
+    for kind, normalize in get_normalizers(dir_a, dir_b):
+        lines_a = [normalize(line) for line in lines_a]
+        lines_b = [normalize(line) for line in lines_b]
+        n = _count_differences(lines_a, lines_b)
+        if n < differences and (paths or kind != "path"):
+            kinds.add(kind)
+        differences = n
+    if differences:
+        kinds.add("other")
+    # Same lines in a different order: dict/set iteration order.
+    elif lines_a != lines_b:
+        kinds.add("order")
+    return kinds
+
+def list_files(directory, excluded=["build.log"]):
+    files = []
+    for root, dirs, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.relpath(os.path.join(root, filename), directory)
+            if filename not in excluded:
+                files.append(path)
+    return sorted(files)
+
+def compare_builds(dir_a, dir_b, paths=True):
+    """{file: kinds} of the differing files of two builds ("missing" when only in one)."""
+    dir_a, dir_b = os.path.abspath(dir_a), os.path.abspath(dir_b)
+    files_a, files_b = list_files(dir_a), list_files(dir_b)
+    diffs = {f: {"missing"} for f in sorted(set(files_a) ^ set(files_b))}
+    for f in sorted(set(files_a) & set(files_b)):
+        kinds = classify_file(os.path.join(dir_a, f), os.path.join(dir_b, f), dir_a, dir_b, paths)
+        if kinds:
+            diffs[f] = kinds
+    return diffs
+
+# Check --------------------------------------------------------------------------------------------
+
+def check_job(target, output_dir, run, args=[], reproducible=False):
+    """Build of target for run "a"/"b" (different directories and hash seeds)."""
+    job = matrix.target_job(target, os.path.join(output_dir, run), args)
+    if reproducible:
+        job.module = "litex_boards.tools.run"
+        job.args   = ["--reproducible", target] + job.args
+    job.environ = {"PYTHONHASHSEED": {"a": "1", "b": "2"}[run]}
+    return job
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards reproducible builds checker.")
+    parser.add_argument("names",          nargs="*",                      help="Targets to check.")
+    parser.add_argument("--targets",      action="store_true",            help="Check all targets.")
+    parser.add_argument("--reproducible", action="store_true",            help="Build in reproducibility mode (check the remaining differences).")
+    parser.add_argument("--args",         default="",                     help="Additional arguments passed to each build.")
+    parser.add_argument("-j", "--jobs",   type=int,                       help="Number of parallel builds (default: CPU count).")
+    parser.add_argument("--output-dir",   default="build/reproducible",   help="Base output directory.")
+    args = parser.parse_args()
+
+    targets = matrix.collect_targets() if args.targets else args.names
+    if not targets:
+        parser.error("No targets (use --targets to check all targets).")
+
+    # Build twice (second build later, so timestamps differ).
+    results = {}
+    for run in ["a", "b"]:
+        jobs = [check_job(t, args.output_dir, run, args.args.split(), args.reproducible) for t in targets]
+        for result in matrix.run_jobs(jobs, njobs=args.jobs, callback=matrix.print_result):
+            results.setdefault(result["name"], []).append(result)
+
+    # Compare.
+    report = {}
+    for target in targets:
+        a, b = results[target]
+        if not (a["passed"] and b["passed"]):
+            report[target] = {"status": "failed", "files": {}}
+            print(f"{target:40s} build failed, see {a['log']}")
+            continue
+        # Reproducibility mode: output directory prefixes are equivalent (see header).
+        diffs = compare_builds(a["output_dir"], b["output_dir"], paths=not args.reproducible)
+        kinds = sorted(set().union(*diffs.values()))
+        report[target] = {
+            "status" : "reproducible" if not diffs else "differs",
+            "files"  : {f: sorted(k) for f, k in diffs.items()},
+        }
+        print("{:40s} {}".format(target, "reproducible" if not diffs else
+            "{} files differ ({})".format(len(diffs), ", ".join(
+                f"{kind}: {len([f for f in diffs if kind in diffs[f]])}" for kind in kinds))))
+        for f, k in diffs.items():
+            print(f"    {f:60s} {', '.join(sorted(k))}")
+
+    report_filename = os.path.join(args.output_dir, "reproducible.json")
+    matrix.write_summary(report, report_filename)
+    print(f"Report: {report_filename}")
+    sys.exit(0 if all(r["status"] == "reproducible" for r in report.values()) else 1)
+
+if __name__ == "__main__":
+    main()
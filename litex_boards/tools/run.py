@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Target Runner: run any target of litex_boards/targets in-process with optional build hooks, the
+# target arguments being passed unchanged.
+#
+# python3 -m litex_boards.tools.run --incremental digilent_arty --build
+# python3 -m litex_boards.tools.run --artifact-store=/shared/artifacts digilent_arty --build
+# python3 -m litex_boards.tools.run --profile-build --profile-cprofile digilent_arty --build
+# python3 -m litex_boards.tools.run --clock-plans digilent_arty --build
+# python3 -m litex_boards.tools.run --nextpnr-seeds=16 --nextpnr-placers=heap,sa gsd_orangecrab --build
+# python3 -m litex_boards.tools.run --report-db=reports.db digilent_arty --build
+# python3 -m litex_boards.tools.run --software-cache digilent_arty --build
+# python3 -m litex_boards.tools.run --reproducible digilent_arty --build
+# python3 -m litex_boards.tools.run --indexed-io xilinx_vc707 --build
+# python3 -m litex_boards.tools.run --sim digilent_arty --build
+
+import sys
+import argparse
+
+from litex_boards.tools import elaborate
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def get_module(target):
+    return target if "." in target else f"litex_boards.targets.{target}"
+
+def get_hooks(args):
+    hooks = []
+    if args.reproducible:
+        from litex_boards.tools.reproducible import reproducible_hook
+        hooks.append(reproducible_hook())
+    if args.indexed_io:
+        from litex_boards.iotable import indexed_io_hook
+        hooks.append(indexed_io_hook())
+    if args.sim:
+        from litex_boards.tools.sim import sim_hook
+        hooks.append(sim_hook())
+    if args.clock_plans:
+        from litex_boards.tools.clockplan import clock_plan_hook
+        hooks.append(clock_plan_hook(args.target.split(".")[-1]))
+    if args.software_cache is not None:
+        from litex_boards.tools.swcache import software_cache
+        hooks.append(software_cache(*filter(None, [args.software_cache])))
+    if args.profile_build or args.profile_cprofile:
+        from litex_boards.tools.profiling import profile_hook
+        hooks.append(profile_hook(with_cprofile=args.profile_cprofile))
+    if args.report_db is not None:
+        from litex_boards.tools.reports import report_hook
+        hooks.append(report_hook(args.report_db, target=args.target.split(".")[-1], args=args.args))
+    if args.nextpnr_seeds is not None:
+        from litex_boards.tools.seeds import seed_sweep_hook
+        placers = [None] if args.nextpnr_placers is None else args.nextpnr_placers.split(",")
+        hooks.append(seed_sweep_hook(args.nextpnr_seeds, placers))
+    if args.incremental or args.artifact_store is not None:
+        from litex_boards.tools.incremental import incremental_hook
+        hooks.append(incremental_hook(args.artifact_store))
+    return hooks
+
+# Run ----------------------------------------------------------------------------------------------
+
+def get_parser():
+    parser = argparse.ArgumentParser(description="LiteX-Boards target runner.")
+    parser.add_argument("--incremental",      action="store_true", help="Skip toolchain run when its inputs are unchanged.")
+    parser.add_argument("--artifact-store",   default=None,        help="Shared artifact store directory (implies --incremental).")
+    parser.add_argument("--profile-build",    action="store_true", help="Write per-phase time/memory profile (profile.json) to build directory.")
+    parser.add_argument("--profile-cprofile", action="store_true", help="Also dump cProfile of elaboration (profile.prof, implies --profile-build).")
+    parser.add_argument("--clock-plans",      action="store_true", help="Reuse/record solved PLL configurations (clock plans).")
+    parser.add_argument("--nextpnr-seeds",    type=int,            help="Run N Nextpnr seeds concurrently and keep the best worst-slack.")
+    parser.add_argument("--nextpnr-placers",  default=None,        help="Comma separated Nextpnr placers used by seeds runs (ex: heap,sa).")
+    parser.add_argument("--report-db",        default=None,        help="Parse timing/utilization reports (report.json) and record them in a SQLite database.")
+    parser.add_argument("--software-cache",   nargs="?", const="", help="Share compiled software objects (BIOS/libraries) through a content-hashed cache (optional directory).")
+    parser.add_argument("--reproducible",     action="store_true", help="Byte-reproducible generated files (fixed timestamps/git revision/hash seed).")
+    parser.add_argument("--indexed-io",       action="store_true", help="Use indexed IO tables for request()/lookup_request() on all platforms.")
+    parser.add_argument("--sim",              action="store_true", help="Build/run the simulation twin of the target instead of the board (see tools/sim.py).")
+    parser.add_argument("target",                                  help="Target name (ex: digilent_arty) or module.")
+    parser.add_argument("args", nargs=argparse.REMAINDER,          help="Target arguments.")
+    return parser
+
+def run(argv=None):
+    """Run a target with the runner command line argv (default: sys.argv), return the exit code."""
+    args = get_parser().parse_args(argv)
+    if args.reproducible:
+        from litex_boards.tools.reproducible import ensure_hash_seed
+        ensure_hash_seed()
+    return elaborate.run_target(get_module(args.target), args.args, get_hooks(args))
+
+def main():
+    sys.exit(run())
+
+if __name__ == "__main__":
+    main()
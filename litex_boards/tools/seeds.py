@@ -0,0 +1,140 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Nextpnr Seed Sweep: for Yosys/Nextpnr toolchains (Trellis, IceStorm, Oxide, Apicula...), run
+# synthesis once then N placement/routing runs concurrently with different seeds/placers, keep the
+# result with the best worst-slack and pack it. The distribution is recorded in seeds.json.
+#
+# python3 -m litex_boards.tools.run --nextpnr-seeds=16 gsd_orangecrab --sys-clk-freq=80e6 --build
+
+import os
+import re
+import json
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from litex_boards.tools.hooks import toolchain_run_hook
+from litex_boards.tools.fmax  import parse_nextpnr_timing
+
+# Parameters ---------------------------------------------------------------------------------------
+
+seeds_dirname  = "seeds"
+seeds_filename = "seeds.json"
+
+# Script -------------------------------------------------------------------------------------------
+
+def split_script(script):
+    """Split a Yosys/Nextpnr build script in (synthesis, place/route, packing) commands."""
+    steps = ([], [], [])
+    step  = 0
+    with open(script) as f:
+        for line in f:
+            line = line.strip()
+            if (not line) or line.startswith("#") or line.startswith("set "):
+                continue
+            if line.startswith("nextpnr"):
+                steps[1].append(line)
+                step = 2
+            else:
+                steps[step].append(line)
+    return steps
+
+def get_output_filename(pnr_cmd):
+    # Nextpnr output: --textcfg (ECP5), --asc (iCE40), --fasm (Nexus) or --write (Gowin) <file>.
+    m = re.search(r"--(?:textcfg|asc|fasm|write)\s+(\S+)", pnr_cmd)
+    return m.group(1) if m else None
+
+def get_worst_slack(clocks):
+    """Worst slack (in ns) over clocks from Nextpnr Fmax/target reports."""
+    slacks = [1e9/c["target"] - 1e9/c["fmax"] for c in clocks.values() if c["fmax"] > 0]
+    return min(slacks) if slacks else None
+
+# Seed Run -----------------------------------------------------------------------------------------
+
+def run_pnr(pnr_cmd, seed, placer, build_dir="."):
+    """Run Nextpnr with seed/placer in its own directory (inputs linked from build_dir)."""
+    name    = f"seed{seed}" + ("" if placer is None else f"-{placer}")
+    run_dir = os.path.join(build_dir, seeds_dirname, name)
+    output  = get_output_filename(pnr_cmd)
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(run_dir)
+    for filename in os.listdir(build_dir):
+        path = os.path.join(build_dir, filename)
+        if os.path.isfile(path) and filename != output:
+            os.symlink(os.path.abspath(path), os.path.join(run_dir, filename))
+    cmd  = re.sub(r"--seed\s+\d+", "", pnr_cmd)
+    cmd += f" --seed {seed}" + ("" if placer is None else f" --placer {placer}")
+    with open(os.path.join(run_dir, "nextpnr.log"), "w") as log:
+        returncode = subprocess.call(cmd, shell=True, cwd=run_dir, stdout=log, stderr=subprocess.STDOUT)
+    with open(os.path.join(run_dir, "nextpnr.log"), errors="replace") as log:
+        clocks = parse_nextpnr_timing(log.read())
+    return {
+        "name"        : name,
+        "seed"        : seed,
+        "placer"      : placer,
+        "returncode"  : returncode,
+        "clocks"      : clocks,
+        "passed"      : (returncode == 0) and (output is not None),
+        "worst_slack" : get_worst_slack(clocks),
+        "output"      : None if output is None else os.path.join(run_dir, output),
+    }
+
+# Seed Sweep ---------------------------------------------------------------------------------------
+
+class SeedSweep:
+    """Toolchain run callback running Nextpnr with several seeds/placers and keeping the best."""
+    def __init__(self, nseeds, placers=[None], njobs=None):
+        self.nseeds  = nseeds
+        self.placers = placers
+        self.njobs   = njobs or os.cpu_count()
+
+    def __call__(self, toolchain, run_script, script):
+        synthesis, pnr, packing = split_script(script)
+        # Not a Yosys/Nextpnr flow: regular run.
+        if len(pnr) != 1 or get_output_filename(pnr[0]) is None:
+            return run_script(script)
+
+        # Synthesis (once).
+        for cmd in synthesis:
+            if subprocess.call(cmd, shell=True) != 0:
+                raise OSError(f"Error occured during synthesis: {cmd}")
+
+        # Place/Route runs.
+        runs = [(seed + 1, self.placers[seed % len(self.placers)]) for seed in range(self.nseeds)]
+        with ThreadPoolExecutor(max_workers=self.njobs) as executor:
+            results = list(executor.map(lambda run: run_pnr(pnr[0], *run), runs))
+        for result in results:
+            print("Nextpnr {:16s}: {}".format(result["name"],
+                "failed" if not result["passed"] else f"worst slack {result['worst_slack']:+.3f}ns"))
+
+        # Keep best result and pack it.
+        passed = [r for r in results if r["passed"] and r["worst_slack"] is not None]
+        if not passed:
+            raise OSError("Error occured during Nextpnr's runs (all seeds failed).")
+        best = max(passed, key=lambda r: r["worst_slack"])
+        shutil.copyfile(best["output"], os.path.basename(best["output"]))
+        shutil.copyfile(os.path.join(os.path.dirname(best["output"]), "nextpnr.log"), "nextpnr.log")
+        print(f"Keeping Nextpnr {best['name']} (worst slack {best['worst_slack']:+.3f}ns).")
+        for cmd in packing:
+            if subprocess.call(cmd, shell=True) != 0:
+                raise OSError(f"Error occured during packing: {cmd}")
+
+        # Record distribution.
+        slacks = sorted(r["worst_slack"] for r in passed)
+        with open(seeds_filename, "w") as f:
+            json.dump({
+                "best"        : best["name"],
+                "runs"        : [{k: v for k, v in r.items() if k != "output"} for r in results],
+                "worst_slack" : {
+                    "min"    : slacks[0],
+                    "median" : slacks[len(slacks)//2],
+                    "max"    : slacks[-1],
+                },
+            }, f, indent=4)
+
+def seed_sweep_hook(nseeds, placers=[None], njobs=None):
+    return toolchain_run_hook(SeedSweep(nseeds, placers, njobs))
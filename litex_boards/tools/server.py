@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build Server: local daemon keeping Migen/LiteX and the cores imported, serving target runs to a
+# thin client over a Unix socket, for interactive iteration on a target (--build --no-compile...).
+#
+# The server forks a handler per connection; the handler forks the run from the warm server (so each
+# run starts from a clean, already imported, state and targets/platforms are re-imported from their
+# current sources) and streams its output to the client. The client arguments are the runner ones
+# (litex_boards.tools.run: hooks options, target and target arguments), the run uses the working
+# directory and environment of the client.
+#
+# python3 -m litex_boards.tools.server start                                   (start the server)
+# python3 -m litex_boards.tools.server run digilent_arty --build --no-compile
+# python3 -m litex_boards.tools.server run --incremental digilent_arty --build
+# python3 -m litex_boards.tools.server status
+# python3 -m litex_boards.tools.server stop
+
+import os
+import sys
+import json
+import time
+import errno
+import struct
+import select
+import signal
+import socket
+import argparse
+import tempfile
+
+# Parameters ---------------------------------------------------------------------------------------
+
+default_socket = os.environ.get("LITEX_BOARDS_SERVER_SOCKET",
+    os.path.join(tempfile.gettempdir(), f"litex_boards-server-{os.getuid()}.sock"))
+
+start_timeout = 120 # Preload can be long on a cold cache.
+
+# Protocol -----------------------------------------------------------------------------------------
+
+# Frames: type (1 byte), length (u32), payload.
+# Client -> Server: R (request, JSON).
+# Server -> Client: O (output), M (server message), E (exit code).
+
+frame_header = struct.Struct(">cI")
+
+commands = ["run", "status", "stop"]
+
+def send_frame(sock, kind, payload=b""):
+    sock.sendall(frame_header.pack(kind, len(payload)) + payload)
+
+def _recv_exact(sock, n):
+    data = b""
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise EOFError
+        data += chunk
+    return data
+
+def recv_frame(sock):
+    kind, length = frame_header.unpack(_recv_exact(sock, frame_header.size))
+    return kind, _recv_exact(sock, length)
+
+def parse_request(payload):
+    """Decode and validate a request, raise ValueError on invalid requests."""
+    request = json.loads(payload)
+    if not isinstance(request, dict) or request.get("command", None) not in commands:
+        raise ValueError("Invalid request.")
+    if request["command"] == "run":
+        if not (isinstance(request.get("argv", None), list) and all(isinstance(a, str) for a in request["argv"]) and
+                isinstance(request.get("cwd", None), str) and isinstance(request.get("env", None), dict)):
+            raise ValueError("Invalid run request.")
+    return request
+
+# Server -------------------------------------------------------------------------------------------
+
+def get_loaded_files():
+    # {file: mtime} of the preloaded modules (to detect LiteX updates while the server runs).
+    files = {}
+    for module in list(sys.modules.values()):
+        filename = getattr(module, "__file__", None)
+        if filename is not None and os.path.exists(filename):
+            files[filename] = os.stat(filename).st_mtime
+    return files
+
+def get_stale_files(files):
+    return [f for f, mtime in files.items() if not os.path.exists(f) or os.stat(f).st_mtime != mtime]
+
+def run_request(request):
+    """Run a request in the current (forked) process, return the exit code."""
+    from litex_boards.tools import run
+    os.chdir(request["cwd"])
+    # Client environment, the hash seed being the one of the server (fixed at start).
+    hash_seed = os.environ.get("PYTHONHASHSEED", None)
+    os.environ.clear()
+    os.environ.update(request["env"])
+    if hash_seed is not None:
+        os.environ["PYTHONHASHSEED"] = hash_seed
+    sys.argv = [sys.argv[0]] + request["argv"]
+    try:
+        return run.run(request["argv"])
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+def handle_run(conn, request, stale):
+    """Handler of a run request: fork the run and stream its output to the client."""
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if stale:
+        send_frame(conn, b"M", "Warning: {} preloaded file(s) changed since the server started ({}...), "
+            "restart the server.\n".format(len(stale), stale[0]).encode())
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Run: own process group (to stop the toolchains with it), output to the pipe.
+        os.setpgrp()
+        conn.close()
+        os.close(r)
+        null = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null, 0)
+        os.dup2(w, 1)
+        os.dup2(w, 2)
+        os.close(w)
+        # Python streams on the pipe (whatever sys.stdout/stderr were in the server).
+        sys.stdout = open(1, "w", buffering=1, closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+        code = 1
+        try:
+            code = run_request(request)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    os.close(w)
+
+    # Stream output, stop the run when the client disconnects (Ctrl-C).
+    while True:
+        readable, _, _ = select.select([r, conn], [], [])
+        if conn in readable:
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            break
+        data = os.read(r, 65536)
+        if not data:
+            break
+        send_frame(conn, b"O", data)
+    os.close(r)
+    _, status = os.waitpid(pid, 0)
+    code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else 128 + os.WTERMSIG(status)
+    try:
+        send_frame(conn, b"E", str(code).encode())
+    except OSError:
+        pass
+
+def serve(path=default_socket):
+    from litex_boards.tools import elaborate, run
+    start = time.time()
+    elaborate.preload()
+    files = get_loaded_files()
+    print(f"Preloaded {len(files)} modules in {time.time() - start:.1f}s.", flush=True)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(16)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN) # Reap handlers.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Listening on {path}.", flush=True)
+
+    runs = 0
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except InterruptedError:
+                continue
+            try:
+                conn.settimeout(5)
+                kind, payload = recv_frame(conn)
+                conn.settimeout(None)
+                if kind != b"R":
+                    raise ValueError("Invalid frame.")
+                request = parse_request(payload)
+            except ValueError as e:
+                # Rejected (invalid JSON/request), the server keeps serving.
+                try:
+                    send_frame(conn, b"M", f"{e}\n".encode())
+                    send_frame(conn, b"E", b"2")
+                except OSError:
+                    pass
+                conn.close()
+                continue
+            except (OSError, EOFError):
+                conn.close()
+                continue
+            if request["command"] == "stop":
+                send_frame(conn, b"E", b"0")
+                conn.close()
+                break
+            if request["command"] == "status":
+                status = {"pid": os.getpid(), "uptime": time.time() - start, "runs": runs,
+                    "modules": len(files), "stale": len(get_stale_files(files))}
+                send_frame(conn, b"O", (json.dumps(status) + "\n").encode())
+                send_frame(conn, b"E", b"0")
+                conn.close()
+                continue
+            runs += 1
+            if os.fork() == 0:
+                server.close()
+                try:
+                    handle_run(conn, request, get_stale_files(files))
+                finally:
+                    os._exit(0)
+            conn.close()
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+def daemonize(log):
+    """Detach the current process (double fork), return False in the parent."""
+    if os.fork() != 0:
+        return False
+    os.setsid()
+    if os.fork() != 0:
+        os._exit(0)
+    fd = os.open(log, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    return True
+
+# Client -------------------------------------------------------------------------------------------
+
+def connect(path=default_socket):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError as e:
+        sock.close()
+        if e.errno in [errno.ENOENT, errno.ECONNREFUSED]:
+            return None
+        raise
+    return sock
+
+def request(path, command, argv=[]):
+    """Send a request to the server and forward its output, return the exit code (None: no server)."""
+    sock = connect(path)
+    if sock is None:
+        return None
+    payload = {"command": command, "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    with sock:
+        send_frame(sock, b"R", json.dumps(payload).encode())
+        while True:
+            try:
+                kind, data = recv_frame(sock)
+            except EOFError:
+                return 1
+            if kind == b"E":
+                return int(data)
+            out = sys.stderr if kind == b"M" else sys.stdout
+            out.buffer.write(data)
+            out.flush()
+
+def start(path=default_socket, foreground=False):
+    if connect(path) is not None:
+        print(f"Server already running on {path}.")
+        return 0
+    # Fixed hash seed (for --reproducible runs).
+    from litex_boards.tools.reproducible import ensure_hash_seed
+    ensure_hash_seed()
+    if foreground:
+        serve(path)
+        return 0
+    log = path + ".log"
+    if daemonize(log):
+        try:
+            serve(path)
+        finally:
+            os._exit(0)
+    deadline = time.time() + start_timeout
+    while time.time() < deadline:
+        sock = connect(path)
+        if sock is not None:
+            sock.close()
+            print(f"Server started on {path} (log: {log}).")
+            return 0
+        time.sleep(0.1)
+    print(f"Server did not start, see {log}.")
+    return 1
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards build server.")
+    parser.add_argument("--socket",     default=default_socket, help="Server Unix socket.")
+    parser.add_argument("--foreground", action="store_true",    help="Do not detach the server (start).")
+    parser.add_argument("command",      choices=["start", "stop", "status", "run"], help="Command.")
+    parser.add_argument("args", nargs=argparse.REMAINDER,       help="Runner arguments (run): [options] target [target arguments].")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        sys.exit(start(args.socket, args.foreground))
+    code = request(args.socket, args.command, args.args)
+    if code is None:
+        if args.command == "run":
+            print(f"No server running on {args.socket}, start it with: python3 -m litex_boards.tools.server start")
+            sys.exit(1)
+        print("Server not running.")
+        code = 0 if args.command == "stop" else 1
+    sys.exit(code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Simulation Twin: build/run the BaseSoC of a target under Verilator instead of for the board, with
+# the same SoC configuration: CPU, bus/CSR parameters, memory map, CSR/IRQ locations, SoC identifier
+# and system clock frequency, so that firmware built for the board runs unchanged on the twin.
+#
+# The target is run unchanged: its SoCCore parameters and add_* calls are recorded, and the build is
+# replaced by the one of the twin, where:
+# - CRG/clocks are replaced by the simulation clock (at the board's sys_clk_freq).
+# - UART is replaced by the simulation console.
+# - SDRAM is replaced by integrated main RAM (same region, capped to sdram_max_size) or, with
+#   --sdram-model, by the SDRAM PHY model with the same module/geometry/timings, the LiteDRAM
+#   controller/L2 cache being the ones of the board (rows reduced when above sdram_max_size).
+# - Ethernet/Etherbone PHYs by the simulation Ethernet PHY model (tap interface).
+# - SDCard by the SDCard emulator, SPI Flash by the SPI Flash model (same module).
+# - Video (optional, SDL window) by the simulation video PHY.
+# Other board peripherals (LEDs, switches...) are not simulated but keep their CSR locations.
+#
+# Snapshots: with --snapshot, the simulation is built with Verilator --savable support and runs until
+# a named point (--snapshot-at: BIOS "prompt", "sdram" (after SDRAM init, before the boot sequence),
+# any console string or "cycle:N"), saves the full model state (CPU, ROM/RAM/SDRAM contents, cores)
+# to the snapshot file and exits. --restore then starts the already built simulation from the
+# snapshot, without elaboration/build/boot. The state of the external simulation modules (console,
+# Ethernet tap...) is not part of the snapshot, the model must not be rebuilt between save/restore.
+#
+# python3 -m litex_boards.tools.sim digilent_arty                              (build and run)
+# python3 -m litex_boards.tools.sim --non-interactive --ram-init=firmware.bin digilent_arty
+# python3 -m litex_boards.tools.sim lambdaconcept_ecpix5 --cpu-type=vexriscv --with-ethernet
+# python3 -m litex_boards.tools.sim --sdram-model --ram-init=linux.json digilent_arty
+# python3 -m litex_boards.tools.sim --snapshot=arty.snap --snapshot-at=prompt digilent_arty
+# python3 -m litex_boards.tools.sim --restore=arty.snap --non-interactive < commands.txt
+# python3 -m litex_boards.tools.run --sim digilent_arty --build                (with other hooks)
+
+import os
+import sys
+import json
+import argparse
+import contextlib
+
+from litex_boards.tools import elaborate
+
+# Parameters ---------------------------------------------------------------------------------------
+
+# Max size of the integrated main RAM/SDRAM model replacing SDRAM (Verilator memory).
+sdram_max_size = 256*1024*1024
+
+# SoCCore parameters not supported in simulation.
+unsupported_soc_kwargs = {
+    "with_jtagbone" : False,
+    "with_uartbone" : False,
+}
+
+# Recorded SoC methods (replayed on the twin with simulation PHYs/models).
+recorded_methods = [
+    "add_sdram",
+    "add_ethernet",
+    "add_etherbone",
+    "add_sdcard",
+    "add_spi_flash",
+    "add_video_framebuffer",
+    "add_video_terminal",
+    "add_video_colorbars",
+]
+
+# Named snapshot points (BIOS console strings).
+snapshot_points = {
+    "prompt" : "\x1b[92;1mlitex\x1b[0m> ",
+    "sdram"  : "--============== \x1b[1mBoot\x1b[0m ==================--",
+}
+
+# Patches of the LiteX Verilator simulation core for snapshots: {file: [(anchor, replacement)]}.
+snapshot_core_patches = {
+    "Makefile" : [
+        ("--top-module sim --exe", "--top-module sim --exe --savable"),
+    ],
+    "veril.cpp" : [
+        ('#include "verilated.h"\n', '#include "verilated.h"\n#include "verilated_save.h"\n'),
+        ("double sc_time_stamp()", """\
+extern "C" int litex_sim_snapshot_requested(void *vsim)
+{
+  return ((Vsim*)vsim)->sim_snapshot != 0;
+}
+
+extern "C" int litex_sim_save(void *vsim, const char *filename, uint64_t time_ps)
+{
+  VerilatedSave os;
+  os.open(filename);
+  if (!os.isOpen())
+    return -1;
+  os << time_ps;
+  os << *(Vsim*)vsim;
+  os.close();
+  return 0;
+}
+
+extern "C" int litex_sim_restore(void *vsim, const char *filename, uint64_t *time_ps)
+{
+  VerilatedRestore os;
+  os.open(filename);
+  if (!os.isOpen())
+    return -1;
+  os >> *time_ps;
+  os >> *(Vsim*)vsim;
+  os.close();
+  main_time = *time_ps;
+  return 0;
+}
+
+double sc_time_stamp()"""),
+    ],
+    "sim.c" : [
+        ("void litex_sim_dump();\n", """\
+void litex_sim_dump();
+int litex_sim_snapshot_requested(void *vsim);
+int litex_sim_save(void *vsim, const char *filename, uint64_t time_ps);
+int litex_sim_restore(void *vsim, const char *filename, uint64_t *time_ps);
+
+static char *snapshot_file = NULL;
+"""),
+        ("    sim_time_ps += timebase_ps;\n", """\
+    sim_time_ps += timebase_ps;
+
+    if(snapshot_file && litex_sim_snapshot_requested(vsim))
+    {
+      if(litex_sim_save(vsim, snapshot_file, sim_time_ps) != 0)
+        eprintf("Can't save snapshot to %s\\n", snapshot_file);
+      else
+        printf("\\n[snapshot] saved to %s at %llu ps\\n", snapshot_file, (unsigned long long)sim_time_ps);
+      fflush(stdout);
+      event_base_loopbreak(base);
+      break;
+    }
+"""),
+        ("  tv.tv_sec = 0;\n  tv.tv_usec = 0;\n  ev = event_new", """\
+  snapshot_file = getenv("LITEX_SIM_SNAPSHOT");
+  if(getenv("LITEX_SIM_RESTORE"))
+  {
+    if(litex_sim_restore(vsim, getenv("LITEX_SIM_RESTORE"), &sim_time_ps) != 0)
+    {
+      eprintf("Can't restore snapshot from %s\\n", getenv("LITEX_SIM_RESTORE"));
+      ret = RC_ERROR;
+      goto out;
+    }
+  }
+
+  tv.tv_sec = 0;
+  tv.tv_usec = 0;
+  ev = event_new"""),
+    ],
+}
+
+# Recorder -----------------------------------------------------------------------------------------
+
+class SoCRecord:
+    """SoCCore parameters and recorded add_* calls of a SoC."""
+    def __init__(self, clk_freq, kwargs):
+        self.clk_freq = clk_freq
+        self.kwargs   = kwargs
+        self.calls    = [] # (method, kwargs).
+
+    def get_calls(self, method):
+        return [kwargs for m, kwargs in self.calls if m == method]
+
+def _bind(method, args, kwargs):
+    # Positional arguments of a recorded call as keyword arguments.
+    import inspect
+    params = list(inspect.signature(method).parameters)[1:]
+    return {**dict(zip(params, args)), **kwargs}
+
+# Twin ---------------------------------------------------------------------------------------------
+
+def get_soc_config(soc):
+    """Memory map, CSR/IRQ locations and regions of a board SoC (finalized)."""
+    regions = {name: (region.origin, region.size) for name, region in soc.bus.regions.items()}
+    return {
+        "mem_map"     : {**soc.mem_map, **{name: origin for name, (origin, size) in regions.items()}},
+        "csr_map"     : dict(soc.csr.locs),
+        "irq_map"     : dict(soc.irq.locs) if soc.irq.enabled else {},
+        "regions"     : regions,
+        "endianness"  : None if soc.cpu_type is None else soc.cpu.endianness,
+    }
+
+def create_sdram_model(phy, module, clk_freq, init=[], verbosity=0):
+    """SDRAM PHY model and module with the geometry/timings of a board SDRAM PHY/module (None when
+    the memory type is not supported by the model)."""
+    import copy
+    from litedram.common import GeomSettings
+    from litedram.phy.model import SDRAMPHYModel, get_sdram_phy_settings, sdram_module_nphases
+    if module.memtype not in ["SDR", "DDR", "LPDDR", "DDR2", "DDR3", "DDR4"]:
+        return None, None
+
+    # Module at the rate of the model (DFI phases of the memory type), same speedgrade.
+    rate = "1:{}".format(sdram_module_nphases[module.memtype])
+    if module.rate != rate:
+        module = module.__class__(clk_freq, rate, speedgrade=getattr(module, "speedgrade", None))
+    else:
+        module = copy.copy(module)
+
+    # Geometry (rows reduced to fit in sdram_max_size).
+    databits = phy.settings.databits
+    geom     = module.geom_settings
+    rowbits  = geom.rowbits
+    while rowbits > 1 and 2**(geom.bankbits + rowbits + geom.colbits)*databits//8 > sdram_max_size:
+        rowbits -= 1
+    if rowbits != geom.rowbits:
+        print(f"Simulation twin: SDRAM model rows reduced from {2**geom.rowbits} to {2**rowbits}.")
+        module.geom_settings = GeomSettings(geom.bankbits, rowbits, geom.colbits)
+
+    settings = get_sdram_phy_settings(memtype=module.memtype, data_width=databits, clk_freq=clk_freq)
+    model    = SDRAMPHYModel(module, settings, clk_freq=clk_freq, init=init, verbosity=verbosity)
+    return model, module
+
+def create_twin(record, config, ram_init=None, rom_init=None, with_video=False, sdram_model=False,
+    sdram_verbosity=0, snapshot_at=None):
+    """Return the simulation twin SoC and its SimConfig."""
+    from litex.build.io import CRG
+    from litex.build.sim.config import SimConfig
+    from litex.soc.integration.soc_core import SoCCore
+    from litex.soc.integration.common import get_mem_data
+    from litex.tools.litex_sim import Platform
+
+    class SimTwinSoC(SoCCore):
+        def __init__(self, platform, clk_freq, **kwargs):
+            self.crg = CRG(platform.request("sys_clk"))
+            SoCCore.__init__(self, platform, clk_freq, **kwargs)
+
+    sim_config = SimConfig()
+    sim_config.add_clocker("sys_clk", freq_hz=int(record.clk_freq))
+
+    # SoCCore parameters of the board, with the board's memory map and CSR/IRQ locations.
+    kwargs = {**record.kwargs, **unsupported_soc_kwargs}
+    if kwargs.get("with_uart", True):
+        kwargs["uart_name"] = "sim"
+        sim_config.add_module("serial2console", "serial")
+    data_width = kwargs.get("bus_data_width", 32)
+    if rom_init is not None:
+        kwargs["integrated_rom_init"] = get_mem_data(rom_init, data_width=data_width, endianness=config["endianness"])
+
+    ram_init_data = []
+    if ram_init is not None:
+        ram_init_data = get_mem_data(ram_init, data_width=data_width,
+            endianness=config["endianness"], offset=config["mem_map"]["main_ram"])
+
+    # SDRAM: SDRAM PHY model or integrated main RAM (same region).
+    sdram    = record.get_calls("add_sdram")[:1]
+    main_ram = config["regions"].get("main_ram", None)
+    if sdram and sdram_model:
+        sdram_kwargs = dict(sdram[0])
+        model, module = create_sdram_model(sdram_kwargs["phy"], sdram_kwargs["module"], record.clk_freq,
+            init=ram_init_data, verbosity=sdram_verbosity)
+        if model is None:
+            print("Simulation twin: {} not supported by the SDRAM model, using integrated main RAM.".format(
+                sdram_kwargs["module"].memtype))
+            sdram_model = False
+    if sdram and not sdram_model and main_ram is not None:
+        size = main_ram[1]
+        if size > sdram_max_size:
+            print(f"Simulation twin: main RAM reduced from {size//2**20}MB to {sdram_max_size//2**20}MB.")
+            size = sdram_max_size
+        kwargs["integrated_main_ram_size"] = size
+    if ram_init_data and not (sdram and sdram_model):
+        kwargs["integrated_main_ram_init"] = ram_init_data
+
+    SimTwinSoC.mem_map       = config["mem_map"]
+    SimTwinSoC.csr_map       = config["csr_map"]
+    SimTwinSoC.interrupt_map = config["irq_map"]
+    platform = Platform()
+    soc = SimTwinSoC(platform, int(record.clk_freq), **kwargs)
+    if sdram and sdram_model:
+        soc.sdrphy = model
+        soc.add_sdram(**dict(sdram_kwargs, phy=soc.sdrphy, module=module))
+        if ram_init_data:
+            # Skip SDRAM test to avoid corrupting pre-initialized contents.
+            soc.add_constant("SDRAM_TEST_DISABLE")
+        else:
+            # Reduce memtest size for simulation speedup.
+            soc.add_constant("MEMTEST_DATA_SIZE", 8*1024)
+            soc.add_constant("MEMTEST_ADDR_SIZE", 8*1024)
+    replay(soc, record, sim_config, with_video)
+    if snapshot_at is not None:
+        add_snapshot_trigger(soc, snapshot_at)
+    soc.comb += platform.trace.eq(1)
+    return soc, sim_config
+
+def replay(soc, record, sim_config, with_video=False):
+    """Replay the recorded add_* calls of the board with simulation PHYs/models."""
+    from litex.soc.cores.video import VideoGenericPHY
+
+    # Ethernet/Etherbone (single simulation PHY).
+    ethernet  = record.get_calls("add_ethernet")
+    etherbone = record.get_calls("add_etherbone")
+    if ethernet or etherbone:
+        from liteeth.phy.model import LiteEthPHYModel
+        soc.ethphy = LiteEthPHYModel(soc.platform.request("eth", 0))
+        soc.add_constant("HW_PREAMBLE_CRC")
+        remote_ip = next((kwargs["remote_ip"] for kwargs in ethernet if kwargs.get("remote_ip", None)), "192.168.1.100")
+        sim_config.add_module("ethernet", "eth", args={"interface": "tap0", "ip": remote_ip})
+        for kwargs in ethernet[:1]:
+            soc.add_ethernet(**dict(kwargs, phy=soc.ethphy, phy_cd="eth", with_timing_constraints=False))
+        for kwargs in etherbone[:1]:
+            if ethernet:
+                # Shared PHY: Etherbone with the Ethernet MAC of the board.
+                print("Simulation twin: Etherbone not simulated (Ethernet and Etherbone share the simulation PHY).")
+                break
+            soc.add_etherbone(**dict(kwargs, phy=soc.ethphy, phy_cd="eth", with_timing_constraints=False))
+
+    # SDCard: emulator.
+    for kwargs in record.get_calls("add_sdcard")[:1]:
+        soc.add_sdcard(**dict(kwargs, use_emulator=True))
+
+    # SPI Flash: model of the same module.
+    for kwargs in record.get_calls("add_spi_flash")[:1]:
+        from litespi.phy.model import LiteSPIPHYModel
+        module = kwargs.get("module", None)
+        if module is not None:
+            soc.spiflash_phy = LiteSPIPHYModel(module, init=[])
+            soc.add_spi_flash(**dict(kwargs, phy=soc.spiflash_phy))
+
+    # Video: simulation PHY (SDL window).
+    videos = [(m, kwargs) for m, kwargs in record.calls if m.startswith("add_video")]
+    if videos and with_video:
+        soc.videophy = VideoGenericPHY(soc.platform.request("vga"))
+        sim_config.add_module("video", "vga")
+        for method, kwargs in videos[:1]:
+            getattr(soc, method)(**dict(kwargs, phy=soc.videophy, clock_domain="sys"))
+    elif videos:
+        print("Simulation twin: video not simulated (enable it with --video).")
+
+# Snapshots ----------------------------------------------------------------------------------------
+
+def get_marker_transitions(marker):
+    """Transitions of the KMP matcher of marker: for each state (number of matched bytes), the
+    (byte, next state) to test in order, falling back to 0 (prefixes that are also suffixes of the
+    matched bytes are kept, ex: "aab" is found in "aaab")."""
+    failure = [0]*len(marker)
+    k = 0
+    for i in range(1, len(marker)):
+        while k > 0 and marker[i] != marker[k]:
+            k = failure[k - 1]
+        if marker[i] == marker[k]:
+            k += 1
+        failure[i] = k
+    transitions = []
+    for state in range(len(marker)):
+        candidates = {marker[state]: state + 1}
+        k = failure[state - 1] if state > 0 else 0
+        while state > 0:
+            candidates.setdefault(marker[k], k + 1)
+            if k == 0:
+                break
+            k = failure[k - 1]
+        transitions.append(list(candidates.items()))
+    return transitions
+
+def marker_matcher(marker, valid, data, trigger):
+    """Sync statements setting trigger (sticky) once marker (bytes) is found in the data stream."""
+    from migen import Signal, If, Case
+    matched = Signal(max=len(marker) + 1)
+    cases   = {}
+    for state, candidates in enumerate(get_marker_transitions(marker)):
+        statement = matched.eq(0)
+        for byte, next_state in reversed(candidates):
+            statement = If(data == byte, matched.eq(next_state)).Else(statement)
+        cases[state] = statement
+    return [
+        If(valid & (matched != len(marker)), Case(matched, cases)),
+        If(matched == len(marker), trigger.eq(1)),
+    ]
+
+def add_snapshot_trigger(soc, point):
+    """Snapshot request (sim_snapshot pad, sticky) at a named point/console string or at cycle:N."""
+    from migen import Signal, If
+    from litex.build.generic_platform import Pins
+    soc.platform.add_extension([("sim_snapshot", 0, Pins(1))])
+    trigger = soc.platform.request("sim_snapshot")
+
+    # Cycle.
+    if point.startswith("cycle:"):
+        cycles = int(point[len("cycle:"):])
+        count  = Signal(64)
+        soc.sync += If(count == cycles, trigger.eq(1)).Else(count.eq(count + 1))
+        return
+
+    # Console string (on the UART TX stream).
+    if not hasattr(soc, "uart_phy"):
+        raise ValueError(f"Snapshot at \"{point}\" requires the UART (simulation console).")
+    sink = soc.uart_phy.sink
+    soc.sync += marker_matcher(snapshot_points.get(point, point).encode(), sink.valid & sink.ready, sink.data, trigger)
+
+def create_snapshot_core(directory):
+    """Copy of the LiteX Verilator simulation core with snapshot support, return its directory."""
+    import shutil
+    from litex.build.sim import verilator
+    core = os.path.join(directory, "snapshot_core")
+    shutil.rmtree(core, ignore_errors=True)
+    shutil.copytree(verilator.core_directory, core)
+    for filename, patches in snapshot_core_patches.items():
+        path = os.path.join(core, filename)
+        with open(path) as f:
+            content = f.read()
+        for anchor, replacement in patches:
+            if anchor not in content:
+                raise OSError(f"Unsupported LiteX simulation core, {anchor!r} not found in {filename}.")
+            content = content.replace(anchor, replacement, 1)
+        with open(path, "w") as f:
+            f.write(content)
+    return core
+
+def run_vsim(gateware_dir, env, as_root=False, interactive=True):
+    """Run the built simulation of gateware_dir with env, return its exit code."""
+    import subprocess
+    command = ["env"] + [f"{k}={v}" for k, v in env.items()] + ["obj_dir/Vsim"]
+    if as_root:
+        command = ["sudo"] + command
+    settings = None
+    if interactive and sys.stdin.isatty():
+        import termios
+        settings = termios.tcgetattr(sys.stdin.fileno())
+    try:
+        return subprocess.call(command, cwd=gateware_dir)
+    finally:
+        if settings is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSAFLUSH, settings)
+
+def restore(snapshot, interactive=True):
+    """Run the simulation a snapshot was saved from, starting from the snapshot."""
+    with open(snapshot + ".json") as f:
+        info = json.load(f)
+    if not os.path.exists(os.path.join(info["gateware_dir"], "obj_dir", "Vsim")):
+        print("Simulation of {} not found in {}.".format(snapshot, info["gateware_dir"]))
+        return 1
+    if os.stat(os.path.join(info["gateware_dir"], "obj_dir", "Vsim")).st_mtime > os.stat(snapshot).st_mtime:
+        print(f"Warning: simulation rebuilt since {snapshot} was saved, the snapshot may not restore.")
+    return run_vsim(info["gateware_dir"], {"LITEX_SIM_RESTORE": os.path.abspath(snapshot)},
+        info["as_root"], interactive)
+
+@contextlib.contextmanager
+def snapshot_hook(snapshot, point):
+    """Build the simulation with snapshot support, run it until point and save snapshot."""
+    from litex.build.sim import verilator
+    from litex_boards.tools.hooks import patch
+
+    snapshot = os.path.abspath(snapshot)
+
+    def snapshot_build(build):
+        def _build(self, platform, fragment, build_dir="build", **kwargs):
+            if int(kwargs.get("threads", 1)) > 1:
+                raise ValueError("Snapshots require a single threaded simulation (--threads=1).")
+            core = create_snapshot_core(os.path.abspath(build_dir))
+            with patch(verilator, "core_directory", lambda core_directory: core):
+                return build(self, platform, fragment, build_dir=build_dir, **kwargs)
+        return _build
+
+    def snapshot_run(run_sim):
+        def _run_sim(build_name, as_root=False, interactive=True):
+            # Called from the gateware directory.
+            if os.path.exists(snapshot):
+                os.remove(snapshot)
+            with open(snapshot + ".json", "w") as f:
+                json.dump({"gateware_dir": os.getcwd(), "point": point, "as_root": as_root}, f, indent=4)
+            if run_vsim(os.getcwd(), {"LITEX_SIM_SNAPSHOT": snapshot}, as_root, interactive) != 0:
+                raise OSError("Subprocess failed")
+            if not os.path.exists(snapshot):
+                raise OSError(f"Snapshot point \"{point}\" not reached.")
+        return _run_sim
+
+    with patch(verilator.SimVerilatorToolchain, "build", snapshot_build):
+        with patch(verilator, "_run_sim", snapshot_run):
+            yield
+
+# Hook ---------------------------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def sim_hook(build=True, run=True, interactive=True, ram_init=None, rom_init=None, with_video=False,
+    sdram_model=False, sdram_verbosity=0, snapshot=None, snapshot_at="prompt", **sim_kwargs):
+    """Record the SoCs of the target and build/run their simulation twin instead of the board."""
+    from litex.soc.integration.soc import LiteXSoC
+    from litex.soc.integration.soc_core import SoCCore
+    from litex.soc.integration.builder import Builder
+    from litex_boards.tools.hooks import patch
+
+    records = {}
+
+    def record_init(init):
+        def _init(self, platform, clk_freq, **kwargs):
+            records.setdefault(id(self), SoCRecord(clk_freq, kwargs))
+            return init(self, platform, clk_freq, **kwargs)
+        return _init
+
+    def record_method(method):
+        def _method(self, *args, **kwargs):
+            if id(self) in records:
+                records[id(self)].calls.append((method.__name__, _bind(method, args, kwargs)))
+            return method(self, *args, **kwargs)
+        return _method
+
+    def twin_build(build_):
+        def _build(self, **kwargs):
+            record = records.get(id(self.soc), None)
+            if record is None:
+                return build_(self, **kwargs) # Not a recorded SoC.
+            # Board SoC finalized for its memory map/CSR locations, not built.
+            self.soc.finalize()
+            config = get_soc_config(self.soc)
+            soc, sim_config = create_twin(record, config, ram_init, rom_init, with_video, sdram_model,
+                sdram_verbosity, snapshot_at=None if snapshot is None else snapshot_at)
+            builder = Builder(soc,
+                output_dir       = os.path.join(self.output_dir, "sim"),
+                compile_software = self.compile_software,
+                csr_json         = os.path.join(self.output_dir, "sim", "csr.json"),
+                csr_csv          = os.path.join(self.output_dir, "sim", "csr.csv"),
+            )
+            return build_(builder, sim_config=sim_config, build=build, run=run, interactive=interactive,
+                video=with_video and any(m.startswith("add_video") for m, _ in record.calls), **sim_kwargs)
+        return _build
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch(SoCCore, "__init__", record_init))
+        for name in recorded_methods:
+            stack.enter_context(patch(LiteXSoC, name, record_method))
+        stack.enter_context(patch(Builder, "build", twin_build))
+        if snapshot is not None:
+            stack.enter_context(snapshot_hook(snapshot, snapshot_at))
+        yield records
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards simulation twin of a target.")
+    parser.add_argument("--no-run",          action="store_true", help="Only build the simulation.")
+    parser.add_argument("--non-interactive", action="store_true", help="Run the simulation without user input.")
+    parser.add_argument("--rom-init",        default=None,        help="ROM init file (.bin or .json).")
+    parser.add_argument("--ram-init",        default=None,        help="Main RAM init file (.bin or .json).")
+    parser.add_argument("--video",           action="store_true", help="Simulate video (SDL window).")
+    parser.add_argument("--sdram-model",     action="store_true", help="Use the SDRAM PHY model (board module/geometry/timings) instead of integrated main RAM.")
+    parser.add_argument("--sdram-verbosity", default=0, type=int, help="SDRAM model verbosity (timings checks).")
+    parser.add_argument("--snapshot",        default=None,        help="Run until --snapshot-at and save the simulation state to this file.")
+    parser.add_argument("--snapshot-at",     default="prompt",    help="Snapshot point: prompt, sdram (after SDRAM init), cycle:N or any console string.")
+    parser.add_argument("--restore",         default=None,        help="Run the built simulation from this snapshot (no target build).")
+    parser.add_argument("--threads",         default=1, type=int, help="Verilator threads.")
+    parser.add_argument("--opt-level",       default="O3",        help="Compilation optimization level.")
+    parser.add_argument("--trace",           action="store_true", help="Enable tracing.")
+    parser.add_argument("--trace-fst",       action="store_true", help="Enable FST tracing.")
+    parser.add_argument("target", nargs="?",                      help="Target name (ex: digilent_arty) or module.")
+    parser.add_argument("args", nargs=argparse.REMAINDER,         help="Target arguments.")
+    args = parser.parse_args()
+
+    if args.restore is not None:
+        sys.exit(restore(args.restore, interactive=not args.non_interactive))
+    if args.target is None:
+        parser.error("the following arguments are required: target")
+
+    from litex_boards.tools.run import get_module
+    hook = sim_hook(
+        run             = not args.no_run,
+        interactive     = not args.non_interactive,
+        ram_init        = args.ram_init,
+        rom_init        = args.rom_init,
+        with_video      = args.video,
+        sdram_model     = args.sdram_model,
+        sdram_verbosity = args.sdram_verbosity,
+        snapshot        = args.snapshot,
+        snapshot_at     = args.snapshot_at,
+        threads         = args.threads,
+        opt_level       = args.opt_level,
+        trace           = args.trace or args.trace_fst,
+        trace_fst       = args.trace_fst,
+    )
+    target_args = args.args if "--build" in args.args else args.args + ["--build"]
+    sys.exit(elaborate.run_target(get_module(args.target), target_args, [hook]))
+
+if __name__ == "__main__":
+    main()
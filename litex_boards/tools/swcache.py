@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Software Cache: content-hashed object cache shared by the software builds (BIOS, libbase,
+# libcompiler_rt, liblitedram...) of all targets. The compiler is wrapped through the CCACHE variable
+# of the LiteX software Makefiles: objects are keyed on the compiler, its flags and the preprocessed
+# source (with the build directory normalized), so targets with the same CPU type/variant only
+# recompile the files depending on their generated headers (csr.h, mem.h, soc.h...).
+#
+# Cached objects are reused across build directories: their debug information may refer to the
+# build directory of the target that compiled them first.
+#
+# python3 -m litex_boards.tools.run --software-cache digilent_arty --build
+# python3 -m litex_boards.tools.matrix --targets --software-cache=build/software_cache
+# python3 -m litex_boards.tools.swcache --stats                                    (cache statistics)
+# python3 -m litex_boards.tools.swcache --clear                                    (clear cache)
+
+import os
+import sys
+import shlex
+import shutil
+import hashlib
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+# Parameters ---------------------------------------------------------------------------------------
+
+default_cache_dir = os.environ.get("LITEX_BOARDS_SOFTWARE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "software"))
+
+source_extensions = (".c", ".cc", ".cpp", ".cxx", ".S", ".s")
+
+# Options followed by a separate value.
+value_options = ["-o", "-MF", "-MT", "-MQ", "-I", "-D", "-U", "-x", "-include", "-imacros", "-isystem",
+    "-iquote", "-target"]
+
+# Dependency options, removed from the key and regenerated by the preprocessor.
+dependency_options = ["-MD", "-MMD", "-MP"]
+dependency_value_options = ["-MF", "-MT", "-MQ"]
+
+# Command ------------------------------------------------------------------------------------------
+
+def parse_command(args):
+    """Return (flags, source, output, depfile) of a compile command, None when not cacheable."""
+    flags, sources, output, depfile = [], [], None, None
+    with_deps = False
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in value_options and i + 1 < len(args):
+            value = args[i + 1]
+            i += 2
+            if arg == "-o":
+                output = value
+            elif arg == "-MF":
+                depfile = value
+            elif arg not in dependency_value_options:
+                flags += [arg, value]
+            continue
+        i += 1
+        if arg in dependency_options:
+            with_deps = True
+        elif (not arg.startswith("-")) and arg.endswith(source_extensions):
+            sources.append(arg)
+        else:
+            flags.append(arg)
+    # Only single source compilations to an object.
+    if "-c" not in flags or len(sources) != 1 or output is None:
+        return None
+    if with_deps and depfile is None:
+        depfile = os.path.splitext(output)[0] + ".d"
+    return flags, sources[0], output, depfile if with_deps else None
+
+def get_compiler_id(compiler):
+    # Compiler identified by its path/size/mtime (as ccache's default compiler check).
+    path = shutil.which(compiler) or compiler
+    st   = os.stat(path)
+    return f"{os.path.realpath(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+def get_build_root():
+    # Software directory of the target (build/<target>/software), exported by the Makefiles.
+    buildinc = os.environ.get("BUILDINC_DIRECTORY", None)
+    return None if buildinc is None else os.path.dirname(os.path.abspath(buildinc))
+
+def normalize(data, build_root):
+    if build_root is None:
+        return data
+    return data.replace(build_root.encode(), b"<build>")
+
+def get_key(compiler, args):
+    """Hash of a compilation (writes the dependency file), None when not cacheable."""
+    command = parse_command(args)
+    if command is None:
+        return None
+    flags, source, output, depfile = command
+    build_root = get_build_root()
+
+    # Preprocess (with macros definitions since objects embed them with -g3).
+    cmd = [compiler] + [f for f in flags if f != "-c"] + ["-E", "-dD", source]
+    if depfile is not None:
+        cmd += ["-MD", "-MF", depfile, "-MT", output] + (["-MP"] if "-MP" in args else [])
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    if p.returncode != 0:
+        return None
+
+    h = hashlib.sha256()
+    h.update(get_compiler_id(compiler).encode())
+    h.update(normalize(shlex.join(flags).encode(), build_root))
+    h.update(os.path.splitext(source)[1].encode())
+    h.update(normalize(p.stdout, build_root))
+    return h.hexdigest()
+
+# Cache --------------------------------------------------------------------------------------------
+
+def object_filename(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key[2:] + ".o")
+
+def record_stat(stat):
+    stats = os.environ.get("LITEX_BOARDS_SOFTWARE_CACHE_STATS", None)
+    if stats is not None:
+        with open(stats, "a") as f:
+            f.write(stat + "\n")
+
+def run_compiler(compiler, args, cache_dir=default_cache_dir):
+    """Run compiler with args, reusing/storing the object from/to cache_dir."""
+    key = get_key(compiler, args)
+    if key is None:
+        return subprocess.call([compiler] + args)
+    output   = parse_command(args)[2]
+    filename = object_filename(cache_dir, key)
+
+    # Hit.
+    if os.path.exists(filename):
+        shutil.copyfile(filename, output)
+        record_stat("hit")
+        return 0
+
+    # Miss: compile and store.
+    returncode = subprocess.call([compiler] + args)
+    if returncode == 0 and os.path.exists(output):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename))
+        os.close(fd)
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, filename)
+        record_stat("miss")
+    return returncode
+
+# Hook ---------------------------------------------------------------------------------------------
+
+def get_environ(cache_dir=default_cache_dir, stats=None):
+    """Environment variables enabling the cache in the LiteX software Makefiles."""
+    environ = {
+        "CCACHE"                          : f"{shlex.quote(sys.executable)} {shlex.quote(os.path.abspath(__file__))}",
+        "LITEX_BOARDS_SOFTWARE_CACHE_DIR" : os.path.abspath(cache_dir),
+    }
+    if stats is not None:
+        environ["LITEX_BOARDS_SOFTWARE_CACHE_STATS"] = os.path.abspath(stats)
+    return environ
+
+def read_stats(stats):
+    if not os.path.exists(stats):
+        return {"hit": 0, "miss": 0}
+    with open(stats) as f:
+        lines = f.read().split()
+    return {"hit": lines.count("hit"), "miss": lines.count("miss")}
+
+@contextlib.contextmanager
+def software_cache(cache_dir=default_cache_dir):
+    """Enable the software cache for the builds of the context (including sub-processes)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        stats   = os.path.join(tmp, "stats")
+        environ = get_environ(cache_dir, stats)
+        saved   = {k: os.environ.get(k, None) for k in environ}
+        os.environ.update(environ)
+        try:
+            yield stats
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    del os.environ[k]
+                else:
+                    os.environ[k] = v
+            stats = read_stats(stats)
+            if stats["hit"] or stats["miss"]:
+                print(f"Software cache: {stats['hit']} hits, {stats['miss']} misses.")
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    # Compiler wrapper: swcache.py <compiler> <args> (as set in CCACHE).
+    if len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+        cache_dir = os.environ.get("LITEX_BOARDS_SOFTWARE_CACHE_DIR", default_cache_dir)
+        sys.exit(run_compiler(sys.argv[1], sys.argv[2:], cache_dir))
+
+    parser = argparse.ArgumentParser(description="LiteX-Boards software objects cache.")
+    parser.add_argument("--cache-dir", default=default_cache_dir, help="Cache directory.")
+    parser.add_argument("--stats",     action="store_true",       help="Show cache statistics.")
+    parser.add_argument("--clear",     action="store_true",       help="Clear the cache.")
+    args = parser.parse_args()
+
+    if args.clear:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+    if args.stats:
+        objects = [os.path.join(root, f) for root, _, files in os.walk(args.cache_dir) for f in files]
+        size    = sum(os.path.getsize(f) for f in objects)
+        print(f"{args.cache_dir}: {len(objects)} objects, {size/1e6:.1f}MB.")
+
+if __name__ == "__main__":
+    main()
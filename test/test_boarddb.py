@@ -0,0 +1,43 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from litex_boards import boarddb
+
+db = {"version": boarddb.db_version, "boards": {
+    "test_board": {
+        "family"     : "Xilinx7SeriesPlatform",
+        "device"     : "xc7a35ticsg324-1L",
+        "tables"     : {
+            "_io"      : {"io": [["clk100", 0, None, ["E3"], "LVCMOS33", []]], "connectors": ["_connectors"]},
+            "_io_v2_0" : {"io": [["serial", 0, "tx", ["pmoda:0"], "LVCMOS33", ["DRIVE=8"]]], "connectors": ["_connectors", "_connectors_v2_0"]},
+        },
+        "extensions" : {"_sdcard_io": [["sdcard", 0, "clk", ["pmodb:1"], None, []]]},
+        "connectors" : {
+            "_connectors"      : {"pmoda": {"0": "G13", "1": "B11"}},
+            "_connectors_v2_0" : {"pmoda": {"0": "A1"}, "pmodb": {"0": "C1", "1": "pmoda:1"}},
+        },
+    },
+}}
+
+class TestBoardDB(unittest.TestCase):
+    def test_json_binary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            boards = []
+            for name, write in [("boarddb.json", boarddb.write_json), ("boarddb.bin", boarddb.write_binary)]:
+                write(db, os.path.join(tmp, name))
+                boards.append(boarddb.load(os.path.join(tmp, name))["test_board"])
+            for board in boards:
+                self.assertEqual(board.device, "xc7a35ticsg324-1L")
+                self.assertEqual(board.connectors, db["boards"]["test_board"]["connectors"])
+                self.assertEqual([s.pins for s in board.pins("_io_v2_0")], [["A1"]])
+                self.assertEqual([s.misc for s in board.pins("_io_v2_0")], [["DRIVE=8"]])
+                self.assertEqual([s.pins for s in board.pins("_io", "_sdcard_io")], [["B11"]])
+            self.assertEqual(boards[0].tables, boards[1].tables)
+            self.assertEqual(boards[0].extensions, boards[1].extensions)
@@ -0,0 +1,87 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import time
+import tempfile
+import unittest
+
+from litex_boards.tools import cache
+
+module   = "litex_boards.targets.digilent_arty"
+versions = {"litex": "2023.08"}
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, filename, content):
+        filename = os.path.join(self.tmp.name, filename)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w") as f:
+            f.write(content)
+        return filename
+
+    def test_key(self):
+        key = cache.get_key(module, ["--build"], versions, toolchains={})
+        self.assertEqual(key, cache.get_key(module, ["--build", "--output-dir=build/a"], versions, toolchains={}))
+        self.assertNotEqual(key, cache.get_key(module, ["--build", "--variant=a7-100"], versions, toolchains={}))
+        self.assertNotEqual(key, cache.get_key(module, ["--build"], {"litex": "2023.12"}, toolchains={}))
+        self.assertNotEqual(key, cache.get_key(module, ["--build"], versions, toolchains={"tools": {"yosys": "a"}}))
+        self.assertEqual(cache.get_sources(module)[1:], [os.path.join(cache.litex_boards_dir, "platforms", "digilent_arty.py")])
+
+    def test_toolchain_versions(self):
+        # Upgrading a toolchain in PATH changes the key of compiling builds only.
+        bin_dir = os.path.join(self.tmp.name, "bin")
+        yosys   = self.write("bin/yosys", "#!/bin/sh\necho 0.30\n")
+        os.chmod(yosys, 0o755)
+        environ = {"PATH": bin_dir, "LITEX_ENV_VIVADO": "/opt/Xilinx/Vivado/2023.2", "HOME": "/home/user"}
+        versions = cache.get_toolchain_versions(["--build"], environ)
+        self.assertEqual(list(versions["tools"]), ["yosys"])
+        self.assertEqual(versions["environ"], {"PATH": bin_dir, "LITEX_ENV_VIVADO": "/opt/Xilinx/Vivado/2023.2"})
+        self.assertEqual(list(cache.get_toolchain_versions(["--build", "--no-compile-gateware"], environ)["tools"]), [])
+        self.assertEqual(cache.get_toolchain_versions(["--build", "--no-compile"], environ), {})
+        with open(yosys, "w") as f:
+            f.write("#!/bin/sh\necho 0.40 (upgraded)\n")
+        os.utime(yosys, (time.time() + 10, time.time() + 10))
+        self.assertNotEqual(versions, cache.get_toolchain_versions(["--build"], environ))
+        environ["LITEX_ENV_VIVADO"] = "/opt/Xilinx/Vivado/2024.1"
+        self.assertNotEqual(versions["environ"], cache.get_toolchain_versions(["--build"], environ)["environ"])
+
+    def test_store_restore(self):
+        gateware_cache = cache.GatewareCache(os.path.join(self.tmp.name, "cache"))
+        build_a = os.path.join(self.tmp.name, "build_a")
+        self.write("build_a/gateware/top.v", "module top();\nendmodule\n")
+        self.write("build_a/software/include/generated/variables.mak", f"BUILDINC_DIRECTORY={build_a}/software/include\n")
+        self.assertFalse(gateware_cache.restore("a0"*32, build_a))
+        gateware_cache.store("a0"*32, build_a, module=module, args=[])
+        # Restored to another output directory, absolute paths relocated.
+        build_b = os.path.join(self.tmp.name, "build_b")
+        self.assertTrue(gateware_cache.restore("a0"*32, build_b))
+        with open(os.path.join(build_b, "gateware", "top.v")) as f:
+            self.assertEqual(f.read(), "module top();\nendmodule\n")
+        with open(os.path.join(build_b, "software", "include", "generated", "variables.mak")) as f:
+            self.assertEqual(f.read(), f"BUILDINC_DIRECTORY={build_b}/software/include\n")
+        self.assertEqual(gateware_cache.stats()["stores"], 1)
+
+    def test_evict(self):
+        gateware_cache = cache.GatewareCache(os.path.join(self.tmp.name, "cache"))
+        keys = [f"{i:02x}"*32 for i in range(3)]
+        for i, key in enumerate(keys):
+            self.write(f"build_{i}/gateware/top.v", "x"*1000)
+            gateware_cache.store(key, os.path.join(self.tmp.name, f"build_{i}"))
+            # Distinct use times (mtime of meta.json).
+            meta = os.path.join(gateware_cache.entry_dir(key), "meta.json")
+            os.utime(meta, (time.time() - 100 + i, time.time() - 100 + i))
+        self.assertEqual(gateware_cache.size(), 3000)
+        # Restoring marks the oldest entry as recently used: the second one is evicted first.
+        self.assertTrue(gateware_cache.restore(keys[0], os.path.join(self.tmp.name, "build")))
+        self.assertEqual(gateware_cache.evict(2000), 1)
+        self.assertEqual(sorted(key for key, meta, mtime in gateware_cache.entries()), [keys[0], keys[2]])
+        self.assertEqual(gateware_cache.stats()["evictions"], 1)
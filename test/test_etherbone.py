@@ -0,0 +1,203 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import struct
+import tempfile
+import unittest
+import importlib.util
+
+from litex_boards.tools import etherbone
+from litex_boards.tools.etherbone import encode_packet, decode_packet, MemoryMap, EtherboneServer
+
+litex_spec = importlib.util.find_spec("litex")
+
+csr_csv = """\
+#--------------------------------------------------------------------------------
+# Auto-generated by LiteX (--------) on 2023-01-01 00:00:00
+#--------------------------------------------------------------------------------
+csr_base,ctrl,0xf0000000,,
+constant,config_csr_data_width,32,,
+memory_region,rom,0x00000000,131072,cached
+memory_region,sram,0x10000000,8192,cached
+memory_region,csr,0xf0000000,65536,io
+csr_register,ctrl_reset,0xf0000000,1,rw
+csr_register,ctrl_scratch,0xf0000004,1,rw
+csr_register,ctrl_bus_errors,0xf0000008,1,ro
+csr_register,timer0_value,0xf0002818,2,ro
+"""
+
+csr_json = {
+    "csr_bases" : {"ctrl": 0xf0000000},
+    "constants" : {"config_csr_data_width": 32},
+    "memories"  : {
+        "rom"  : {"base": 0x00000000, "size": 131072, "type": "cached"},
+        "sram" : {"base": 0x10000000, "size": 8192,   "type": "cached"},
+        "csr"  : {"base": 0xf0000000, "size": 65536,  "type": "io"},
+    },
+    "csr_registers" : {
+        "ctrl_reset"      : {"addr": 0xf0000000, "size": 1, "type": "rw"},
+        "ctrl_scratch"    : {"addr": 0xf0000004, "size": 1, "type": "rw"},
+        "ctrl_bus_errors" : {"addr": 0xf0000008, "size": 1, "type": "ro"},
+        "timer0_value"    : {"addr": 0xf0002818, "size": 2, "type": "ro"},
+    },
+}
+
+def get_memory_map():
+    return MemoryMap(
+        regions   = {"sram": (0x10000000, 8192, "cached"), "csr": (0xf0000000, 65536, "io")},
+        registers = {
+            "ctrl_scratch"    : (0xf0000004, 1, "rw"),
+            "ctrl_bus_errors" : (0xf0000008, 1, "ro"),
+        })
+
+class TestEtherbone(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.socket.close()
+
+    def get_server(self, memory):
+        server = EtherboneServer(memory, port=0)
+        self.servers.append(server)
+        return server
+
+    def test_packet(self):
+        for addr_size, base in [(4, 0x10000000), (8, 0x1_2345_6780)]:
+            with self.subTest(addr_size=addr_size):
+                records = [
+                    (base, [0, 1, 0xffffffff], 0, []),
+                    (0, [], base + 0x100, [base, base + 4, 2**(8*addr_size) - 4]),
+                    (base + 8, [0xdeadbeef], base + 0x200, [base + 8]),
+                ]
+                data = encode_packet(records, addr_size)
+                probe, probe_reply, size, decoded = decode_packet(data)
+                self.assertEqual((probe, probe_reply, size), (False, False, addr_size))
+                self.assertEqual([(r.base_addr, list(r.writes), r.base_ret_addr, list(r.reads)) for r in decoded], records)
+                self.assertEqual([r.flags for r in decoded], [0, 0, 0])
+
+    def test_probe(self):
+        for addr_size in [4, 8]:
+            for probe, probe_reply in [(True, False), (False, True)]:
+                data = encode_packet(addr_size=addr_size, probe=probe, probe_reply=probe_reply)
+                self.assertEqual(len(data), etherbone.packet_header.size + 4)
+                self.assertEqual(decode_packet(data), (probe, probe_reply, addr_size, []))
+
+    def test_invalid_packet(self):
+        data = bytearray(encode_packet([(0, [1], 0, [])]))
+        data[0] = 0x00
+        with self.assertRaises(ValueError):
+            decode_packet(bytes(data))
+        data = etherbone.packet_header.pack(etherbone.etherbone_magic, 0x10, (2 << 4) | 4)
+        with self.assertRaises(ValueError):
+            decode_packet(data)
+
+    def test_memory_map(self):
+        memory = get_memory_map()
+        # Reset values.
+        self.assertEqual(memory.read(0xf0000004), 0x12345678)
+        memory.write(0xf0000004, 0xcafe)
+        self.assertEqual(memory.read(0xf0000004), 0xcafe)
+        # Read-only CSRs: writes ignored.
+        memory.write(0xf0000008, 0x5)
+        self.assertEqual(memory.read(0xf0000008), 0)
+        # Memory regions.
+        memory.write(0x10001ffc, 0x1_0000_0001)
+        self.assertEqual(memory.read(0x10001ffc), 0x1)
+        self.assertEqual(memory.stats["unmapped"], 0)
+        # Outside the map: counted.
+        memory.write(0x10002000, 0x7)
+        self.assertEqual(memory.read(0x10002000), 0x7)
+        memory.read(0x20000000)
+        self.assertEqual(memory.stats, {"reads": 6, "writes": 4, "readonly": 1, "unmapped": 3})
+
+    def test_csr_data_width(self):
+        memory = MemoryMap({}, {"ctrl_scratch": (0xf0000004, 4, "rw")}, {"config_csr_data_width": "8"})
+        self.assertEqual([memory.read(0xf0000004 + 4*i) for i in range(4)], [0x12, 0x34, 0x56, 0x78])
+
+    def test_load_memory_map(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, content in [("csr.csv", csr_csv), ("csr.json", json.dumps(csr_json))]:
+                with self.subTest(name=name):
+                    filename = os.path.join(tmp, name)
+                    with open(filename, "w") as f:
+                        f.write(content)
+                    memory = etherbone.load_memory_map(filename)
+                    self.assertEqual(memory.regions["sram"], (0x10000000, 8192, "cached"))
+                    self.assertEqual(memory.registers["timer0_value"], (0xf0002818, 2, "ro"))
+                    self.assertEqual(memory.readonly, {0xf0000008, 0xf0002818, 0xf000281c})
+                    self.assertEqual(memory.read(0xf0000004), 0x12345678)
+                    self.assertEqual(memory.get_region(), (0x10000000, 8192))
+                    self.assertEqual(memory.get_region("rom"), (0, 131072))
+
+    def test_handle(self):
+        memory = get_memory_map()
+        server = self.get_server(memory)
+        # Writes: no reply.
+        self.assertIsNone(server.handle(encode_packet([(0x10000000, [1, 2, 3], 0, [])])))
+        # Reads: reply with the values written at base_ret_addr.
+        reply = server.handle(encode_packet([(0xf0000008, [4], 0x40, [0x10000000, 0x10000008, 0xf0000004, 0xf0000008])]))
+        probe, probe_reply, addr_size, records = decode_packet(reply)
+        self.assertEqual((probe, probe_reply, addr_size), (False, False, 4))
+        self.assertEqual(len(records), 1)
+        self.assertEqual((records[0].base_addr, records[0].writes), (0x40, (1, 3, 0x12345678, 0)))
+        self.assertEqual(records[0].reads, ())
+        self.assertEqual(memory.stats["readonly"], 1)
+        # Probe.
+        self.assertEqual(decode_packet(server.handle(encode_packet(probe=True))), (False, True, 4, []))
+        # Malformed packets: dropped and counted.
+        self.assertIsNone(server.handle(b"\x00\x01"))
+        self.assertIsNone(server.handle(bytes(16)))
+        self.assertEqual(server.stats["malformed"], 2)
+
+    def test_handle_wff(self):
+        memory = get_memory_map()
+        server = self.get_server(memory)
+        # Write FIFO: all writes at base_addr, last one kept.
+        data  = etherbone.packet_header.pack(etherbone.etherbone_magic, 1 << 4, (4 << 4) | 4)
+        data += etherbone.record_header.pack(etherbone.record_wff, 0x0f, 3, 0)
+        data += struct.pack(">4I", 0x10000010, 5, 6, 7)
+        self.assertIsNone(server.handle(data))
+        self.assertEqual(memory.words, {0xf0000004: 0x12345678, 0x10000010: 7})
+        self.assertEqual(memory.stats["writes"], 3)
+
+    def test_handle_addr64(self):
+        base   = 0x1_0000_0000
+        memory = MemoryMap({"main_ram": (base, 2**20, "cached")}, {})
+        server = self.get_server(memory)
+        server.handle(encode_packet([(base + 0x10, [0xa, 0xb], 0, [])], addr_size=8))
+        _, _, addr_size, records = decode_packet(server.handle(encode_packet([(0, [], base, [base + 0x10, base + 0x14, 0x10])], addr_size=8)))
+        self.assertEqual(addr_size, 8)
+        self.assertEqual((records[0].base_addr, records[0].writes), (base, (0xa, 0xb, 0)))
+        self.assertEqual(memory.stats["unmapped"], 1)
+
+    @unittest.skipIf(litex_spec is None, "LiteX not installed")
+    def test_litex_interop(self):
+        from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord, EtherboneWrites, EtherboneReads
+        for addr_size, base in [(4, 0x10000000), (8, 0x1_0000_0000)]:
+            with self.subTest(addr_size=addr_size):
+                # LiteX packet decoded.
+                record        = EtherboneRecord(addr_size)
+                record.writes = EtherboneWrites(addr_size=addr_size, base_addr=base, datas=[1, 2, 3])
+                record.wcount = 3
+                record.reads  = EtherboneReads(addr_size=addr_size, base_ret_addr=0x2000, addrs=[base + 0x10, base + 0x14])
+                record.rcount = 2
+                packet = EtherbonePacket(addr_size*8)
+                packet.records = [record]
+                packet.encode()
+                _, _, size, records = decode_packet(bytes(packet.bytes))
+                self.assertEqual(size, addr_size)
+                self.assertEqual(records, [etherbone.Record(0, base, (1, 2, 3), 0x2000, (base + 0x10, base + 0x14))])
+
+                # Packet decoded by LiteX.
+                packet = EtherbonePacket(init=encode_packet([(base, [4, 5], 0x2000, [base + 0x20])], addr_size))
+                packet.decode()
+                self.assertEqual(packet.records[0].writes.base_addr, base)
+                self.assertEqual(packet.records[0].writes.get_datas(), [4, 5])
+                self.assertEqual(packet.records[0].reads.get_addrs(), [base + 0x20])
@@ -0,0 +1,74 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.tools.fmax import parse_nextpnr_timing, FmaxSearch
+
+# Nextpnr (ECP5) log excerpt: pre-routing estimate, then post-routing report.
+nextpnr_log = """\
+Info: Max frequency for clock '$glbnet$crg_clkout': 71.08 MHz (PASS at 60.00 MHz)
+Info: Max frequency for clock '$glbnet$eth_clocks_rx$TRELLIS_IO_IN': 131.53 MHz (PASS at 125.00 MHz)
+
+Info: Max delay <async>                                   -> posedge $glbnet$crg_clkout: 3.11 ns
+Info: Routing globals...
+Info: Router2 time 12.43s
+Info: Max frequency for clock '$glbnet$crg_clkout': 58.32 MHz (FAIL at 60.00 MHz)
+Info: Max frequency for clock '$glbnet$eth_clocks_rx$TRELLIS_IO_IN': 127.84 MHz (PASS at 125.00 MHz)
+
+Info: Max delay <async>                                   -> posedge $glbnet$crg_clkout: 3.42 ns
+Info: Program finished normally.
+"""
+
+def run_search(search, fmax, njobs):
+    # Builds meet timing up to fmax.
+    rounds = 0
+    while True:
+        freqs = search.next_freqs(njobs)
+        if not freqs:
+            return rounds
+        rounds += 1
+        search.update([{"freq": f, "timing_met": f <= fmax} for f in freqs])
+
+class TestFmax(unittest.TestCase):
+    def test_parse_nextpnr_timing(self):
+        clocks = parse_nextpnr_timing(nextpnr_log)
+        self.assertEqual(clocks, {
+            "$glbnet$crg_clkout"                   : {"fmax": 58.32e6,  "target": 60e6,  "passed": False},
+            "$glbnet$eth_clocks_rx$TRELLIS_IO_IN"  : {"fmax": 127.84e6, "target": 125e6, "passed": True},
+        })
+        self.assertEqual(parse_nextpnr_timing("Info: Program finished normally.\n"), {})
+
+    def test_search(self):
+        for fmax, njobs in [(73.4e6, 4), (199e6, 8), (25.5e6, 1), (110e6, 3)]:
+            with self.subTest(fmax=fmax, njobs=njobs):
+                search = FmaxSearch("target", "", fmin=25e6, fmax=200e6, resolution=1e6)
+                rounds = run_search(search, fmax, njobs)
+                # Converged on the [highest passing, lowest failing] bracket.
+                self.assertLessEqual(search.low, fmax)
+                self.assertGreater(search.high, fmax)
+                self.assertLessEqual(search.high - search.low, 1e6)
+                self.assertEqual(search.max_passing, search.low)
+                self.assertLessEqual(rounds, 10)
+                freqs = [run["freq"] for run in search.runs]
+                self.assertEqual(len(freqs), len(set(freqs)))
+
+    def test_search_bounds(self):
+        # All frequencies passing: search stops after the first round (upper bound passing).
+        search = FmaxSearch("target", "", fmin=25e6, fmax=100e6)
+        self.assertEqual(run_search(search, 1e9, 4), 1)
+        self.assertEqual(search.max_passing, 100e6)
+        # None passing: no further rounds.
+        search = FmaxSearch("target", "", fmin=25e6, fmax=100e6)
+        self.assertEqual(run_search(search, 1e6, 4), 1)
+        self.assertIsNone(search.max_passing)
+
+    def test_sweep(self):
+        search = FmaxSearch("target", "", freqs=[50e6, 60e6, 70e6])
+        self.assertEqual(search.next_freqs(1), [50e6, 60e6, 70e6])
+        search.update([{"freq": f, "timing_met": f <= 60e6} for f in [50e6, 60e6, 70e6]])
+        self.assertEqual(search.next_freqs(1), [])
+        self.assertEqual(search.max_passing, 60e6)
@@ -0,0 +1,83 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import importlib.util
+
+litex_spec = importlib.util.find_spec("litex")
+
+_io = [
+    ("clk100",   0, "A1"),
+    ("user_led", 0, "A2"),
+]
+
+_connectors = [
+    ("pmoda", "B1 B2 B3 B4 - B5 B6 B7"),
+    ("pmodb", "C1 C2 C3 C4 - C5 C6 C7"),
+]
+
+def get_io():
+    from litex.build.generic_platform import Pins
+    return [(name, number, Pins(pins)) for name, number, pins in _io]
+
+def pmod_io(pmod):
+    from litex.build.generic_platform import Pins, Subsignal
+    return [
+        ("pmod_led", 0, Pins(f"{pmod}:0")),
+        ("pmod_spi", 0, Subsignal("clk", Pins(f"{pmod}:1")), Subsignal("mosi", Pins(f"{pmod}:2 {pmod}:3"))),
+    ]
+
+@unittest.skipIf(litex_spec is None, "LiteX not installed")
+class TestIOTable(unittest.TestCase):
+    # Connector cache/index are opt-in (--indexed-io): platforms keep the LiteX managers otherwise.
+    def test_opt_in_scope(self):
+        from litex.build.generic_platform import GenericPlatform, ConstraintManager, ConnectorManager
+        from litex_boards.iotable import IndexedConstraintManager, CachedConnectorManager, indexed_io_hook, add_extensions
+        io = get_io()
+        platform = GenericPlatform("device", io, _connectors)
+        self.assertIs(type(platform.constraint_manager), ConstraintManager)
+        self.assertIs(type(platform.constraint_manager.connector_manager), ConnectorManager)
+        with indexed_io_hook():
+            platforms = [GenericPlatform("device", io, _connectors) for _ in range(2)]
+        for platform in platforms:
+            self.assertIsInstance(platform.constraint_manager, IndexedConstraintManager)
+            self.assertIsInstance(platform.constraint_manager.connector_manager, CachedConnectorManager)
+        # Connector pins resolved on an instance are shared with the other instances.
+        add_extensions(platforms[0], [pmod_io("pmoda")])
+        self.assertEqual(platforms[1].constraint_manager.connector_manager.table.resolved["pmoda:2"], "B3")
+        self.assertIs(type(GenericPlatform("device", io, _connectors).constraint_manager), ConstraintManager)
+
+    def test_constraint_manager_attributes(self):
+        # Same state as the LiteX ConstraintManager (initialized by it).
+        from litex.build.generic_platform import ConstraintManager
+        from litex_boards.iotable import IndexedConstraintManager
+        io = get_io()
+        cm, icm = ConstraintManager(io, _connectors), IndexedConstraintManager(io, _connectors)
+        self.assertLessEqual(set(vars(cm)), set(vars(icm)))
+        self.assertEqual(icm.available, cm.available)
+        self.assertEqual(icm.connector_manager.connector_table, cm.connector_manager.connector_table)
+
+    def test_add_extensions(self):
+        from litex.build.generic_platform import GenericPlatform, Pins
+        from litex_boards.iotable import indexed_io_hook, add_extensions
+        def get_platform(indexed):
+            if indexed:
+                with indexed_io_hook():
+                    return GenericPlatform("device", get_io(), _connectors)
+            return GenericPlatform("device", get_io(), _connectors)
+        for indexed in [False, True]:
+            with self.subTest(indexed=indexed):
+                platform = get_platform(indexed)
+                add_extensions(platform, [pmod_io("pmoda"), pmod_io("pmodb"), [("bad", 0, Pins("pmodz:0"))]])
+                available = platform.constraint_manager.available
+                # Same order as adding the concatenation, connector pins resolved.
+                self.assertEqual([(r[0], r[1]) for r in available], [
+                    ("clk100", 0), ("user_led", 0), ("pmod_led", 0), ("pmod_spi", 0), ("pmod_led", 0), ("pmod_spi", 0), ("bad", 0)])
+                self.assertEqual(available[3][3].constraints[0].identifiers, ["B3", "B4"])
+                self.assertEqual(available[4][2].identifiers, ["C1"])
+                # Unknown connectors kept unresolved (LiteX reports them on request).
+                self.assertEqual(available[6][2].identifiers, ["pmodz:0"])
+                self.assertEqual(len(platform.request("pmod_spi").mosi), 2)
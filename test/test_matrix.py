@@ -0,0 +1,68 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import random
+import tempfile
+import unittest
+
+from litex_boards.tools import matrix
+
+def get_jobs(names):
+    return [matrix.Job("target", name, f"litex_boards.targets.{name}", [], os.path.join("build", name)) for name in names]
+
+class TestMatrix(unittest.TestCase):
+    def test_sort_jobs(self):
+        jobs  = get_jobs(["a", "b", "c", "d", "e"])
+        costs = {"target/a": 10.0, "target/b": 30.0, "target/e": 20.0}
+        # Longest first, ties by key, c/d without history cost the median (20s).
+        self.assertEqual([job.name for job in matrix.sort_jobs(jobs, costs)], ["b", "c", "d", "e", "a"])
+        # No history: deterministic order.
+        self.assertEqual([job.name for job in matrix.sort_jobs(jobs[::-1], {})], ["a", "b", "c", "d", "e"])
+
+    def test_shard_jobs(self):
+        rng   = random.Random(0)
+        jobs  = get_jobs([f"t{i:03d}" for i in range(100)])
+        costs = {job.key: rng.uniform(1, 100) for job in jobs}
+        for nshards in [1, 3, 4, 7]:
+            with self.subTest(nshards=nshards):
+                shards = [matrix.shard_jobs(jobs, costs, shard, nshards) for shard in range(nshards)]
+                # All jobs covered exactly once.
+                keys = [job.key for shard in shards for job in shard]
+                self.assertEqual(sorted(keys), sorted(job.key for job in jobs))
+                # Balanced: loads within the largest job cost.
+                loads = [sum(costs[job.key] for job in shard) for shard in shards]
+                self.assertLessEqual(max(loads) - min(loads), max(costs.values()))
+                self.assertAlmostEqual(max(loads), matrix.estimate_duration(jobs, costs, nshards))
+
+    def test_critical_path(self):
+        results = [
+            {"kind": "target", "name": "a", "duration": 50.0, "finished": 60.0},
+            {"kind": "target", "name": "b", "duration": 20.0, "finished": 80.0},
+            {"kind": "target", "name": "c", "duration": 10.0, "finished": 30.0},
+            {"kind": "target", "name": "d", "duration": 0.0}, # Not run.
+        ]
+        self.assertEqual(matrix.get_critical_path(results, njobs=2), {
+            "last"    : "target/b",
+            "start"   : 60.0,
+            "finish"  : 80.0,
+            "longest" : "target/a",
+            "bound"   : 50.0,
+        })
+        self.assertEqual(matrix.get_critical_path(results, njobs=1)["bound"], 80.0)
+        self.assertIsNone(matrix.get_critical_path(results[3:], njobs=1))
+
+    def test_update_costs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "costs.json")
+            def result(name, duration, **kwargs):
+                return dict(kind="target", name=name, passed=True, duration=duration, **kwargs)
+            matrix.update_costs(filename, [result("a", 10.0), result("b", 5.0)])
+            matrix.update_costs(filename, [result("a", 20.0), result("b", 1.0, cache="hit"),
+                dict(result("c", 3.0), passed=False)])
+            with open(filename) as f:
+                self.assertEqual(json.load(f), {"target/a": 15.0, "target/b": 5.0})
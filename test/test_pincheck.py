@@ -0,0 +1,57 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+import importlib.util
+
+litex_spec = importlib.util.find_spec("litex")
+
+# Xilinx package pinout excerpt (Pin, Pin Name, Memory Byte Group, Bank, ...).
+package = """\
+Device/Package xc7a35ticsg324 03/16/2015 13:32:05
+
+Pin      Pin Name                  Memory Byte Group  Bank  VCCAUX Group  Super Logic Region  I/O Type  No-Connect
+E3       IO_L12P_T1_MRCC_35        1                  35    NA            NA                  HR        NA
+D9       IO_L6N_T0_VREF_16         0                  35    NA            NA                  HR        NA
+R2       IO_L3P_T0_DQS_34          0                  35    NA            NA                  HR        NA
+C2       IO_L16P_T2_35             2                  35    NA            NA                  HR        NA
+"""
+
+@unittest.skipIf(litex_spec is None, "LiteX not installed")
+class TestPinCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "xc7a35tcsg324pkg.txt"), "w") as f:
+            f.write(package)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_banks(self):
+        from litex.build.generic_platform import Pins, IOStandard, Subsignal
+        from litex_boards.tools import pincheck
+        banks = pincheck.load_xilinx_package(self.tmp.name, "xc7a35ticsg324-1L")
+        self.assertEqual(banks, {"E3": "35", "D9": "35", "R2": "35", "C2": "35"})
+        io = [
+            ("clk100",   0, Pins("E3"), IOStandard("LVCMOS33")),
+            ("user_btn", 0, Pins("D9"), IOStandard("LVCMOS18")),
+            ("spi",      0, Subsignal("clk", Pins("R2")), Subsignal("cs_n", Pins("C2")), IOStandard("LVCMOS33")),
+        ]
+        pins, unresolved = pincheck.get_pins("test", "_io", io, [])
+        self.assertEqual(unresolved, [])
+        issues = pincheck.check_banks(pins, banks)
+        self.assertEqual(issues, [("error", "bank-iostandard", "bank 35 mixes 1.8V: user_btn:0; 3.3V: clk100:0, spi:0:clk, spi:0:cs_n")])
+
+    def test_platform_banks(self):
+        # Device of the platform from the registry index (set on the Platform instances).
+        from litex_boards.tools import pincheck
+        _, issues = pincheck.analyze_platform("digilent_arty", self.tmp.name)
+        banks = [message for _, kind, _, message in issues if kind == "bank-iostandard"]
+        self.assertEqual(banks, ["bank 35 mixes 1.35V: ddram:0:a; 3.3V: clk100:0, cpu_reset:0, user_btn:0"])
+        _, issues = pincheck.analyze_platform("digilent_arty")
+        self.assertEqual([i for i in issues if i[1] == "bank-iostandard"], [])
@@ -0,0 +1,50 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import unittest
+import subprocess
+
+import litex_boards
+from litex_boards import registry
+
+class TestRegistry(unittest.TestCase):
+    # Index must be regenerated when platforms/targets are added/modified.
+    def test_index_up_to_date(self):
+        stale = registry.check_index(registry.load_index(registry.index_filename))
+        self.assertEqual(stale, [], "Index is stale, run: python3 -m litex_boards.registry --update")
+
+    def test_index_boards(self):
+        index = registry.generate_index()
+        self.assertEqual(len(litex_boards.boards()), len(index["boards"]))
+        for board in litex_boards.boards():
+            with self.subTest(board=board.name):
+                self.assertEqual(board.name, litex_boards.get(board.name).name)
+                self.assertIsNotNone(board.family)
+                self.assertNotEqual(board.io, [])
+
+    def test_get(self):
+        board = litex_boards.get("digilent_arty")
+        self.assertEqual(board.device,           "xc7a35ticsg324-1L")
+        self.assertEqual(board.default_clk_name, "clk100")
+        self.assertEqual(board.default_clk_freq, 100e6)
+        self.assertEqual(board.toolchain,        "vivado")
+        self.assertEqual(board.variants,         {"variant": ["a7-35", "a7-100"]})
+        self.assertIn("xc7a100tcsg324-1", board.devices)
+        self.assertIn("OpenOCD",          board.programmers)
+        self.assertIn("ddram",            board.io)
+        self.assertIn("digilent_arty",    board.targets)
+        with self.assertRaises(ValueError):
+            litex_boards.get("unknown_board")
+
+    # Registry re-exported lazily: running the module does not import it twice.
+    def test_run_module(self):
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(litex_boards.__file__))))
+        p = subprocess.run([sys.executable, "-W", "error::RuntimeWarning", "-m", "litex_boards.registry", "--check"],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        self.assertEqual(p.returncode, 0, p.stdout)
+        self.assertNotIn("RuntimeWarning", p.stdout)
@@ -0,0 +1,374 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+
+from litex_boards.tools import reports
+
+# Report excerpts ----------------------------------------------------------------------------------
+
+vivado_timing = """\
+------------------------------------------------------------------------------------------------
+| Design Timing Summary
+| ---------------------
+------------------------------------------------------------------------------------------------
+
+    WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints      WHS(ns)      THS(ns)  THS Failing Endpoints  THS Total Endpoints
+    -------      -------  ---------------------  -------------------      -------      -------  ---------------------  -------------------
+      1.234        0.000                      0                 9872        0.052        0.000                      0                 9872
+
+
+All user specified timing constraints are met.
+
+
+------------------------------------------------------------------------------------------------
+| Clock Summary
+| -------------
+------------------------------------------------------------------------------------------------
+
+Clock       Waveform(ns)         Period(ns)      Frequency(MHz)
+-----       ------------         ----------      --------------
+clk100      {0.000 5.000}        10.000          100.000
+  mmcm_fb   {0.000 5.000}        10.000          100.000
+  pll_sys   {0.000 5.000}        10.000          100.000
+  pll_idelay {0.000 2.500}       5.000           200.000
+
+
+------------------------------------------------------------------------------------------------
+| Intra Clock Table
+| -----------------
+------------------------------------------------------------------------------------------------
+
+Clock             WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints      WHS(ns)      THS(ns)  THS Failing Endpoints  THS Total Endpoints     WPWS(ns)     TPWS(ns)  TPWS Failing Endpoints  TPWS Total Endpoints
+-----             -------      -------  ---------------------  -------------------      -------      -------  ---------------------  -------------------     --------     --------  ----------------------  --------------------
+clk100                                                                                                                                                           3.000        0.000                       0                     1
+  mmcm_fb                                                                                                                                                        8.751        0.000                       0                     2
+  pll_sys           1.234        0.000                      0                 9860        0.052        0.000                      0                 9860        3.750        0.000                       0                  3433
+  pll_idelay        3.018        0.000                      0                    7        0.179        0.000                      0                    7        1.592        0.000                       0                     3
+
+
+------------------------------------------------------------------------------------------------
+| Inter Clock Table
+| -----------------
+------------------------------------------------------------------------------------------------
+"""
+
+vivado_utilization = """\
+1. Slice Logic
+--------------
+
++----------------------------+-------+-------+------------+-----------+-------+
+|          Site Type         |  Used | Fixed | Prohibited | Available | Util% |
++----------------------------+-------+-------+------------+-----------+-------+
+| Slice LUTs                 |  4370 |     0 |          0 |     20800 | 21.01 |
+|   LUT as Logic             |  4012 |     0 |          0 |     20800 | 19.29 |
+|   LUT as Memory            |   358 |     0 |          0 |      9600 |  3.73 |
+| Slice Registers            |  4982 |     0 |          0 |     41600 | 11.98 |
+|   Register as Flip Flop    |  4982 |     0 |          0 |     41600 | 11.98 |
+| F7 Muxes                   |    97 |     0 |          0 |     16300 |  0.60 |
++----------------------------+-------+-------+------------+-----------+-------+
+
+
+3. Memory
+---------
+
++-------------------+------+-------+------------+-----------+-------+
+|     Site Type     | Used | Fixed | Prohibited | Available | Util% |
++-------------------+------+-------+------------+-----------+-------+
+| Block RAM Tile    | 11.5 |     0 |          0 |        50 | 23.00 |
+|   RAMB36/FIFO*    |   10 |     0 |          0 |        50 | 20.00 |
+|   RAMB18          |    3 |     0 |          0 |       100 |  3.00 |
++-------------------+------+-------+------------+-----------+-------+
+
+
+4. DSP
+------
+
++----------------+------+-------+------------+-----------+-------+
+|    Site Type   | Used | Fixed | Prohibited | Available | Util% |
++----------------+------+-------+------------+-----------+-------+
+| DSPs           |    4 |     0 |          0 |        90 |  4.44 |
+|   DSP48E1 only |    4 |       |            |           |       |
++----------------+------+-------+------------+-----------+-------+
+"""
+
+nextpnr_log = """\
+Info: Device utilisation:
+Info: 	          TRELLIS_IO:    23/  197    11%
+Info: 	                DCCA:     2/   56     3%
+Info: 	              DP16KD:    12/   56    21%
+Info: 	          MULT18X18D:     4/   28    14%
+Info: 	          TRELLIS_FF:  2488/24288    10%
+Info: 	        TRELLIS_COMB:  4102/24288    16%
+Info: Placed 23 cells based on constraints.
+Info: Device utilisation:
+Info: 	          TRELLIS_IO:    23/  197    11%
+Info: 	                DCCA:     2/   56     3%
+Info: 	              DP16KD:    12/   56    21%
+Info: 	          MULT18X18D:     4/   28    14%
+Info: 	          TRELLIS_FF:  2511/24288    10%
+Info: 	        TRELLIS_COMB:  4321/24288    17%
+
+Info: Max frequency for clock '$glbnet$crg_clkout': 62.35 MHz (PASS at 50.00 MHz)
+Info: Max frequency for clock '$glbnet$eth_clocks_rx$TRELLIS_IO_IN': 118.29 MHz (PASS at 125.00 MHz)
+
+Info: Program finished normally.
+"""
+
+quartus_sta = """\
++--------------------------------------------------------------------------------------------------+
+; Slow 1200mV 85C Model Fmax Summary                                                               ;
++-----------+-----------------+------------------------------------------------------+------------+
+; Fmax      ; Restricted Fmax ; Clock Name                                           ; Note       ;
++-----------+-----------------+------------------------------------------------------+------------+
+; 78.42 MHz ; 78.42 MHz       ; main_crg_pll|altpll_component|auto_generated|pll1|clk[0] ;            ;
++-----------+-----------------+------------------------------------------------------+------------+
+
+
++----------------------------------------------------------------------------------+
+; Slow 1200mV 85C Model Setup Summary                                              ;
++----------------------------------------------------------+-------+---------------+
+; Clock                                                    ; Slack ; End Point TNS ;
++----------------------------------------------------------+-------+---------------+
+; main_crg_pll|altpll_component|auto_generated|pll1|clk[0] ; 7.248 ; 0.000         ;
++----------------------------------------------------------+-------+---------------+
+
+
++----------------------------------------------------------------------------------+
+; Slow 1200mV 85C Model Hold Summary                                               ;
++----------------------------------------------------------+-------+---------------+
+; Clock                                                    ; Slack ; End Point TNS ;
++----------------------------------------------------------+-------+---------------+
+; main_crg_pll|altpll_component|auto_generated|pll1|clk[0] ; 0.343 ; 0.000         ;
++----------------------------------------------------------+-------+---------------+
+
+
++----------------------------------------------------------------------------------+
+; Fast 1200mV 0C Model Setup Summary                                               ;
++----------------------------------------------------------+-------+---------------+
+; Clock                                                    ; Slack ; End Point TNS ;
++----------------------------------------------------------+-------+---------------+
+; main_crg_pll|altpll_component|auto_generated|pll1|clk[0] ; 13.771 ; 0.000        ;
++----------------------------------------------------------+-------+---------------+
+
+"""
+
+quartus_fit_summary = """\
+Fitter Status : Successful - Tue Jun 13 10:12:33 2023
+Quartus Prime Version : 21.1.0 Build 842 10/21/2021 SJ Lite Edition
+Revision Name : terasic_de10lite
+Top-level Entity Name : terasic_de10lite
+Family : MAX 10
+Device : 10M50DAF484C7G
+Timing Models : Final
+Total logic elements : 4,512 / 49,760 ( 9 % )
+    Total combinational functions : 4,201 / 49,760 ( 8 % )
+    Dedicated logic registers : 2,876 / 49,760 ( 6 % )
+Total registers : 2876
+Total pins : 87 / 360 ( 24 % )
+Total virtual pins : 0
+Total memory bits : 151,552 / 1,677,312 ( 9 % )
+Embedded Multiplier 9-bit elements : 4 / 288 ( 1 % )
+Total PLLs : 1 / 4 ( 25 % )
+"""
+
+gowin_tr = """\
+2.3 Max Frequency Summary
+  NO.   Clock Name      Constraint     Actual Fmax   Logic Level   Entity
+ ===== ============== ============== ============= ============= ========
+  1     crg_clk        48.000(MHz)    73.529(MHz)   7             TOP
+  2     clk27          27.000(MHz)    215.407(MHz)  3             TOP
+"""
+
+gowin_rpt = """\
+3.2 Resource Usage Summary
+
+  ----------------------------------------------------------
+  Resource                    | Usage              | Utilization
+  ----------------------------------------------------------
+  Logic                       | 3318/20736         | 17%
+    --LUT,ALU,ROM16           | 3138(2860 LUT, 278 ALU, 0 ROM16) | -
+    --SSRAM(RAM16)            | 30                 | -
+  Register                    | 2216/15915         | 14%
+    --Logic Register as Latch | 0/15552            | 0%
+    --Logic Register as FF    | 2188/15552         | 15%
+  CLS                         | 2584/10368         | 25%
+  I/O Port                    | 38/66              | 58%
+  BSRAM                       | 12/46              | 27%
+  DSP                         | 2/24               | 9%
+  ----------------------------------------------------------
+"""
+
+efinity_timing = """\
+Maximum possible analyzed clocks frequency
+Clock Name      Period (ns)   Frequency (MHz)   Edge
+clk             8.372         119.445           (R-R)
+sys_clk         12.345        81.004            (R-R)
+
+Geomean max period: 10.166
+
+
+Setup (Max) Clock Relationship
+Launch Clock    Capture Clock    Constraint (ns)     Slack (ns)    Edge
+clk             clk              10.000              1.628         (R-R)
+sys_clk         sys_clk          16.667              4.322         (R-R)
+
+Hold (Min) Clock Relationship
+Launch Clock    Capture Clock    Constraint (ns)     Slack (ns)    Edge
+clk             clk              0.000               0.164         (R-R)
+sys_clk         sys_clk          0.000               0.112         (R-R)
+
+"""
+
+efinity_place = """\
+---------- Resource Summary (begin) ----------
+Inputs:                  12 / 1124 (1.07%)
+Outputs:                 31 / 1195 (2.59%)
+Clocks:                  3 / 16 (18.75%)
+Logic Elements:          4321 / 112128 (3.85%)
+	LE: LUTs/Adders:     3456 / 112128 (3.08%)
+	LE: Registers:       2890 / 80256 (3.60%)
+Memory Blocks:           24 / 1056 (2.27%)
+Multipliers:             4 / 320 (1.25%)
+---------- Resource Summary (end) ----------
+"""
+
+efinity_map = """\
+###### Mapping Statistics ######
+EFX_ADD         : 	312
+EFX_LUT4        : 	3456
+EFX_FF          : 	2890
+EFX_RAM_5K      : 	24
+EFX_MULT        : 	4
+"""
+
+# Tests --------------------------------------------------------------------------------------------
+
+class TestReports(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build_dir(self, files, build_script="build_top.sh"):
+        build_dir = os.path.join(self.tmp.name, "gateware")
+        for filename, content in dict(files, **{build_script: ""}).items():
+            filename = os.path.join(build_dir, filename)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, "w") as f:
+                f.write(content)
+        return build_dir
+
+    def assertResource(self, record, kind, used, available):
+        self.assertEqual(record["utilization"][kind], {"used": used, "available": available})
+
+    def test_vivado(self):
+        record = reports.parse_reports(self.build_dir({
+            "top_timing.rpt"            : vivado_timing,
+            "top_utilization_place.rpt" : vivado_utilization,
+        }, "build_top.tcl"))
+        self.assertEqual(record["toolchain"], "vivado")
+        self.assertEqual(record["clocks"]["pll_sys"]["setup_slack"], 1.234)
+        self.assertEqual(record["clocks"]["pll_sys"]["hold_slack"], 0.052)
+        self.assertEqual(record["clocks"]["pll_idelay"]["target"], 200e6)
+        self.assertAlmostEqual(record["clocks"]["pll_sys"]["fmax"], 1e9/(10 - 1.234))
+        self.assertIsNone(record["clocks"]["clk100"]["setup_slack"])
+        self.assertEqual(record["worst_setup_slack"], 1.234)
+        self.assertEqual(record["worst_hold_slack"], 0.052)
+        self.assertResource(record, "lut",  4370, 20800)
+        self.assertResource(record, "ff",   4982, 41600)
+        self.assertResource(record, "bram", 11.5, 50)
+        self.assertResource(record, "dsp",  4,    90)
+        self.assertEqual(record["resources"]["LUT as Memory"], {"used": 358, "available": 9600})
+
+    def test_nextpnr(self):
+        record = reports.parse_reports(self.build_dir({"toolchain.log": nextpnr_log}))
+        self.assertEqual(record["toolchain"], "nextpnr")
+        clock = record["clocks"]["$glbnet$crg_clkout"]
+        self.assertEqual((clock["fmax"], clock["target"]), (62.35e6, 50e6))
+        self.assertAlmostEqual(clock["setup_slack"], 20 - 1e3/62.35)
+        self.assertLess(record["clocks"]["$glbnet$eth_clocks_rx$TRELLIS_IO_IN"]["setup_slack"], 0)
+        self.assertEqual(record["fmax"], 62.35e6)
+        # Post-routing utilisation (last report).
+        self.assertResource(record, "lut",  4321, 24288)
+        self.assertResource(record, "ff",   2511, 24288)
+        self.assertResource(record, "bram", 12,   56)
+        self.assertResource(record, "dsp",  4,    28)
+
+    def test_quartus(self):
+        record = reports.parse_reports(self.build_dir({
+            "top.sta.rpt"     : quartus_sta,
+            "top.fit.summary" : quartus_fit_summary,
+        }))
+        clock = record["clocks"]["main_crg_pll|altpll_component|auto_generated|pll1|clk[0]"]
+        self.assertEqual(record["toolchain"], "quartus")
+        # Worst over the corners.
+        self.assertEqual((clock["setup_slack"], clock["hold_slack"], clock["fmax"]), (7.248, 0.343, 78.42e6))
+        self.assertResource(record, "lut",       4512,   49760)
+        self.assertResource(record, "ff",        2876,   0)
+        self.assertResource(record, "dsp",       4,      288)
+        self.assertResource(record, "bram_bits", 151552, 1677312)
+        self.assertNotIn("Quartus Prime Version", record["resources"])
+        self.assertNotIn("Device", record["resources"])
+
+    def test_gowin(self):
+        record = reports.parse_reports(self.build_dir({
+            "impl/pnr/top.tr"      : gowin_tr,
+            "impl/pnr/top.rpt.txt" : gowin_rpt,
+        }))
+        self.assertEqual(record["toolchain"], "gowin")
+        clock = record["clocks"]["crg_clk"]
+        self.assertEqual((clock["fmax"], clock["target"]), (73.529e6, 48e6))
+        self.assertAlmostEqual(clock["setup_slack"], 1e3/48 - 1e3/73.529)
+        self.assertEqual(record["fmax"], 73.529e6)
+        self.assertResource(record, "lut",  3318, 20736)
+        self.assertResource(record, "ff",   2216, 15915)
+        self.assertResource(record, "bram", 12,   46)
+        self.assertResource(record, "dsp",  2,    24)
+        self.assertNotIn("Logic Register as FF", record["resources"])
+
+    def test_efinity(self):
+        record = reports.parse_reports(self.build_dir({
+            "outflow/top.timing.rpt" : efinity_timing,
+            "outflow/top.place.rpt"  : efinity_place,
+            "outflow/top.map.rpt"    : efinity_map,
+        }))
+        self.assertEqual(record["toolchain"], "efinity")
+        clock = record["clocks"]["sys_clk"]
+        self.assertEqual((clock["fmax"], clock["setup_slack"], clock["hold_slack"]), (81.004e6, 4.322, 0.112))
+        self.assertAlmostEqual(clock["target"], 1e9/16.667)
+        self.assertResource(record, "lut",  3456, 112128)
+        self.assertResource(record, "ff",   2890, 80256)
+        self.assertResource(record, "bram", 24,   1056)
+        self.assertResource(record, "dsp",  4,    320)
+        self.assertEqual(record["resources"]["EFX_ADD"], {"used": 312, "available": None})
+        # Mapped primitives only: utilization from the primitives.
+        os.remove(os.path.join(self.tmp.name, "gateware", "outflow", "top.place.rpt"))
+        record = reports.parse_reports(os.path.join(self.tmp.name, "gateware"))
+        self.assertResource(record, "lut", 3456, 0)
+
+    def test_add_build(self):
+        build_dir   = self.build_dir({"top_timing.rpt": vivado_timing, "top_utilization.rpt": vivado_utilization})
+        db_filename = os.path.join(self.tmp.name, "reports.db")
+        for i in range(2):
+            record = reports.add_build(db_filename, build_dir, "digilent_arty", ["--build"], build_time=42.0)
+        with open(os.path.join(build_dir, reports.report_filename)) as f:
+            self.assertEqual(json.load(f)["target"], "digilent_arty")
+        db   = sqlite3.connect(db_filename)
+        rows = db.execute("SELECT id, target, args, toolchain, build_time, worst_setup_slack, lut, ff, bram, dsp, record FROM builds").fetchall()
+        self.assertEqual([row[:10] for row in rows], [
+            (i + 1, "digilent_arty", "--build", "vivado", 42.0, 1.234, 4370, 4982, 11.5, 4) for i in range(2)])
+        self.assertEqual(json.loads(rows[0][10])["clocks"], record["clocks"])
+        clocks = db.execute("SELECT clock, setup_slack, hold_slack, target FROM clocks WHERE build = 2 ORDER BY clock").fetchall()
+        self.assertEqual(clocks, [
+            ("clk100", None, None, 100e6), ("mmcm_fb", None, None, 100e6),
+            ("pll_idelay", 3.018, 0.179, 200e6), ("pll_sys", 1.234, 0.052, 100e6)])
+        self.assertIsNone(reports.add_build(db_filename, self.tmp.name))
@@ -0,0 +1,82 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import time
+import types
+import tempfile
+import unittest
+from unittest import mock
+
+from litex_boards.tools import reproducible
+
+class TestReproducible(unittest.TestCase):
+    def setUp(self):
+        self.tmp   = tempfile.TemporaryDirectory()
+        self.dir_a = os.path.join(self.tmp.name, "a")
+        self.dir_b = os.path.join(self.tmp.name, "b")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, run, filename, content):
+        path = os.path.join(self.tmp.name, run, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb" if isinstance(content, bytes) else "w") as f:
+            f.write(content)
+        return path
+
+    def classify(self, content_a, content_b, **kwargs):
+        a = self.write("a", "file", content_a)
+        b = self.write("b", "file", content_b)
+        return reproducible.classify_file(a, b, self.dir_a, self.dir_b, **kwargs)
+
+    def test_classify_file(self):
+        self.assertEqual(self.classify("module top();\n", "module top();\n"), set())
+        self.assertEqual(self.classify("// Date: 2023-05-02 10:11:12\nx\n", "// Date: 2023-05-03 09:00:00\nx\n"), {"timestamp"})
+        self.assertEqual(self.classify("// LiteX git sha1: 2a4b7c1d\n", "// LiteX git sha1: 9f8e7d6\n"), {"git"})
+        self.assertEqual(self.classify("a\nb\nc\n", "c\na\nb\n"), {"order"})
+        self.assertEqual(self.classify("assign x = 1;\n", "assign x = 0;\n"), {"other"})
+        self.assertEqual(self.classify(b"\xff\x00\x01", b"\xff\x00\x02"), {"binary"})
+        self.assertEqual(self.classify(
+            "// 2023-05-02 10:11:12\nx = 1\n", "// 2023-05-03 10:11:12\nx = 2\n"), {"timestamp", "other"})
+
+    def test_classify_paths(self):
+        content_a = f"cd {self.dir_a}/gateware\nsource {self.dir_a}/gateware/top.tcl\n"
+        content_b = f"cd {self.dir_b}/gateware\nsource {self.dir_b}/gateware/top.tcl\n"
+        self.assertEqual(self.classify(content_a, content_b), {"path"})
+        # Only the output directory prefix differs: equivalent.
+        self.assertEqual(self.classify(content_a, content_b, paths=False), set())
+        self.assertEqual(self.classify(content_a, content_b.replace("top.tcl", "other.tcl"), paths=False), {"other"})
+
+    def test_compare_builds(self):
+        for run, directory in [("a", self.dir_a), ("b", self.dir_b)]:
+            self.write(run, "gateware/top.v", "module top();\nendmodule\n")
+            self.write(run, "gateware/build_top.sh", f"vivado -source {directory}/gateware/top.tcl\n")
+            self.write(run, "gateware/build.log", f"run {run}\n")
+        self.write("a", "csr.csv", "csr_base,ctrl,0xf0000000,,\n")
+        self.assertEqual(reproducible.compare_builds(self.dir_a, self.dir_b), {
+            "csr.csv"              : {"missing"},
+            "gateware/build_top.sh": {"path"},
+        })
+        self.write("b", "csr.csv", "csr_base,ctrl,0xf0000000,,\n")
+        self.assertEqual(reproducible.compare_builds(self.dir_a, self.dir_b, paths=False), {})
+
+    def test_hook_missing_attributes(self):
+        # Modules/attributes absent from the installed LiteX version are skipped.
+        with_time    = types.ModuleType("test_with_time")
+        with_time.time = time
+        without_time = types.ModuleType("test_without_time")
+        modules = {m.__name__: m for m in [with_time, without_time]}
+        with mock.patch.dict(sys.modules, modules), \
+             mock.patch.object(reproducible, "time_modules",     list(modules) + ["test_missing_module"]), \
+             mock.patch.object(reproducible, "datetime_modules", list(modules)), \
+             mock.patch.object(reproducible, "git_modules",      list(modules)):
+            with reproducible.reproducible_hook(epoch=1000):
+                self.assertEqual(with_time.time.time(), 1000.0)
+                self.assertFalse(hasattr(without_time, "time"))
+            self.assertIs(with_time.time, time)
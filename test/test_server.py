@@ -0,0 +1,88 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import io
+import os
+import sys
+import json
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+from litex_boards.tools import server
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "server.sock")
+        self.log  = os.path.join(self.tmp.name, "server.log")
+        self.pid  = os.fork()
+        if self.pid == 0:
+            # Server in a child process.
+            fd = os.open(self.log, os.O_WRONLY | os.O_CREAT)
+            os.dup2(fd, 1)
+            os.dup2(fd, 2)
+            try:
+                server.serve(self.path)
+            finally:
+                os._exit(0)
+        deadline = time.time() + 60
+        while not os.path.exists(self.path) and time.time() < deadline:
+            time.sleep(0.05)
+
+    def tearDown(self):
+        if self.pid is not None:
+            if server.request(self.path, "stop") is None:
+                os.kill(self.pid, 15)
+            os.waitpid(self.pid, 0)
+        self.tmp.cleanup()
+
+    def request(self, command, argv=[]):
+        stdout, stderr = io.TextIOWrapper(io.BytesIO()), io.TextIOWrapper(io.BytesIO())
+        with mock.patch.object(sys, "stdout", stdout), mock.patch.object(sys, "stderr", stderr):
+            code = server.request(self.path, command, argv)
+        return code, stdout.buffer.getvalue().decode(), stderr.buffer.getvalue().decode()
+
+    def raw_request(self, kind, payload):
+        sock = server.connect(self.path)
+        with sock:
+            server.send_frame(sock, kind, payload)
+            frames = []
+            while True:
+                try:
+                    frames.append(server.recv_frame(sock))
+                except EOFError:
+                    return frames
+
+    def test_server(self):
+        code, out, _ = self.request("status")
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out)["runs"], 0)
+
+        # Invalid requests are rejected, the server keeps serving.
+        for kind, payload in [(b"R", b"{}"), (b"R", b"[1, 2]"), (b"R", b"not json"), (b"X", b"{}"),
+            (b"R", json.dumps({"command": "rm"}).encode()), (b"R", json.dumps({"command": "run", "argv": "x"}).encode())]:
+            with self.subTest(payload=payload):
+                frames = self.raw_request(kind, payload)
+                self.assertEqual(frames[-1], (b"E", b"2"))
+                self.assertEqual(frames[0][0], b"M")
+
+        # Run: forked from the server, output streamed to the client.
+        code, out, _ = self.request("run", ["--help"])
+        self.assertEqual(code, 0)
+        self.assertIn("LiteX-Boards target runner.", out)
+        code, out, _ = self.request("run", ["--unknown-option", "digilent_arty"])
+        self.assertEqual(code, 2)
+        self.assertIn("unrecognized arguments", out)
+
+        code, out, _ = self.request("status")
+        self.assertEqual(json.loads(out)["runs"], 2)
+        self.assertEqual(self.request("stop")[0], 0)
+        os.waitpid(self.pid, 0)
+        self.pid = None
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(server.request(self.path, "status"))
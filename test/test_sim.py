@@ -0,0 +1,99 @@
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2023 LiteX-Hub community
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import glob
+import unittest
+import importlib.util
+
+from litex_boards.tools import sim
+
+litex_spec = importlib.util.find_spec("litex")
+migen_spec = importlib.util.find_spec("migen")
+litedram_spec = importlib.util.find_spec("litedram")
+
+class TestSim(unittest.TestCase):
+    # Snapshot points must match the console output of the installed LiteX BIOS.
+    @unittest.skipIf(litex_spec is None, "LiteX not installed")
+    def test_snapshot_points(self):
+        bios = os.path.join(litex_spec.submodule_search_locations[0], "soc", "software", "bios")
+        sources = ""
+        for filename in glob.glob(os.path.join(bios, "*.[ch]")):
+            with open(filename) as f:
+                sources += f.read().replace("\\e", "\x1b")
+        for name, point in sim.snapshot_points.items():
+            with self.subTest(point=name):
+                self.assertIn(point, sources)
+
+    def test_marker_transitions(self):
+        # Matcher model against substring search, markers with repeated prefixes.
+        import random
+        def find(marker, stream):
+            state = 0
+            for i, byte in enumerate(stream):
+                state = dict(sim.get_marker_transitions(marker)[state]).get(byte, 0)
+                if state == len(marker):
+                    return i + 1 - len(marker)
+            return -1
+        rng = random.Random(0)
+        for marker in [b"aab", b"abab", b"aabaaab", b"--==--", b"a"]:
+            with self.subTest(marker=marker):
+                for _ in range(200):
+                    stream = bytes(rng.choice(b"ab-=") for _ in range(rng.randrange(20)))
+                    self.assertEqual(find(marker, stream), stream.find(marker))
+
+    @unittest.skipIf(migen_spec is None, "Migen not installed")
+    def test_marker_matcher(self):
+        from migen import Module, Signal, run_simulation
+        def match(marker, stream):
+            m = Module()
+            m.valid, m.data, m.trigger = Signal(), Signal(8), Signal()
+            m.sync += sim.marker_matcher(marker, m.valid, m.data, m.trigger)
+            triggered = []
+            def generator():
+                for byte in stream:
+                    yield m.valid.eq(1)
+                    yield m.data.eq(byte)
+                    yield
+                    yield m.valid.eq(0) # Idle cycles between bytes.
+                    yield
+                for _ in range(2):
+                    yield
+                triggered.append((yield m.trigger))
+            run_simulation(m, generator())
+            return triggered[0]
+        self.assertEqual(match(b"aab", b"aaab"), 1)
+        self.assertEqual(match(b"aab", b"abab"), 0)
+        banner = sim.snapshot_points["sdram"].encode()
+        self.assertEqual(match(banner, b"--=" + banner + b"\n"), 1)
+        self.assertEqual(match(banner, banner[:-1]), 0)
+
+    @unittest.skipIf(litedram_spec is None, "LiteDRAM not installed")
+    def test_sdram_model(self):
+        from litedram import modules
+        from litedram.phy.model import SDRAMPHYModel, get_sdram_phy_settings
+        class PHY:
+            def __init__(self, memtype, databits):
+                self.settings = get_sdram_phy_settings(memtype=memtype, data_width=databits, clk_freq=100e6)
+        for module, databits, rate, rows in [
+            (modules.MT41K128M16(100e6, "1:4"),    16, "1:4", 2**14), # Arty DDR3.
+            (modules.MT41K128M16(100e6, "1:2"),    16, "1:4", 2**14), # Model rate.
+            (modules.MTA18ASF2G72PZ(100e6, "1:4"), 64, "1:4", 2**11), # DDR4 RDIMM, rows reduced.
+            (modules.IS42S16160(50e6, "1:1"),      16, "1:1", 2**13), # SDR.
+        ]:
+            with self.subTest(module=module.__class__.__name__, rate=module.rate):
+                geom = module.geom_settings
+                model, model_module = sim.create_sdram_model(PHY(module.memtype, databits), module, 100e6)
+                self.assertIsInstance(model, SDRAMPHYModel)
+                self.assertEqual(model_module.rate, rate)
+                self.assertEqual(2**model_module.geom_settings.rowbits, rows)
+                self.assertEqual(model_module.geom_settings.colbits, geom.colbits)
+                self.assertLessEqual(2**(geom.bankbits + model_module.geom_settings.rowbits + geom.colbits)*databits//8, sim.sdram_max_size)
+                # Board module unchanged.
+                self.assertIs(module.geom_settings, geom)
+        # Memory types not supported by the model.
+        module = modules.MT53E256M16D1(100e6, "1:8")
+        self.assertEqual(sim.create_sdram_model(PHY("DDR3", 16), module, 100e6), (None, None))
@@ -5,84 +5,62 @@
 # This file is Copyright (c) 2019 Tim 'mithro' Ansell <me@mith.ro>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import subprocess
-import unittest
 import os
+import unittest
 
 from migen import *
 
 from litex.soc.integration.builder import *
 
+from litex_boards.tools import matrix
+from litex_boards.tools import elaborate
+from litex_boards.tools import bench
+
 class TestTargets(unittest.TestCase):
-    excluded_platforms = [
-        "qmtech_daughterboard",              # Reason: Not a real platform.
-        "enclustra_st1",                     # Readon: Not a real platform.
-        "quicklogic_quickfeather",           # Reason: No default clock.
-        "efinix_titanium_ti60_f225_dev_kit", # Reason: Require Efinity toolchain.
-        "efinix_trion_t120_bga576_dev_kit",  # Reason: Require Efinity toolchain.
-        "efinix_trion_t20_bga256_dev_kit",   # Reason: Require Efinity toolchain.
-        "efinix_trion_t20_mipi_dev_kit",     # Reason: Require Efinity toolchain.
-        "efinix_xyloni_dev_kit",             # Reason: Require Efinity toolchain.
-        "sipeed_tang_primer",                # Reason: Require Anlogic toolchain.
-        "jungle_electronics_fireant",        # Reason: Require Efinity toolchain.
-        "efinix_t8f81_dev_kit",              # Reason: Require Efinity toolchain.
-        "adi_plutosdr",                      # Reason: No default clock.
-        "newae_cw305",                       # Reason: No default clock.
-    ]
-    excluded_targets   = [
-        "simple",                            # Reason: Generic target.
-        "quicklogic_quickfeather",           # Reason: No default clock.
-        "efinix_titanium_ti60_f225_dev_kit", # Reason: Require Efinity toolchain.
-        "efinix_trion_t120_bga576_dev_kit",  # Reason: Require Efinity toolchain.
-        "efinix_trion_t20_bga256_dev_kit",   # Reason: Require Efinity toolchain.
-        "efinix_trion_t20_mipi_dev_kit",     # Reason: Require Efinity toolchain.
-        "efinix_xyloni_dev_kit",             # Reason: Require Efinity toolchain.
-        "sipeed_tang_primer",                # Reason: Require Anlogic toolchain.
-        "jungle_electronics_fireant",        # Reason: Require Efinity toolchain.
-        "efinix_t8f81_dev_kit",              # Reason: Require Efinity toolchain.
-    ]
+    excluded_platforms = matrix.excluded_platforms
+    excluded_targets   = matrix.excluded_targets
+    output_dir         = "build/test"
+
+    def run_jobs(self, jobs):
+        # Longest-first from the historical costs of the previous runs.
+        costs_filename = os.path.join(self.output_dir, "costs.json")
+        jobs = matrix.sort_jobs(jobs, matrix.load_costs(costs_filename))
+        # Elaborate in warm workers, unless one interpreter per build is requested.
+        if os.environ.get("LITEX_BOARDS_TEST_SUBPROCESS", "0") == "1":
+            results = matrix.run_jobs(jobs, callback=matrix.print_result)
+        else:
+            results = elaborate.run_jobs(jobs, callback=matrix.print_result)
+        matrix.update_costs(costs_filename, results)
+        return results
+
+    def check_results(self, results):
+        for result in results:
+            with self.subTest(**{result["kind"]: result["name"]}):
+                if not result["passed"]:
+                    with open(result["log"]) as log:
+                        self.fail(log.read()[-4096:])
 
     # Build simple design for all platforms.
     def test_platforms(self):
         # Collect platforms.
-        platforms = []
-        for file in os.listdir("./litex_boards/platforms/"):
-            if file.endswith(".py"):
-                file = file.replace(".py", "")
-                if file not in ["__init__"] + self.excluded_platforms:
-                    platforms.append(file)
+        platforms = matrix.collect_platforms(self.excluded_platforms)
 
         # Test platforms with simple design.
-        for name in platforms:
-            with self.subTest(platform=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.simple litex_boards.platforms.{} \
-    --build            \
-    --no-compile       \
-    --uart-name="stub" \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+        jobs = matrix.collect_jobs(self.output_dir, platforms=platforms)
+        self.check_results(self.run_jobs(jobs))
 
     # Build default configuration for all targets.
     def test_targets(self):
         # Collect targets.
-        targets = []
-        for file in os.listdir("./litex_boards/targets/"):
-            if file.endswith(".py"):
-                file = file.replace(".py", "")
-                if file not in ["__init__"] + self.excluded_targets:
-                    targets.append(file)
+        targets = matrix.collect_targets(self.excluded_targets)
 
         # Test targets.
-        for name in targets:
-            with self.subTest(target=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.{} \
-    --cpu-type=vexriscv     \
-    --cpu-variant=minimal   \
-    --build                 \
-    --no-compile            \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+        jobs = matrix.collect_jobs(self.output_dir, targets=targets)
+        self.check_results(self.run_jobs(jobs))
+
+    # Check that targets start without importing optional cores (only imported when enabled).
+    def test_lazy_imports(self):
+        for target in matrix.collect_targets(excluded=[]):
+            with self.subTest(target=target):
+                duration, gated = bench.measure_startup(target, runs=1)
+                self.assertEqual(gated, [])